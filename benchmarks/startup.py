@@ -0,0 +1,106 @@
+"""
+Measures how long the CLI takes to start for each command, with `python -X importtime`
+
+Run from the root directory with `python -m benchmarks.startup`. Each command is started with `--help`,
+which imports everything the command imports without running it
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import click
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import time: self [us] | cumulative | imported package
+_IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def _run(command: List[str], import_time: bool) -> subprocess.CompletedProcess:
+    options = ["-X", "importtime"] if import_time else []
+    return subprocess.run(
+        [sys.executable, *options, "-m", "src.main", *command, "--help"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure(command: List[str], runs: int) -> Dict:
+    """
+    Starts the CLI with `command` `runs` times
+
+    :param List[str] command: command to start, e.g. ["find-account"]. Empty for the help of the CLI
+    :param int runs: number of times to start it
+    :return: the median wall time and import time in milliseconds, the number of modules imported,
+        and the import time of the slowest top level packages
+    :rtype: Dict
+    """
+    wall_times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run(command, import_time=False)
+        wall_times.append((time.perf_counter() - start) * 1000)
+
+    # Self time of every module, summed up by top level package
+    packages: Counter = Counter()
+    modules = 0
+    for line in _run(command, import_time=True).stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match is None:
+            continue
+        modules += 1
+        packages[match.group(4).split(".")[0]] += int(match.group(1))
+
+    return {
+        "command": " ".join(command) or "--help",
+        "wall_ms": round(statistics.median(wall_times), 1),
+        "import_ms": round(sum(packages.values()) / 1000, 1),
+        "modules": modules,
+        "slowest": {
+            package: round(us / 1000, 1) for package, us in packages.most_common(5)
+        },
+    }
+
+
+def commands() -> List[List[str]]:
+    sys.path.insert(0, ROOT)
+    from src.main import COMMANDS
+
+    return [[]] + [[name] for name in COMMANDS]
+
+
+@click.command()
+@click.option("-n", "--runs", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option("--json", "as_json", help="Print the results as json", is_flag=True)
+@click.argument("command", required=False)
+def main(runs: int, as_json: bool, command: Optional[str]):
+    """
+    Measure the startup time of COMMAND, or of every command
+    """
+    results = [measure(args, runs) for args in ([[command]] if command else commands())]
+
+    if as_json:
+        click.echo(json.dumps(results, indent=4))
+        return
+
+    click.echo(
+        f"{'command':<24} {'wall ms':>8} {'import ms':>10} {'modules':>8}  slowest imports (ms)"
+    )
+    for result in results:
+        slowest = ", ".join(f"{name} {ms}" for name, ms in result["slowest"].items())
+        click.echo(
+            f"{result['command']:<24} {result['wall_ms']:>8} {result['import_ms']:>10} {result['modules']:>8}  {slowest}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Times the storage, search and key derivation hot paths on synthetic vaults of several sizes
+
+Run from the root directory with `python -m benchmarks.suite`. Results are written as json,
+and can be compared against a stored baseline with `--baseline`
+"""
+
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+import click
+from rich.console import Console
+
+from benchmarks.vault_generator import generate_vault
+from src.accounts.account import Account, AccountFields
+from src.accounts.file_manager import (
+    delete_account,
+    edit_account,
+    load_accounts_from_file,
+    save_account_to_file,
+)
+from src.accounts.journal import journal_path
+from src.config import STORAGE_BACKENDS, vault_path
+from src.constants import paths as PATHS
+from src.constants.numbers import SEARCH_RESULT_LIMIT
+from src.search import create_search_table, fuzzyfind_account_by_field
+from src.utils.aes_utils import create_key, create_salt
+from src.utils.password_utils import generate_password
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+# Matches a few percent of the generated accounts, spread over the whole vault
+SEARCH_QUERY = "gitwork"
+# Regressions are only reported when a benchmark is this much slower than the baseline
+DEFAULT_TOLERANCE = 0.2
+
+
+def time_runs(
+    function: Callable[[], object],
+    repeat: int,
+    setup: Optional[Callable[[], object]] = None,
+    number: int = 1,
+) -> Dict:
+    """
+    Times function `repeat` times. Setup runs before every timed run, and isn't timed
+
+    :param int number: times function is called in every run, for functions too fast to time one call of
+    :return: the median and fastest seconds of one call, and the seconds of every run
+    :rtype: Dict
+    """
+    runs = []
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        runs.append((time.perf_counter() - start) / number)
+
+    return {"median": statistics.median(runs), "min": min(runs), "runs": runs}
+
+
+def _restore(path: str, pristine_path: str):
+    """
+    Puts back the generated vault, undoing the changes of the previous run
+    """
+    shutil.copyfile(pristine_path, path)
+    if os.path.exists(journal_path(path)):
+        os.remove(journal_path(path))
+
+
+def benchmark_vault(size: int, repeat: int) -> Dict[str, Dict]:
+    """
+    Times the benchmarks which depend on the size of the vault, on a generated vault of `size` accounts
+    The configured vault in the working directory is replaced
+
+    :return: benchmark name -> timings
+    :rtype: Dict[str, Dict]
+    """
+    path = vault_path()
+    accounts = generate_vault(path, size)
+    pristine_path = f"{path}.pristine"
+    shutil.copyfile(path, pristine_path)
+
+    def restore():
+        _restore(path, pristine_path)
+
+    # An account in the middle, so finding it reads half the vault
+    id = accounts[size // 2].id
+    console = Console(file=io.StringIO(), width=120)
+    matches = fuzzyfind_account_by_field(
+        AccountFields.SERVICE, accounts, SEARCH_QUERY, SEARCH_RESULT_LIMIT
+    )
+
+    def delete():
+        with mock.patch("click.confirm", return_value=True):
+            delete_account(id, console)
+
+    results = {
+        "load_accounts_from_file": time_runs(
+            lambda: load_accounts_from_file(path), repeat
+        ),
+        "save_account_to_file": time_runs(
+            lambda: save_account_to_file(path, Account(None, "user", "Service")),
+            repeat,
+            restore,
+        ),
+        "edit_account": time_runs(
+            lambda: edit_account(id, "username", "edited"), repeat, restore
+        ),
+        "delete_account": time_runs(delete, repeat, restore),
+        "fuzzyfind_account_by_field": time_runs(
+            lambda: fuzzyfind_account_by_field(
+                AccountFields.SERVICE, accounts, SEARCH_QUERY, SEARCH_RESULT_LIMIT
+            ),
+            repeat,
+        ),
+        # Rendered too, since that's where the time of showing a table goes
+        "create_search_table": time_runs(
+            lambda: console.print(create_search_table(matches)), repeat
+        ),
+    }
+
+    restore()
+    os.remove(pristine_path)
+    return results
+
+
+def run_suite(sizes: List[int], repeat: int, storage: str) -> Dict:
+    """
+    Runs every benchmark in a temporary directory, with vaults of each size in `sizes`
+
+    :param List[int] sizes: numbers of accounts of the generated vaults
+    :param int repeat: times each benchmark is run
+    :param str storage: storage backend of the vaults, as in the configuration
+    :return: the results, with the machine they were run on
+    :rtype: Dict
+    """
+    results: Dict[str, Dict] = {
+        "create_key": time_runs(
+            lambda: create_key("correct horse battery staple", create_salt(16)), repeat
+        ),
+        "generate_password": time_runs(generate_password, repeat, number=1000),
+    }
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            with open(PATHS.CONFIG_PATH, "w") as file:
+                json.dump({"storage": storage}, file)
+
+            for size in sizes:
+                for name, timings in benchmark_vault(size, repeat).items():
+                    results[f"{name}/{size}"] = timings
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage": storage,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compares the fastest times of results against those of baseline, which vary less between runs than the median
+
+    :param float tolerance: fraction a benchmark can be slower than the baseline without being a regression
+    :return: the names of the benchmarks which regressed
+    :rtype: List[str]
+    """
+    regressions = []
+    click.echo(
+        f"{'benchmark':<36} {'baseline ms':>12} {'ms':>12} {'change':>8}", err=True
+    )
+
+    for name, timings in results["results"].items():
+        if name not in baseline["results"]:
+            continue
+
+        before = baseline["results"][name]["min"]
+        after = timings["min"]
+        change = after / before - 1 if before > 0 else 0
+        regressed = change > tolerance
+        if regressed:
+            regressions.append(name)
+
+        click.echo(
+            f"{name:<36} {before * 1000:>12.3f} {after * 1000:>12.3f} {change:>+8.0%}"
+            + ("  REGRESSION" if regressed else ""),
+            err=True,
+        )
+
+    return regressions
+
+
+@click.command()
+@click.option(
+    "-s",
+    "--sizes",
+    default=",".join(str(size) for size in DEFAULT_SIZES),
+    show_default=True,
+    help="Comma separated numbers of accounts of the generated vaults",
+)
+@click.option(
+    "-n", "--repeat", type=click.IntRange(min=1), default=5, show_default=True
+)
+@click.option(
+    "--storage",
+    type=click.Choice(list(STORAGE_BACKENDS)),
+    default="json",
+    show_default=True,
+    help="Storage backend of the generated vaults",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="File to write the results to",
+)
+@click.option(
+    "-b",
+    "--baseline",
+    type=click.File("r"),
+    help="Results of an earlier run to compare against. Exits with 1 if anything regressed",
+)
+@click.option(
+    "--tolerance",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_TOLERANCE,
+    show_default=True,
+    help="Fraction a benchmark can be slower than the baseline before it is a regression",
+)
+def main(sizes: str, repeat: int, storage: str, output, baseline, tolerance: float):
+    """
+    Benchmark the hot paths of the password manager
+    """
+    results = run_suite([int(size) for size in sizes.split(",")], repeat, storage)
+    json.dump(results, output, indent=4)
+    output.write("\n")
+
+    if baseline is not None:
+        regressions = compare(results, json.load(baseline), tolerance)
+        if len(regressions) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
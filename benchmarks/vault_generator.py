@@ -0,0 +1,100 @@
+"""
+Generates synthetic vaults for benchmarks, with field lengths like those of a real vault
+"""
+
+import random
+import uuid
+from typing import List
+
+from src.accounts.account import Account
+from src.accounts.file_manager import write_accounts_to_file
+from src.accounts.password import Password
+from src.constants.numbers import PASSWORD_VERSION
+
+FIRST_NAMES = ["alex", "sam", "jordan", "taylor", "morgan", "casey", "riley", "jamie"]
+LAST_NAMES = ["smith", "nguyen", "garcia", "kim", "müller", "okafor", "rossi", "chen"]
+EMAIL_DOMAINS = ["gmail.com", "outlook.com", "proton.me", "yahoo.com", "work.example"]
+SERVICES = [
+    "GitHub",
+    "Google",
+    "Netflix",
+    "Amazon",
+    "Spotify",
+    "Discord",
+    "Steam",
+    "Dropbox",
+    "Slack",
+    "PayPal",
+    "Reddit",
+    "LinkedIn",
+    "Twitter",
+    "Notion",
+    "Figma",
+    "Zoom",
+]
+URL_PATHS = ["", "/login", "/signin", "/account", "/auth/login", "/users/sign_in"]
+
+
+def _username(rng: random.Random) -> str:
+    name = f"{rng.choice(FIRST_NAMES)}.{rng.choice(LAST_NAMES)}{rng.randrange(100)}"
+    if rng.random() < 0.5:
+        return f"{name}@{rng.choice(EMAIL_DOMAINS)}"
+    return name
+
+
+def _password(rng: random.Random) -> Password:
+    """
+    A password with random bytes of the length of an encrypted 16 character password.
+    Encrypting every password would take minutes for large vaults, and none of the benchmarks decrypt them
+    """
+    return Password(
+        rng.randbytes(16), rng.randbytes(16).hex(), rng.randbytes(16), PASSWORD_VERSION
+    )
+
+
+def generate_accounts(count: int, seed: int = 0) -> List[Account]:
+    """
+    Generates `count` accounts. The same seed always generates the same fields
+
+    :param int count: number of accounts to generate
+    :param int seed: seed of the random fields
+    :return: the generated accounts
+    :rtype: List[Account]
+    """
+    rng = random.Random(seed)
+    accounts = []
+
+    for i in range(count):
+        service = rng.choice(SERVICES)
+        # Some accounts are of less known services, so not every service is shared by thousands of accounts
+        if rng.random() < 0.5:
+            service = f"{service} {rng.choice(['Work', 'Personal', 'Dev', 'Test'])} {i}"
+
+        url = None
+        if rng.random() < 0.8:
+            domain = service.split()[0].lower()
+            url = f"https://www.{domain}.com{rng.choice(URL_PATHS)}"
+
+        accounts.append(
+            Account(
+                _password(rng),
+                _username(rng) if rng.random() < 0.95 else None,
+                service,
+                url,
+                id=uuid.UUID(int=rng.getrandbits(128), version=4).hex,
+            )
+        )
+
+    return accounts
+
+
+def generate_vault(path: str, count: int, seed: int = 0) -> List[Account]:
+    """
+    Writes a vault of `count` generated accounts to path, replacing the vault if it exists
+
+    :return: the generated accounts
+    :rtype: List[Account]
+    """
+    accounts = generate_accounts(count, seed)
+    write_accounts_to_file(path, accounts)
+    return accounts
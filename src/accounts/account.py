@@ -1,9 +1,9 @@
 from enum import Enum
-from typing import Optional, List, Dict, Any
-from rich.table import Table
+from typing import Optional, List, Dict, Any, Callable
 import uuid
 
 from .password import Password
+from ..encryption.vault_key import VaultKey
 from ..constants import strings as STRINGS
 from ..utils.uuid_utils import is_valid_uuid
 
@@ -42,11 +42,28 @@ class Account:
         if not is_valid_uuid(self.id):
             raise ValueError
 
+    @property
+    def password(self) -> Optional[Password]:
+        # Lazily loaded passwords are only decoded when they are first accessed
+        if self._password_loader is not None:
+            self._password = self._password_loader()
+            self._password_loader = None
+
+        return self._password
+
+    @password.setter
+    def password(self, password: Optional[Password]):
+        self._password = password
+        self._password_loader: Optional[Callable[[], Optional[Password]]] = None
+
     def get_table(self):
         """
         Return a rich table with the account's information
         If any field is None or "", it will display EMPTY_TEXT
         """
+        # Slow to import, and only needed for showing accounts
+        from rich.table import Table
+
         table = Table(title="Account")
         table.add_column("Field")
         table.add_column("Value")
@@ -121,11 +138,11 @@ class Account:
 
         return self
 
-    def get_password(self, master_password: str) -> str:
+    def get_password(self, master_password: str | VaultKey) -> str:
         """
         Decrypts the password associated with the account
 
-        :param str master_password: master password used to encrypt the password
+        :param str | VaultKey master_password: master password or unlocked vault key used to encrypt the password
         :return: the decrypted password
         :rtype: str
         :raises ValueError: if password is not set
@@ -182,7 +199,7 @@ class Account:
     @staticmethod
     def from_unencrypted(
         plaintext_password: str,
-        master_password: str,
+        master_password: str | VaultKey,
         username: Optional[str] = None,
         service: Optional[str] = None,
         url: Optional[str] = None,
@@ -192,7 +209,7 @@ class Account:
         Create an account with a plaintext password and the master password
 
         :param str plaintext_password: password in plaintext, will be encrypted using `master_password`
-        :param str master_password: master password to encrypt `plaintext_password` with
+        :param str | VaultKey master_password: master password or unlocked vault key to encrypt `plaintext_password` with
         :param Optional[str] username: username associated with account. Defaults to None
         :param Optional[str] service: service associated with account. Defaults to None
         :param Optional[str] url: url associated with account. Defaults to None
@@ -212,6 +229,37 @@ class Account:
             id,
         )
 
+    @staticmethod
+    def lazy(
+        password_loader: Callable[[], Optional[Password]],
+        username: Optional[str],
+        service: Optional[str],
+        url: Optional[str],
+        id: str,
+    ):
+        """
+        Create an account whose password is only loaded when it is first accessed
+        The fields are trusted to be valid, and are not validated
+
+        :param password_loader: called to load the password on first access
+        :param Optional[str] username: username associated with account
+        :param Optional[str] service: service associated with account
+        :param Optional[str] url: url associated with account
+        :param str id: id associated with account
+        :return: An Account object with a lazily loaded password
+        :rtype: Account
+        """
+        # Skips __init__, which normalizes and validates the fields
+        account = Account.__new__(Account)
+        account._password = None
+        account._password_loader = password_loader
+        account.username = username
+        account.service = service
+        account.url = url
+        account.id = id
+
+        return account
+
     @staticmethod
     def from_dict(data: dict):
         """
@@ -225,7 +273,7 @@ class Account:
         ]
         password = (
             Password.from_json_serilizable(data["password"])
-            if "password" in data
+            if data.get("password") is not None
             else None
         )
 
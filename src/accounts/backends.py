@@ -0,0 +1,287 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import binary_vault, sqlite_vault
+from .account import Account
+from .journal import (
+    append_records,
+    apply_records,
+    clear_journal,
+    needs_compaction,
+    read_records,
+    record_id,
+    replay,
+)
+from ..constants.paths import MASTER_BACKUP_PATH
+from ..profiling import count, span
+from ..utils.file_utils import atomic_write
+from ..utils.json_utils import iter_json_array
+
+
+class _JournaledBackend(ABC):
+    """
+    Vault stored as a snapshot file, with changes appended to a journal next to it
+    Subclasses read and write the snapshot
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @abstractmethod
+    def _read_snapshot(self) -> List[Account]:
+        pass
+
+    def _iter_snapshot(self) -> Iterator[Account]:
+        return iter(self._read_snapshot())
+
+    @abstractmethod
+    def _write_snapshot(self, accounts: List[Account]) -> None:
+        pass
+
+    @abstractmethod
+    def _read_one(self, id: str) -> Optional[Account]:
+        pass
+
+    def load_all(self) -> List[Account]:
+        """
+        Return a list of accounts from the snapshot, with its journal replayed on top
+        """
+        return replay(self.path, self._read_snapshot())
+
+    def iter_all(self) -> Iterator[Account]:
+        """
+        Yields the accounts of the snapshot as they are read, with its journal replayed on top,
+        in the same order as `load_all`
+        """
+        records = read_records(self.path)
+        records_by_id: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            records_by_id.setdefault(record_id(record), []).append(record)
+
+        # Deleted accounts, which go after the rest if they're created again
+        deleted: List[Account] = []
+
+        for account in self._iter_snapshot():
+            account_records = records_by_id.get(account.id)
+            if account_records is None:
+                yield account
+            elif any(record["op"] == "delete" for record in account_records):
+                deleted.append(account)
+            else:
+                yield from apply_records([account], records_by_id.pop(account.id))
+
+        # Accounts created by the journal, in the order they were created
+        yield from apply_records(
+            deleted,
+            [record for record in records if record_id(record) in records_by_id],
+        )
+
+    def load_one(self, id: str) -> Optional[Account]:
+        """
+        Reads a single account from the snapshot, with the journal records of the account applied
+        """
+        account = self._read_one(id)
+
+        records = [
+            record for record in read_records(self.path) if record_id(record) == id
+        ]
+        accounts = apply_records([] if account is None else [account], records)
+
+        return accounts[0] if len(accounts) > 0 else None
+
+    def apply(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Appends records to the journal, and compacts it if it has grown too large
+        """
+        append_records(self.path, records)
+
+        if needs_compaction(self.path):
+            self.compact()
+
+    def write_all(self, accounts: List[Account]) -> None:
+        """
+        Atomically replaces the snapshot with `accounts`, and removes the journal
+        """
+        self._write_snapshot(accounts)
+
+        # Every record of the journal is now part of the snapshot
+        clear_journal(self.path)
+
+    def compact(self) -> int:
+        """
+        Rewrites the snapshot with its journal applied, and removes the journal
+
+        :return: number of accounts in the compacted snapshot
+        :rtype: int
+        """
+        accounts = self.load_all()
+        self.write_all(accounts)
+
+        return len(accounts)
+
+
+class JsonBackend(_JournaledBackend):
+    """
+    Vault stored as a json file, with changes appended to a journal next to it
+    """
+
+    # The file is streamed until the account is found, without building the accounts before it
+    supports_point_lookup = True
+
+    def _read_snapshot(self) -> List[Account]:
+        """
+        If the file is not found, create a new one
+        Can raise a `JSONDecodeError`
+        """
+        # Parsing the whole file at once is faster when every account is needed anyway
+        try:
+            with span("read"), open(self.path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            with open(self.path, "w") as file:
+                file.write("[]")
+            return []
+
+        count("bytes read", len(data))
+        with span("json parse"):
+            accounts = json.loads(data)
+        with span("accounts"):
+            return [Account.from_dict(account) for account in accounts]
+
+    def _iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the accounts of the file as dicts, parsing one at a time
+        """
+        try:
+            file = open(self.path, "r")
+        except FileNotFoundError:
+            with open(self.path, "w") as file:
+                file.write("[]")
+            return
+
+        with file:
+            try:
+                yield from iter_json_array(file)
+            finally:
+                count("bytes read", file.buffer.tell())
+
+    def _iter_snapshot(self) -> Iterator[Account]:
+        for account in self._iter_dicts():
+            yield Account.from_dict(account)
+
+    def _read_one(self, id: str) -> Optional[Account]:
+        for account in self._iter_dicts():
+            if account.get("id") == id:
+                return Account.from_dict(account)
+
+        return None
+
+    def _write_snapshot(self, accounts: List[Account]) -> None:
+        with atomic_write(self.path) as file:
+            serialized_accounts = [
+                account.to_json_serializable() for account in accounts
+            ]
+            json.dump(serialized_accounts, file, indent=4)
+
+
+class BinaryBackend(_JournaledBackend):
+    """
+    Vault stored in the compact binary format (see `binary_vault`), with changes appended to a journal next to it
+    """
+
+    supports_point_lookup = True
+
+    def _read_snapshot(self) -> List[Account]:
+        return list(self._iter_snapshot())
+
+    def _iter_snapshot(self) -> Iterator[Account]:
+        try:
+            yield from binary_vault.iter_accounts(self.path)
+        except FileNotFoundError:
+            return
+
+    def _write_snapshot(self, accounts: List[Account]) -> None:
+        binary_vault.write_vault(self.path, accounts)
+
+    def apply(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Checks that the fields of records fit in the binary vault, then appends them to the journal.
+        Otherwise they could only fail once the journal is compacted
+        """
+        for record in records:
+            if record["op"] == "create":
+                for field in ["username", "service", "url"]:
+                    binary_vault.check_field(record["account"].get(field))
+            elif record["op"] == "edit" and record["field"] != "password":
+                binary_vault.check_field(record["value"])
+
+        super().apply(records)
+
+    def _read_one(self, id: str) -> Optional[Account]:
+        """
+        Reads a single record through the index of the binary vault
+        """
+        try:
+            return binary_vault.read_account(self.path, id)
+        except FileNotFoundError:
+            return None
+
+
+class SqliteBackend:
+    """
+    Vault stored in a SQLite database, where single accounts can be read and changed with one query
+    """
+
+    supports_point_lookup = True
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load_all(self) -> List[Account]:
+        return sqlite_vault.load_accounts(self.path)
+
+    def iter_all(self) -> Iterator[Account]:
+        return sqlite_vault.iter_accounts(self.path)
+
+    def load_one(self, id: str) -> Optional[Account]:
+        return sqlite_vault.get_account(self.path, id)
+
+    def apply(self, records: List[Dict[str, Any]]) -> None:
+        sqlite_vault.apply_records(self.path, records)
+
+    def write_all(self, accounts: List[Account]) -> None:
+        sqlite_vault.write_accounts(self.path, accounts)
+
+    def compact(self) -> int:
+        """
+        Vacuums the database to reclaim the space of deleted accounts
+
+        :return: number of accounts in the database
+        :rtype: int
+        """
+        sqlite_vault.vacuum(self.path)
+        return len(self.load_all())
+
+
+Backend = JsonBackend | SqliteBackend | BinaryBackend
+
+
+def open_backend(path: str) -> Backend:
+    """
+    :return: the backend for the vault given by path, chosen by its file extension
+    :rtype: Backend
+    """
+    if os.path.exists(MASTER_BACKUP_PATH):
+        # Only imported when a rotation left its copies behind
+        from .rotation import recover_interrupted_rotation
+
+        recover_interrupted_rotation()
+
+    if sqlite_vault.is_sqlite_path(path):
+        return SqliteBackend(path)
+    if binary_vault.is_binary_path(path):
+        return BinaryBackend(path)
+
+    return JsonBackend(path)
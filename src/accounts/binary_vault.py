@@ -0,0 +1,271 @@
+import mmap
+import os
+import struct
+from typing import Iterator, List, Optional, Tuple
+
+from .account import Account
+from .password import Password
+from .. import profiling
+from ..utils.file_utils import atomic_write
+
+# Layout of a binary vault, all integers are little endian:
+#
+# Header:   magic (4 bytes) | format version (u16) | record count (u32)
+# Index:    one entry per record, sorted by id: id (16 bytes) | offset (u64) | length (u32)
+# Records:  one per account, in the order they were added:
+#           id (16 bytes) | username | service | url | password
+#
+# username, service and url are a u16 length followed by utf-8 bytes, with a length of NONE_LENGTH for None
+# password is a u8 version (NO_PASSWORD if there is no password), followed by
+# salt kind (u8) | salt (u16 length + bytes) | nonce (u8 length + bytes) | ciphertext (u32 length + bytes)
+
+BINARY_EXTENSIONS = (".vault",)
+
+MAGIC = b"PWIV"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHI")
+_INDEX_ENTRY = struct.Struct("<16sQI")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
+NONE_LENGTH = 0xFFFF
+NO_PASSWORD = 0
+
+# Salts are hex strings, so they are stored as the raw bytes they represent. Other salts are stored as text
+SALT_HEX = 0
+SALT_TEXT = 1
+
+
+def is_binary_path(path: str) -> bool:
+    """
+    :return: True iff path is the path of a binary vault
+    :rtype: bool
+    """
+    return path.endswith(BINARY_EXTENSIONS)
+
+
+def check_field(value: Optional[str]) -> None:
+    """
+    Checks that a username, service or url fits in a binary vault
+
+    :raises ValueError: if value is NONE_LENGTH bytes or longer once encoded
+    """
+    if value is not None and len(value.encode("utf-8")) >= NONE_LENGTH:
+        raise ValueError(
+            f"Usernames, services and urls of a binary vault must be shorter than {NONE_LENGTH} bytes"
+        )
+
+
+def _encode_str(value: Optional[str]) -> bytes:
+    if value is None:
+        return _U16.pack(NONE_LENGTH)
+
+    check_field(value)
+    encoded = value.encode("utf-8")
+    return _U16.pack(len(encoded)) + encoded
+
+
+def _encode_salt(salt: str) -> bytes:
+    try:
+        raw = bytes.fromhex(salt)
+        if raw.hex() == salt:
+            return _U8.pack(SALT_HEX) + _U16.pack(len(raw)) + raw
+    except ValueError:
+        pass
+
+    encoded = salt.encode("utf-8")
+    return _U8.pack(SALT_TEXT) + _U16.pack(len(encoded)) + encoded
+
+
+def _encode_record(account: Account) -> bytes:
+    parts = [
+        bytes.fromhex(account.id),
+        _encode_str(account.username),
+        _encode_str(account.service),
+        _encode_str(account.url),
+    ]
+
+    password = account.password
+    if password is None:
+        parts.append(_U8.pack(NO_PASSWORD))
+    else:
+        parts += [
+            _U8.pack(password.version),
+            _encode_salt(password.salt),
+            _U8.pack(len(password.nonce)),
+            password.nonce,
+            _U32.pack(len(password.encrypted_password)),
+            password.encrypted_password,
+        ]
+
+    return b"".join(parts)
+
+
+def write_vault(path: str, accounts: List[Account]) -> None:
+    """
+    Atomically replaces the binary vault given by path with `accounts`
+    """
+    records = [_encode_record(account) for account in accounts]
+
+    offset = _HEADER.size + _INDEX_ENTRY.size * len(records)
+    index = []
+    for account, record in zip(accounts, records):
+        index.append((bytes.fromhex(account.id), offset, len(record)))
+        offset += len(record)
+    index.sort()
+
+    with atomic_write(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(records)))
+        file.write(b"".join(_INDEX_ENTRY.pack(*entry) for entry in index))
+        file.write(b"".join(records))
+
+
+def _decode_str(data: bytes, offset: int) -> Tuple[Optional[str], int]:
+    length = data[offset] | data[offset + 1] << 8
+    offset += 2
+
+    if length == NONE_LENGTH:
+        return None, offset
+
+    end = offset + length
+    return data[offset:end].decode("utf-8"), end
+
+
+def _decode_password(data: bytes, offset: int) -> Optional[Password]:
+    (version,) = _U8.unpack_from(data, offset)
+    if version == NO_PASSWORD:
+        return None
+
+    salt_kind, salt_length = struct.unpack_from("<BH", data, offset + 1)
+    offset += 4
+    raw_salt = bytes(data[offset : offset + salt_length])
+    salt = raw_salt.hex() if salt_kind == SALT_HEX else raw_salt.decode("utf-8")
+    offset += salt_length
+
+    (nonce_length,) = _U8.unpack_from(data, offset)
+    offset += _U8.size
+    nonce = bytes(data[offset : offset + nonce_length])
+    offset += nonce_length
+
+    (encrypted_length,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    encrypted_password = bytes(data[offset : offset + encrypted_length])
+
+    return Password(encrypted_password, salt, nonce, version)
+
+
+def _decode_record(data: bytes, offset: int) -> Account:
+    """
+    Decodes the record starting at `offset`. The password is only decoded once it is accessed
+    """
+    id = data[offset : offset + 16].hex()
+    offset += 16
+
+    username, offset = _decode_str(data, offset)
+    service, offset = _decode_str(data, offset)
+    url, offset = _decode_str(data, offset)
+
+    password_offset = offset
+    account = Account.lazy(
+        lambda: _decode_password(data, password_offset), username, service, url, id
+    )
+
+    return account
+
+
+def _read_header(data: bytes | mmap.mmap) -> int:
+    """
+    :return: the number of records in the vault
+    :raises ValueError: if data is not a binary vault
+    """
+    magic, version, count = _HEADER.unpack_from(data, 0)
+
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a binary vault")
+
+    return count
+
+
+def iter_accounts(path: str) -> Iterator[Account]:
+    """
+    Decodes the accounts in the binary vault given by path one at a time
+
+    :return: every account in the vault, in the order they were added
+    :rtype: Iterator[Account]
+    :raises ValueError: if the file is not a binary vault
+    """
+    with profiling.span("read"), open(path, "rb") as file:
+        data = file.read()
+    profiling.count("bytes read", len(data))
+
+    count = _read_header(data)
+    index_end = _HEADER.size + _INDEX_ENTRY.size * count
+
+    # Records are stored back to back, in the order they were added
+    offsets = sorted(
+        offset
+        for _, offset, _ in _INDEX_ENTRY.iter_unpack(data[_HEADER.size : index_end])
+    )
+
+    for offset in offsets:
+        yield _decode_record(data, offset)
+
+
+def read_accounts(path: str) -> List[Account]:
+    """
+    :return: every account in the binary vault given by path, in the order they were added
+    :rtype: List[Account]
+    :raises ValueError: if the file is not a binary vault
+    """
+    with profiling.span("accounts"):
+        return list(iter_accounts(path))
+
+
+def _find_record(data: mmap.mmap, count: int, raw_id: bytes) -> Optional[bytes]:
+    """
+    Binary searches the index for `raw_id`, reading only the index entries it visits
+
+    :return: the record of the account, or None if there isn't one
+    """
+    low, high = 0, count
+
+    while low < high:
+        middle = (low + high) // 2
+        entry_offset = _HEADER.size + middle * _INDEX_ENTRY.size
+        entry_id = data[entry_offset : entry_offset + 16]
+
+        if entry_id < raw_id:
+            low = middle + 1
+        elif entry_id > raw_id:
+            high = middle
+        else:
+            _, offset, length = _INDEX_ENTRY.unpack_from(data, entry_offset)
+            return data[offset : offset + length]
+
+    return None
+
+
+def read_account(path: str, id: str) -> Optional[Account]:
+    """
+    Reads a single account. The vault is memory mapped, and only the pages of the index entries visited
+    by a binary search and of the account's record are read, no matter how large the vault is
+
+    :return: the account with id `id`, or None if there isn't one
+    :rtype: Optional[Account]
+    :raises ValueError: if the file is not a binary vault
+    """
+    try:
+        raw_id = bytes.fromhex(id)
+    except ValueError:
+        return None
+
+    with profiling.span("read"), open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < _HEADER.size:
+            raise ValueError("Not a binary vault")
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            record = _find_record(data, _read_header(data), raw_id)
+
+    return None if record is None else _decode_record(record, 0)
@@ -0,0 +1,58 @@
+import csv
+import json
+from typing import List, TextIO
+
+from .account import Account
+from .parallel import decrypt_passwords
+from ..encryption.vault_key import VaultKey
+
+EXPORT_FORMATS = ["jsonl", "csv"]
+EXPORT_FIELDS = ["id", "username", "service", "url", "password"]
+
+
+def export_accounts(
+    accounts: List[Account],
+    key: VaultKey,
+    stream: TextIO,
+    format: str = "jsonl",
+    workers: int = 1,
+) -> int:
+    """
+    Writes every account with its decrypted password to `stream`, in the same order as `accounts`
+    Passwords are decrypted across `workers` processes and written as soon as they are decrypted
+
+    :param List[Account] accounts: accounts to export
+    :param VaultKey key: unlocked vault key used to encrypt the passwords
+    :param TextIO stream: stream to write to
+    :param str format: either "jsonl" (one json object per line) or "csv"
+    :param int workers: number of worker processes used to decrypt passwords
+    :return: number of exported accounts
+    :rtype: int
+    :raises ValueError: if format is not an export format
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}")
+
+    if format == "csv":
+        writer = csv.DictWriter(stream, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+
+    passwords = decrypt_passwords(
+        [account.password for account in accounts], key, workers
+    )
+
+    for account, password in zip(accounts, passwords):
+        row = {
+            "id": account.id,
+            "username": account.username,
+            "service": account.service,
+            "url": account.url,
+            "password": password,
+        }
+
+        if format == "csv":
+            writer.writerow(row)
+        else:
+            stream.write(json.dumps(row) + "\n")
+
+    return len(accounts)
@@ -1,73 +1,84 @@
-import json
 import click
-from typing import List
-import pyperclip
+from typing import Iterator, List, Optional
 
 from rich.console import Console
 
-from .account import Account, find_account_by_id, Password, field_strs
-from ..constants import paths as PATHS
+from .account import Account, Password, field_strs
+from .backends import open_backend
+from .store import AccountStore
+from ..agent.client import agent_encrypt, agent_get_password
+from ..config import vault_path
 from ..constants.strings import (
     COPIED_TO_CLIPBOARD,
     MASTER_PASSWORD_ERROR,
     MASTER_PASSWORD_NOT_FOUND_ERROR,
 )
+from ..encryption.vault_key import VaultKey, unlock
 from ..io.prompting import confirm
 
 
 def load_accounts_from_file(path: str) -> list[Account]:
     """
-    Return a list of accounts from the json file given by path. If a file is not found, create a new one
+    Return a list of accounts from the vault given by path. For json files the journal is replayed on top.
+    If a file is not found, create a new one
     Can raise a `JSONDecodeError`
     """
-    try:
-        with open(path, "r") as file:
-            data = json.load(file)
+    return AccountStore.load(path).accounts()
+
 
-        return [Account.from_dict(account) for account in data]
-    except FileNotFoundError:
-        with open(PATHS.ACCOUNT_PATH, "w") as file:
-            file.write("[]")
-        return []
+def iter_accounts_from_file(path: str) -> Iterator[Account]:
+    """
+    Yields the accounts of the vault given by path as they are read, for showing them before the whole vault is loaded
+    For json files the journal is replayed on top.
+    If a file is not found, create a new one
+    Can raise a `JSONDecodeError`
+    """
+    return open_backend(path).iter_all()
 
 
 def save_account_to_file(path: str, account: Account) -> None:
     """
-    Append the given account to the json file given by path
+    Append the given account to the vault given by path
+    For json files only the journal is appended to, the file itself is not rewritten
 
-    :param str path: Path of json file to append to
+    :param str path: Path of the vault to append to
     :param Account account: Account to append to file
-    :raises ValueError: If path contains invalid json
-    :raises JSONDecodeError: If path contains semantic errors
     """
-    accounts = load_accounts_from_file(path)
-    accounts.append(account)
+    store = AccountStore(path)
+    store.add(account)
+    store.save()
 
-    with open(path, "w") as file:
-        # Convert the accounts to a list of dicts so it's json serializable
-        serialized_accounts = [account.to_json_serializable() for account in accounts]
-        json.dump(serialized_accounts, file, indent=4)
+
+def compact_accounts_file(path: str) -> int:
+    """
+    Rewrites the json file given by path with its journal applied, and removes the journal
+    SQLite vaults are vacuumed instead
+
+    :param str path: Path of the vault to compact
+    :return: number of accounts in the compacted file
+    :rtype: int
+    """
+    return AccountStore(path).compact()
 
 
 def write_accounts_to_file(path: str, accounts: List[Account]) -> None:
     """
-    Write a list of accounts to a json file. Will overwrite the contents of path
+    Write a list of accounts to a vault. Will atomically replace the contents of path
 
-    :param str path: Path of json file to write to
+    :param str path: Path of the vault to write to
     :param List[Account] accounts: List of accounts to write to path
     """
-    with open(path, "w") as file:
-        serialized_accounts = [account.to_json_serializable() for account in accounts]
-        json.dump(serialized_accounts, file, indent=4)
+    store = AccountStore(path)
+    store.replace_all(accounts)
+    store.save()
 
 
 def delete_account(id: str, console: Console):
     """
     Delete an account with a specific id. Will ask the user for confirmation before deleting the account
     """
-    accounts = load_accounts_from_file(PATHS.ACCOUNT_PATH)
-
-    deleted_account = find_account_by_id(accounts, id)
+    store = AccountStore(vault_path())
+    deleted_account = store.get(id)
 
     if deleted_account is None:
         console.print(f"[red]No account found with id: [/]{id}")
@@ -80,20 +91,17 @@ def delete_account(id: str, console: Console):
     if not confirmation:
         return
 
-    new_accounts = [account for account in accounts if account.id != id]
-
-    # Check if no account was deleted
-    if len(accounts) == len(new_accounts):
-        console.print(f"[red]No Account Found with id: [/]{id}")
-        return
-
-    write_accounts_to_file(PATHS.ACCOUNT_PATH, new_accounts)
+    store.delete(id)
+    store.save()
     console.print("[green]🗑️ Account Succesfully Deleted[/green]")
 
 
 def edit_account(id: str, field: str, new_value: str | Password):
     """
     Edit an account with a specific id
+
+    :raises ValueError: if field is not a valid field, or no account has id `id`
+    :raises TypeError: if new_value is a Password and field is not "password", or the other way around
     """
     # Check types and values
     if field not in field_strs:
@@ -103,14 +111,14 @@ def edit_account(id: str, field: str, new_value: str | Password):
     elif field != "password" and isinstance(new_value, Password):
         raise TypeError
 
-    accounts = load_accounts_from_file(PATHS.ACCOUNT_PATH)
+    store = AccountStore(vault_path())
 
-    new_accounts = [
-        (account if account.id != id else account.set_value(field, new_value))
-        for account in accounts
-    ]
+    try:
+        store.update(id, field, new_value)
+    except KeyError:
+        raise ValueError(f"No account found with id: {id}")
 
-    write_accounts_to_file(PATHS.ACCOUNT_PATH, new_accounts)
+    store.save()
 
 
 def edit_account_with_feedback(
@@ -118,7 +126,8 @@ def edit_account_with_feedback(
 ):
     """
     Edit an account with a specific id, and print feedback to the user indicating success/failure
-    If editing password, function accepts the password in plaintext and will prompt user for the master password
+    If editing password, function accepts the password in plaintext and will prompt user for the master password,
+    unless the unlock agent is running
     """
     if field not in field_strs:
         raise ValueError
@@ -129,10 +138,13 @@ def edit_account_with_feedback(
         if field == "password" and not confirm(new_value, console):
             return
 
-        # Prompt to ask for Master Password
-        master_password = input("Master Password: ")
         try:
-            value = Password.from_plaintext(new_value, master_password)
+            value = agent_encrypt(new_value)
+
+            # Prompt to ask for Master Password
+            if value is None:
+                master_password = input("Master Password: ")
+                value = Password.from_plaintext(new_value, master_password)
         except ValueError:
             err_console.print(MASTER_PASSWORD_ERROR)
             return
@@ -142,48 +154,108 @@ def edit_account_with_feedback(
     else:
         value = new_value
 
-    edit_account(id, field, value)
+    try:
+        edit_account(id, field, value)
+    except ValueError as e:
+        err_console.print(f"[red]{e}[/]")
+        return
+
     console.print("[green]📝 Account Succesfully Edited[/]")
 
 
-def get_password_from_account(path: str, id: str, master_password: str):
+def get_password_from_account(path: str, id: str, master_password: str | VaultKey):
     """
     Gets a password from an account with id `id`
 
+    :param str path: Path of the vault
     :param str id: id of account to edit
-    :param str master_password: master password used to encrypt the password
+    :param str | VaultKey master_password: master password or unlocked vault key used to encrypt the password
     :return: decrypted password
     :rtype: str
     :raises ValueError: if account with id `id` not found
     :raises ValueError: if account has no associated password
     :raises ValueError: if master_password is incorrect
     """
-    accounts = load_accounts_from_file(path)
+    account = AccountStore(path).get(id)
 
-    for account in accounts:
-        if account.id == id:
-            return account.get_password(master_password)
+    if account is not None:
+        return account.get_password(master_password)
 
     raise ValueError(f"No account found with id: {id}")
 
 
 def get_password_from_account_with_feedback(
     id: str,
-    master_password: str,
+    master_password: Optional[str],
     console: Console,
     err_console: Console,
     clip: bool = False,
 ):
     """
     See `get_password_from_account`. Does the same thing, excepts prints error/success or saves to clipboard
+    If `master_password` is None, the unlock agent is used. If it isn't running the user is prompted for the master password
     """
     try:
-        password = get_password_from_account(PATHS.ACCOUNT_PATH, id, master_password)
+        password = None if master_password is not None else agent_get_password(id)
+
+        if password is None:
+            if master_password is None:
+                master_password = input("Master Password: ")
+
+            password = get_password_from_account(vault_path(), id, master_password)
 
         if clip:
+            import pyperclip  # Slow to import, and only needed for the clipboard
+
             pyperclip.copy(password)
             console.print(COPIED_TO_CLIPBOARD)
         else:
             console.print(f"password: {password}")
     except ValueError as e:
         err_console.print(f"[red]{e}[/]")
+
+
+def migrate_vault(path: str, master_password: str) -> int:
+    """
+    Re-encrypts every legacy password in the vault given by path with the current vault format
+    The master password is verified once, and the vault is only written to if a password was migrated
+
+    :param str path: Path of the vault to migrate
+    :param str master_password: master password used to encrypt the passwords
+    :return: number of migrated passwords
+    :rtype: int
+    :raises ValueError: if master_password is incorrect
+    :raises FileNotFoundError: if `master.txt` is not found
+    """
+    key = unlock(master_password)
+    store = AccountStore.load(path)
+    migrated = 0
+
+    for account in store:
+        if account.password is not None and account.password.is_legacy():
+            store.update(account.id, "password", account.password.upgrade(key))
+            migrated += 1
+
+    store.save()
+    return migrated
+
+
+def import_vault(source: str, destination: str) -> int:
+    """
+    Copies every account from the vault given by source into the vault given by destination
+    Accounts with the id of an account already in destination replace it
+
+    :param str source: Path of the vault to import
+    :param str destination: Path of the vault to import into
+    :return: number of imported accounts
+    :rtype: int
+    """
+    store = AccountStore(destination)
+    imported = 0
+
+    for account in iter_accounts_from_file(source):
+        store.add(account)
+        imported += 1
+
+    store.save()
+    return imported
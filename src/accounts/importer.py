@@ -0,0 +1,246 @@
+import csv
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO
+
+from .account import Account
+from .parallel import encrypt_passwords
+from .password import Password
+from .store import AccountStore
+from ..encryption.vault_key import VaultKey
+from ..utils.password_utils import generate_password
+
+IMPORT_FORMATS = ["csv", "json", "jsonl"]
+IMPORT_FIELDS = ["username", "service", "url", "password"]
+SPEC_FIELDS = IMPORT_FIELDS + ["generate"]
+
+# Columns of the exports of other password managers (Bitwarden, LastPass, 1Password, KeePass, browsers...)
+# and of `export`, in order of preference. Nested json fields are joined with "."
+COLUMN_ALIASES = {
+    "username": ["username", "login_username", "login.username", "user", "email"],
+    "service": ["service", "name", "title"],
+    "url": ["url", "login_uri", "login.uris.uri", "uri", "website"],
+    "password": ["password", "login_password", "login.password"],
+}
+
+
+def detect_format(path: str) -> str:
+    """
+    :return: the import format of the file given by path, from its extension. Defaults to json
+    :rtype: str
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".csv":
+        return "csv"
+    if extension in [".jsonl", ".ndjson"]:
+        return "jsonl"
+    return "json"
+
+
+def _flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, Optional[str]]:
+    """
+    Flattens nested objects into columns joined with ".". Only the first item of a list is kept,
+    e.g. the first of the urls of a Bitwarden login
+    """
+    row: Dict[str, Optional[str]] = {}
+
+    for name, value in data.items():
+        if isinstance(value, list):
+            value = value[0] if len(value) > 0 else None
+
+        if isinstance(value, dict):
+            row.update(_flatten(value, f"{prefix}{name}."))
+        else:
+            row[f"{prefix}{name}"] = None if value is None else str(value)
+
+    return row
+
+
+def read_rows(stream: TextIO, format: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Reads the entries of an export of another password manager
+
+    :param TextIO stream: stream to read from
+    :param str format: "csv", "json" (an array of objects, or an object with an "items" array like Bitwarden)
+        or "jsonl" (one json object per line, like `export`)
+    :return: the entries, as column -> value
+    :rtype: List[Dict[str, Optional[str]]]
+    :raises ValueError: if format is not an import format, or the stream isn't valid in that format
+    """
+    if format not in IMPORT_FORMATS:
+        raise ValueError(f"Unknown import format: {format}")
+
+    if format == "csv":
+        try:
+            return list(csv.DictReader(stream))
+        except csv.Error as error:
+            raise ValueError(f"Invalid csv: {error}") from error
+
+    if format == "jsonl":
+        items = [json.loads(line) for line in stream if line.strip() != ""]
+    else:
+        items = json.load(stream)
+        if isinstance(items, dict) and isinstance(items.get("items"), list):
+            items = items["items"]
+
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError("Expected a list of json objects")
+
+    return [_flatten(item) for item in items]
+
+
+def map_columns(
+    rows: List[Dict[str, Optional[str]]], overrides: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """
+    Finds the column of each account field. Columns are matched ignoring case and surrounding whitespace
+
+    :param List[Dict[str, Optional[str]]] rows: entries read with `read_rows`
+    :param Optional[Dict[str, str]] overrides: account field -> column, for columns which aren't found by name
+    :return: account field -> column, for every field with a column
+    :rtype: Dict[str, str]
+    :raises ValueError: if an override isn't an account field, or its column isn't in rows
+    """
+    columns: Dict[str, str] = {}
+    for row in rows:
+        for column in row:
+            # csv rows with more values than the header have them under None
+            if column is not None:
+                columns.setdefault(column.strip().casefold(), column)
+
+    mapping: Dict[str, str] = {}
+
+    for field, column in (overrides or {}).items():
+        if field not in IMPORT_FIELDS:
+            raise ValueError(f"Unknown account field: {field}")
+        if column.strip().casefold() not in columns:
+            raise ValueError(f"Unknown column: {column}")
+        mapping[field] = columns[column.strip().casefold()]
+
+    for field, aliases in COLUMN_ALIASES.items():
+        if field in mapping:
+            continue
+
+        for alias in aliases:
+            if alias in columns:
+                mapping[field] = columns[alias]
+                break
+
+    return mapping
+
+
+def read_account_specs(stream: TextIO) -> List[Dict[str, Optional[str]]]:
+    """
+    Reads newline delimited json specs of accounts to create, e.g.
+    {"service": "db", "username": "app", "password": "hunter2"} or {"service": "api", "generate": 32}
+    Every spec has either a password, or "generate" set to true or to the length of a password to generate.
+    Every spec is read and checked before anything is created, so one bad spec doesn't create half of the accounts
+
+    :param TextIO stream: stream to read from. Empty lines are skipped
+    :return: account field -> value of every spec, with the generated passwords
+    :rtype: List[Dict[str, Optional[str]]]
+    :raises ValueError: if a spec is invalid, with the number of its line
+    """
+    specs = []
+
+    for line_number, line in enumerate(stream, 1):
+        if line.strip() == "":
+            continue
+
+        try:
+            spec = json.loads(line)
+            if not isinstance(spec, dict):
+                raise ValueError("Expected a json object")
+
+            unknown = set(spec) - set(SPEC_FIELDS)
+            if len(unknown) > 0:
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+            for field in IMPORT_FIELDS:
+                if not isinstance(spec.get(field), (str, type(None))):
+                    raise ValueError(f"{field} should be a string")
+
+            generate = spec.pop("generate", None)
+            if (spec.get("password") is None) == (generate in [None, False]):
+                raise ValueError("Expected either a password or generate")
+            if generate is True:
+                spec["password"] = generate_password()
+            elif isinstance(generate, int) and not isinstance(generate, bool):
+                if generate < 1:
+                    raise ValueError("generate should be a positive length")
+                spec["password"] = generate_password(generate)
+            elif generate not in [None, False]:
+                raise ValueError("generate should be true or a length")
+        except ValueError as error:
+            raise ValueError(f"Line {line_number}: {error}") from error
+
+        specs.append(spec)
+
+    return specs
+
+
+def add_accounts(
+    path: str,
+    entries: List[Dict[str, Optional[str]]],
+    passwords: Iterable[Optional[Password]],
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> List[Account]:
+    """
+    Adds an account with a new id for every entry to the vault given by path. The vault is written once,
+    after every account was added, so an error part way through leaves the vault untouched
+
+    :param List[Dict[str, Optional[str]]] entries: account field -> value, for the username, service and url
+    :param Iterable[Optional[Password]] passwords: encrypted password of each entry, in the same order
+    :param on_progress: called with the number of added accounts and the total number of accounts
+    :return: the added accounts, in the same order as entries
+    :rtype: List[Account]
+    """
+    store = AccountStore(path)
+    accounts = []
+
+    for done, (entry, password) in enumerate(zip(entries, passwords), 1):
+        account = Account(
+            password, entry.get("username"), entry.get("service"), entry.get("url")
+        )
+        store.add(account)
+        accounts.append(account)
+
+        if on_progress is not None:
+            on_progress(done, len(entries))
+
+    store.save()
+    return accounts
+
+
+def import_accounts(
+    path: str,
+    rows: List[Dict[str, Optional[str]]],
+    mapping: Dict[str, str],
+    key: VaultKey,
+    workers: int = 1,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Adds an account for every entry to the vault given by path, with a new id
+    Passwords are encrypted across `workers` processes, and the vault is written once, after every password was encrypted
+    Entries without any mapped field (e.g. folders or notes) are skipped
+
+    :param str path: path of the vault to import into
+    :param List[Dict[str, Optional[str]]] rows: entries read with `read_rows`
+    :param Dict[str, str] mapping: account field -> column, from `map_columns`
+    :param VaultKey key: unlocked vault key to encrypt the passwords with
+    :param int workers: number of processes used to encrypt passwords
+    :param on_progress: called with the number of encrypted passwords and the total number of accounts
+    :return: number of imported accounts
+    :rtype: int
+    """
+    entries = []
+    for row in rows:
+        entry = {field: row.get(column) or None for field, column in mapping.items()}
+        if any(value is not None for value in entry.values()):
+            entries.append(entry)
+
+    passwords = encrypt_passwords(
+        [entry.get("password") for entry in entries], key, workers
+    )
+    return len(add_accounts(path, entries, passwords, on_progress))
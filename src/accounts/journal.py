@@ -0,0 +1,222 @@
+import json
+import os
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from .account import Account
+from .password import Password
+from ..constants.numbers import (
+    JOURNAL_MIN_COMPACT_BYTES,
+    JOURNAL_COMPACT_RATIO,
+    JOURNAL_READ_SIZE,
+)
+from ..profiling import count, span
+
+# Start of every record, as written by json.dumps
+RECORD_START = b'{"op": '
+
+
+def journal_path(path: str) -> str:
+    """
+    :return: path of the journal of the json file given by path
+    :rtype: str
+    """
+    return f"{path}.journal"
+
+
+def create_record(account: Account) -> Dict[str, Any]:
+    return {"op": "create", "account": account.to_json_serializable()}
+
+
+def edit_record(id: str, field: str, new_value: str | Password) -> Dict[str, Any]:
+    value = (
+        new_value.to_json_serializable()
+        if isinstance(new_value, Password)
+        else new_value
+    )
+    return {"op": "edit", "id": id, "field": field, "value": value}
+
+
+def delete_record(id: str) -> Dict[str, Any]:
+    return {"op": "delete", "id": id}
+
+
+def record_id(record: Dict[str, Any]) -> str:
+    """
+    :return: id of the account a record applies to
+    :rtype: str
+    """
+    if record["op"] == "create":
+        return record["account"]["id"]
+
+    return record["id"]
+
+
+def _truncate_incomplete_record(file: BinaryIO) -> None:
+    """
+    Truncates the journal open in `file` after its last complete record, removing a record whose write was
+    interrupted. Otherwise the next record would be appended to the same line, and both would be lost
+    """
+    end = file.seek(0, os.SEEK_END)
+    position = end
+
+    # Complete records end with a newline, so the incomplete record starts after the last one
+    while position > 0:
+        start = max(0, position - JOURNAL_READ_SIZE)
+        file.seek(start)
+        newline = file.read(position - start).rfind(b"\n")
+
+        if newline != -1:
+            position = start + newline + 1
+            break
+        position = start
+
+    if position < end:
+        file.truncate(position)
+
+
+def append_records(path: str, records: List[Dict[str, Any]]) -> None:
+    """
+    Appends records to the journal of the json file given by path
+    Only the new records are written, so this doesn't depend on the size of the vault
+
+    :param str path: Path of json file the records apply to
+    :param List[Dict] records: records created with `create_record`, `edit_record` or `delete_record`
+    """
+    data = "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+
+    # Writes of "a" files always go to the end, even after seeking to read
+    with span("write"), open(journal_path(path), "a+b") as file:
+        _truncate_incomplete_record(file)
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+    count("bytes written", len(data))
+
+
+def _parse_record(line: bytes) -> Optional[Dict[str, Any]]:
+    """
+    :return: the record on line, or None if it isn't a complete record
+    :rtype: Optional[Dict[str, Any]]
+    """
+    try:
+        return json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        pass
+
+    # Before incomplete records were truncated, the next record was appended to the same line
+    start = line.rfind(RECORD_START)
+    if start <= 0:
+        return None
+
+    try:
+        return json.loads(line[start:])
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    """
+    Reads the records in the journal of the json file given by path
+    Records whose write was interrupted are skipped, without skipping the records after them
+
+    :param str path: Path of json file the journal belongs to
+    :return: the records, in the order they were appended
+    :rtype: List[Dict]
+    """
+    try:
+        with span("read"), open(journal_path(path), "rb") as file:
+            lines = file.readlines()
+    except FileNotFoundError:
+        return []
+
+    count("bytes read", sum(len(line) for line in lines))
+
+    records = []
+
+    for line in lines:
+        record = _parse_record(line)
+        if record is not None:
+            records.append(record)
+
+    return records
+
+
+def apply_records(
+    accounts: List[Account], records: List[Dict[str, Any]]
+) -> List[Account]:
+    """
+    Applies records to `accounts`
+    Applying is idempotent, so applying records that were already compacted into the json file is harmless
+
+    :param List[Account] accounts: accounts to apply the records to
+    :param List[Dict] records: records created with `create_record`, `edit_record` or `delete_record`
+    :return: the accounts after every record was applied
+    :rtype: List[Account]
+    """
+    if len(records) == 0:
+        return accounts
+
+    by_id = {account.id: account for account in accounts}
+
+    for record in records:
+        match record["op"]:
+            case "create":
+                account = Account.from_dict(record["account"])
+                by_id[account.id] = account
+            case "edit":
+                account = by_id.get(record["id"])
+                if account is None:
+                    continue
+
+                value = record["value"]
+                if record["field"] == "password":
+                    value = Password.from_json_serilizable(value)
+                account.set_value(record["field"], value)
+            case "delete":
+                by_id.pop(record["id"], None)
+
+    return list(by_id.values())
+
+
+def replay(path: str, accounts: List[Account]) -> List[Account]:
+    """
+    Applies the records in the journal of the json file given by path to `accounts`
+
+    :param str path: Path of json file the journal belongs to
+    :param List[Account] accounts: accounts loaded from the json file
+    :return: the accounts after every record was applied
+    :rtype: List[Account]
+    """
+    return apply_records(accounts, read_records(path))
+
+
+def clear_journal(path: str) -> None:
+    """
+    Removes the journal of the json file given by path. Should only be called after the json file
+    has been rewritten with every record applied
+    """
+    try:
+        os.remove(journal_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def needs_compaction(path: str) -> bool:
+    """
+    :return: True iff the journal of the json file given by path has grown large enough to be compacted
+    :rtype: bool
+    """
+    try:
+        journal_size = os.path.getsize(journal_path(path))
+    except FileNotFoundError:
+        return False
+
+    try:
+        vault_size = os.path.getsize(path)
+    except FileNotFoundError:
+        vault_size = 0
+
+    return journal_size > max(
+        JOURNAL_MIN_COMPACT_BYTES, vault_size * JOURNAL_COMPACT_RATIO
+    )
@@ -0,0 +1,130 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .password import Password
+from ..encryption.vault_key import VaultKey
+
+# Number of passwords sent to a worker process at once
+CHUNK_SIZE = 64
+
+# Vault keys of the current worker process, set by `_init_worker`
+_worker_keys: List[VaultKey] = []
+
+
+def default_workers() -> int:
+    """
+    :return: the default number of worker processes, one per core
+    :rtype: int
+    """
+    return os.cpu_count() or 1
+
+
+def _init_worker(credentials: List[Tuple[str, bytes]]) -> None:
+    global _worker_keys
+    _worker_keys = [VaultKey(*key_credentials) for key_credentials in credentials]
+
+
+def _decrypt(key: VaultKey, password: Optional[Password]) -> Optional[str]:
+    return None if password is None else password.decrypt(key)
+
+
+def _decrypt_in_worker(password: Optional[Password]) -> Optional[str]:
+    return _decrypt(_worker_keys[0], password)
+
+
+def _encrypt(key: VaultKey, plaintext: Optional[str]) -> Optional[Password]:
+    return None if plaintext is None else Password.from_plaintext(plaintext, key)
+
+
+def _encrypt_in_worker(plaintext: Optional[str]) -> Optional[Password]:
+    return _encrypt(_worker_keys[0], plaintext)
+
+
+def _reencrypt(
+    old_key: VaultKey, new_key: VaultKey, password: Optional[Password]
+) -> Optional[Password]:
+    if password is None:
+        return None
+
+    return Password.from_plaintext(password.decrypt(old_key), new_key)
+
+
+def _reencrypt_in_worker(password: Optional[Password]) -> Optional[Password]:
+    return _reencrypt(_worker_keys[0], _worker_keys[1], password)
+
+
+def _map(
+    func,
+    worker_func,
+    passwords: Sequence,
+    keys: List[VaultKey],
+    workers: int,
+) -> Iterator:
+    """
+    Maps `func` over passwords in this process, or `worker_func` across a pool of worker processes
+    The worker processes are given `keys` without having to verify or derive them again
+    """
+    if workers <= 1 or len(passwords) <= CHUNK_SIZE:
+        for password in passwords:
+            yield func(*keys, password)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=([key.credentials() for key in keys],),
+    ) as executor:
+        yield from executor.map(worker_func, passwords, chunksize=CHUNK_SIZE)
+
+
+def decrypt_passwords(
+    passwords: Sequence[Optional[Password]], key: VaultKey, workers: int
+) -> Iterator[Optional[str]]:
+    """
+    Decrypts passwords across a pool of worker processes. Passwords are yielded in the same order they were given
+
+    :param Sequence[Optional[Password]] passwords: passwords to decrypt, None entries are yielded as None
+    :param VaultKey key: unlocked vault key used to encrypt the passwords
+    :param int workers: number of worker processes. With 1 worker passwords are decrypted in this process
+    :return: iterator over the decrypted passwords
+    :rtype: Iterator[Optional[str]]
+    """
+    return _map(_decrypt, _decrypt_in_worker, passwords, [key], workers)
+
+
+def encrypt_passwords(
+    plaintexts: Sequence[Optional[str]], key: VaultKey, workers: int
+) -> Iterator[Optional[Password]]:
+    """
+    Encrypts plaintext passwords across a pool of worker processes. Passwords are yielded in the same order they were given
+
+    :param Sequence[Optional[str]] plaintexts: passwords to encrypt, None entries are yielded as None
+    :param VaultKey key: unlocked vault key to encrypt the passwords with
+    :param int workers: number of worker processes. With 1 worker passwords are encrypted in this process
+    :return: iterator over the encrypted passwords
+    :rtype: Iterator[Optional[Password]]
+    """
+    return _map(_encrypt, _encrypt_in_worker, plaintexts, [key], workers)
+
+
+def reencrypt_passwords(
+    passwords: Sequence[Optional[Password]],
+    old_key: VaultKey,
+    new_key: VaultKey,
+    workers: int,
+) -> Iterator[Optional[Password]]:
+    """
+    Decrypts passwords with `old_key` and encrypts them again with `new_key`, across a pool of worker processes
+    Passwords are yielded in the same order they were given
+
+    :param Sequence[Optional[Password]] passwords: passwords to re-encrypt, None entries are yielded as None
+    :param VaultKey old_key: unlocked vault key used to encrypt the passwords
+    :param VaultKey new_key: vault key to encrypt the passwords with
+    :param int workers: number of worker processes. With 1 worker passwords are re-encrypted in this process
+    :return: iterator over the re-encrypted passwords
+    :rtype: Iterator[Optional[Password]]
+    """
+    return _map(
+        _reencrypt, _reencrypt_in_worker, passwords, [old_key, new_key], workers
+    )
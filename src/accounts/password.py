@@ -1,42 +1,77 @@
 from typing import Dict
 
-from ..encryption.master_password import verify_master_password
+from ..constants.numbers import LEGACY_PASSWORD_VERSION, PASSWORD_VERSION
+from ..encryption.vault_key import VaultKey, unlock
 from ..encryption.encrypt_password import encrypt_password, decrypt_password
 from ..utils.aes_utils import create_salt
 
 
 class Password:
-    def __init__(self, encrypted_password: bytes, salt: str, nonce: bytes):
+    def __init__(
+        self,
+        encrypted_password: bytes,
+        salt: str,
+        nonce: bytes,
+        version: int = LEGACY_PASSWORD_VERSION,
+    ):
         self.encrypted_password = encrypted_password
         self.salt = salt
         self.nonce = nonce
+        self.version = version
 
-    def decrypt(self, master_password: str) -> str:
+    def decrypt(self, master_password: str | VaultKey) -> str:
         """
         Decrypts the associated password using the master password
 
-        :param str master_password: master password to use to decrypt Password.
+        :param str | VaultKey master_password: master password or unlocked vault key to use to decrypt Password.
         Should be the same password used to encrypt Password
         :return: the decrypted password
         :rtype: str
         :raises ValueError: if master password is incorrect
         """
         return decrypt_password(
-            master_password, self.salt, self.nonce, self.encrypted_password
+            master_password,
+            self.salt,
+            self.nonce,
+            self.encrypted_password,
+            self.version,
         )
 
-    def to_json_serializable(self) -> Dict[str, str]:
+    def is_legacy(self) -> bool:
+        """
+        :return: True iff the password was encrypted with an older version of the vault format
+        :rtype: bool
+        """
+        return self.version < PASSWORD_VERSION
+
+    def upgrade(self, master_password: str | VaultKey) -> "Password":
+        """
+        Re-encrypts the password with the current version of the vault format
+
+        :param str | VaultKey master_password: master password or unlocked vault key used to encrypt the password
+        :return: the upgraded password, or self if it already uses the current version
+        :rtype: Password
+        :raises ValueError: if master password is incorrect
+        """
+        if not self.is_legacy():
+            return self
+
+        key = unlock(master_password)
+        return Password.from_plaintext(self.decrypt(key), key)
+
+    def to_json_serializable(self) -> Dict[str, str | int]:
         """
         Converts Password object into a json serializable form
 
         :return: serializable dictionary representation of Password
             `encrypted_password` and `nonce` are stored as hex representations
-        :rtype: Dict[str, str]
+        :rtype: Dict[str, str | int]
         """
         return {
             "encrypted_password": self.encrypted_password.hex(),
             "salt": self.salt,
             "nonce": self.nonce.hex(),
+            "version": self.version,
         }
 
     def __str__(self):
@@ -44,7 +79,8 @@ class Password:
 
         s += f"encrypted_password: {self.encrypted_password.hex()}\n"
         s += f"salt: {self.salt}\n"
-        s += f"nonce: {self.nonce.hex()}"
+        s += f"nonce: {self.nonce.hex()}\n"
+        s += f"version: {self.version}"
 
         return s
 
@@ -52,6 +88,7 @@ class Password:
     def from_json_serilizable(d: Dict[str, str]):
         """
         Converts from a json serializable form of password into a Password object
+        Passwords saved without a version are legacy passwords
 
         :return: Password object representation of the serializable dictionary
         :rtype: Password | None
@@ -60,28 +97,28 @@ class Password:
             encrypted_password = bytes.fromhex(d["encrypted_password"])
             salt = d["salt"]
             nonce = bytes.fromhex(d["nonce"])
+            version = int(d.get("version", LEGACY_PASSWORD_VERSION))
 
-            return Password(encrypted_password, salt, nonce)
+            return Password(encrypted_password, salt, nonce, version)
         except KeyError:
             return None
 
     @staticmethod
-    def from_plaintext(plaintext_password: str, master_password: str):
+    def from_plaintext(plaintext_password: str, master_password: str | VaultKey):
         """
         Creates a Password Object from encrypting plaintext_password with the master password
 
         :param str plaintext_password: plaintext password to encrypt
-        :param str master_password: master password used to encrypt all passwords.
+        :param str | VaultKey master_password: master password used to encrypt all passwords, or the unlocked vault key.
         Should be the same as the password encoded in master.txt
         :return: password object with the encrypted password, salt and nonce
         :rtype: Password
         :raises ValueError: if master_password does not match the master password saved in master.txt
         :raises FileNotFoundError: if `master.txt` is not found
         """
-        if not verify_master_password(master_password):
-            raise ValueError("Master Password is Incorrect")
+        key = unlock(master_password)
 
         salt = create_salt(32)
-        encrypted, nonce = encrypt_password(master_password, salt, plaintext_password)
+        encrypted, nonce = encrypt_password(key, salt, plaintext_password)
 
-        return Password(encrypted, salt, nonce)
+        return Password(encrypted, salt, nonce, PASSWORD_VERSION)
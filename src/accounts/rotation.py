@@ -0,0 +1,186 @@
+import io
+import os
+import shutil
+
+import click
+from typing import Callable, List, Optional
+
+from .file_manager import load_accounts_from_file, write_accounts_to_file
+from .journal import journal_path
+from .parallel import reencrypt_passwords
+from ..config import vault_path
+from ..constants.paths import MASTER_BACKUP_PATH, MASTER_PATH, ROTATION_LOCK_PATH
+from ..encryption.master_password import write_master_password
+from ..encryption.vault_key import VaultKey, unlock
+from ..utils.file_utils import atomic_write, file_lock
+
+
+def _backup_path(path: str) -> str:
+    return f"{path}.bak"
+
+
+def _vault_files(path: str) -> List[str]:
+    """
+    :return: the files of the vault given by path: the vault and its journal
+    :rtype: List[str]
+    """
+    return [path, journal_path(path)]
+
+
+def _copy(source: str, destination: str) -> None:
+    with open(source, "rb") as source_file, atomic_write(
+        destination, "wb"
+    ) as destination_file:
+        shutil.copyfileobj(source_file, destination_file)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _back_up(path: str) -> None:
+    """
+    Copies the vault given by path and master.txt next to them. master.txt is copied last,
+    so its copy only exists once the vault was completely copied
+    """
+    for file in _vault_files(path):
+        if os.path.exists(file):
+            _copy(file, _backup_path(file))
+
+    _copy(MASTER_PATH, MASTER_BACKUP_PATH)
+
+
+def _remove_backup(path: str) -> None:
+    """
+    Removes the copies made by `_back_up`, the copy of master.txt first, so the copies of the vault aren't restored
+    without it
+    """
+    _remove(MASTER_BACKUP_PATH)
+
+    for file in _vault_files(path):
+        _remove(_backup_path(file))
+
+
+def restore_backup(path: str) -> bool:
+    """
+    Puts back the vault given by path and master.txt from before a rotation which was interrupted,
+    e.g. by a crash after master.txt was replaced but before the vault was.
+    Only call this while holding the rotation lock, since the copies of a running rotation must not be restored
+
+    :param str path: Path of the vault which was being rotated
+    :return: True iff an interrupted rotation was undone
+    :rtype: bool
+    """
+    if not os.path.exists(MASTER_BACKUP_PATH):
+        # The vault may have been copied without master.txt, before anything was replaced
+        _remove_backup(path)
+        return False
+
+    for file in _vault_files(path):
+        if os.path.exists(_backup_path(file)):
+            os.replace(_backup_path(file), file)
+        else:
+            _remove(file)
+
+    os.replace(MASTER_BACKUP_PATH, MASTER_PATH)
+    return True
+
+
+def recover_interrupted_rotation() -> bool:
+    """
+    Undoes a rotation of the master password of the configured vault which crashed, with `restore_backup`.
+    Called before master.txt or the vault are read. Nothing is restored while a rotation is running,
+    which holds the rotation lock until it removed its copies
+
+    :return: True iff an interrupted rotation was undone
+    :rtype: bool
+    """
+    if not os.path.exists(MASTER_BACKUP_PATH):
+        return False
+
+    with file_lock(ROTATION_LOCK_PATH, blocking=False) as locked:
+        if not locked or not restore_backup(vault_path()):
+            return False
+
+    click.echo(
+        "Restored the vault and master password from before an interrupted master password rotation",
+        err=True,
+    )
+    return True
+
+
+def rotate_master_password(
+    path: str,
+    old_master_password: str,
+    new_master_password: str,
+    workers: int = 1,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Replaces the master password, and re-encrypts every password in the vault given by path with it
+    Every password is re-encrypted before any file is replaced. Until both master.txt and the vault were replaced,
+    copies of them are kept, which are put back if the rotation fails, or by `recover_interrupted_rotation` after a crash.
+    The rotation lock is held throughout, so only one rotation runs at a time and its copies aren't restored under it
+
+    :param str path: Path of the vault to re-encrypt
+    :param str old_master_password: current master password
+    :param str new_master_password: master password to replace it with
+    :param int workers: number of processes used to re-encrypt passwords
+    :param on_progress: called with the number of re-encrypted accounts and the total number of accounts
+    :return: number of re-encrypted passwords
+    :rtype: int
+    :raises ValueError: if old_master_password is incorrect
+    :raises FileNotFoundError: if `master.txt` is not found
+    """
+    with file_lock(ROTATION_LOCK_PATH):
+        # Copies left by a rotation which crashed are put back before they're replaced with new ones
+        restore_backup(path)
+        return _rotate(
+            path, old_master_password, new_master_password, workers, on_progress
+        )
+
+
+def _rotate(
+    path: str,
+    old_master_password: str,
+    new_master_password: str,
+    workers: int,
+    on_progress: Optional[Callable[[int, int], None]],
+) -> int:
+    old_key = unlock(old_master_password)
+    accounts = load_accounts_from_file(path)
+    rotated = 0
+
+    master = io.StringIO()
+    new_key = VaultKey(
+        new_master_password, write_master_password(master, new_master_password)
+    )
+
+    passwords = reencrypt_passwords(
+        [account.password for account in accounts], old_key, new_key, workers
+    )
+
+    for done, (account, password) in enumerate(zip(accounts, passwords), 1):
+        account.password = password
+        rotated += password is not None
+
+        if on_progress is not None:
+            on_progress(done, len(accounts))
+
+    _back_up(path)
+
+    try:
+        with atomic_write(MASTER_PATH) as master_file:
+            master_file.write(master.getvalue())
+
+        # Also removes the journal, which holds passwords encrypted with the old master password
+        write_accounts_to_file(path, accounts)
+    except BaseException:
+        restore_backup(path)
+        raise
+
+    _remove_backup(path)
+    return rotated
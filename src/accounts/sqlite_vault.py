@@ -0,0 +1,208 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .account import Account
+from .password import Password
+from ..profiling import span
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    id TEXT PRIMARY KEY,
+    username TEXT,
+    service TEXT,
+    url TEXT,
+    encrypted_password BLOB,
+    salt TEXT,
+    nonce BLOB,
+    password_version INTEGER
+);
+CREATE INDEX IF NOT EXISTS accounts_username ON accounts (username COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS accounts_service ON accounts (service COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS accounts_url ON accounts (url COLLATE NOCASE);
+"""
+
+_COLUMNS = (
+    "id, username, service, url, encrypted_password, salt, nonce, password_version"
+)
+
+
+def is_sqlite_path(path: str) -> bool:
+    """
+    :return: True iff path is the path of a SQLite vault
+    :rtype: bool
+    """
+    return path.endswith(SQLITE_EXTENSIONS)
+
+
+@contextmanager
+def connect(path: str) -> Iterator[sqlite3.Connection]:
+    """
+    Opens the SQLite vault given by path, creating it if it doesn't exist
+    Everything done with the connection is committed as one transaction when the block exits
+    """
+    with closing(sqlite3.connect(path)) as connection:
+        connection.executescript(_SCHEMA)
+
+        with connection:
+            yield connection
+
+
+def _to_row(account: Account) -> Tuple:
+    password = account.password
+
+    if password is None:
+        return (account.id, account.username, account.service, account.url) + (
+            None,
+        ) * 4
+
+    return (
+        account.id,
+        account.username,
+        account.service,
+        account.url,
+        password.encrypted_password,
+        password.salt,
+        password.nonce,
+        password.version,
+    )
+
+
+def _from_row(row: Tuple) -> Account:
+    id, username, service, url, encrypted_password, salt, nonce, version = row
+
+    password = (
+        None
+        if encrypted_password is None
+        else Password(encrypted_password, salt, nonce, version)
+    )
+
+    return Account(password, username, service, url, id)
+
+
+def iter_accounts(path: str) -> Iterator[Account]:
+    """
+    Reads the accounts in the SQLite vault given by path one at a time
+
+    :return: every account in the vault, in the order they were added
+    :rtype: Iterator[Account]
+    """
+    with connect(path) as connection:
+        rows = connection.execute(f"SELECT {_COLUMNS} FROM accounts ORDER BY rowid")
+        for row in rows:
+            yield _from_row(row)
+
+
+def load_accounts(path: str) -> List[Account]:
+    """
+    :return: every account in the SQLite vault given by path, in the order they were added
+    :rtype: List[Account]
+    """
+    return list(iter_accounts(path))
+
+
+def get_account(path: str, id: str) -> Optional[Account]:
+    """
+    :return: the account with id `id`, or None if there isn't one
+    :rtype: Optional[Account]
+    """
+    with span("read"), connect(path) as connection:
+        row = connection.execute(
+            f"SELECT {_COLUMNS} FROM accounts WHERE id = ?", (id,)
+        ).fetchone()
+
+    return None if row is None else _from_row(row)
+
+
+def insert_accounts(path: str, accounts: List[Account]) -> None:
+    """
+    Adds accounts to the SQLite vault given by path. Accounts with the id of an existing account replace it
+    """
+    with connect(path) as connection:
+        connection.executemany(
+            f"INSERT OR REPLACE INTO accounts ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [_to_row(account) for account in accounts],
+        )
+
+
+def _update(
+    connection: sqlite3.Connection, id: str, field: str, new_value: str | Password
+) -> bool:
+    if isinstance(new_value, Password):
+        cursor = connection.execute(
+            "UPDATE accounts SET encrypted_password = ?, salt = ?, nonce = ?, password_version = ? WHERE id = ?",
+            (
+                new_value.encrypted_password,
+                new_value.salt,
+                new_value.nonce,
+                new_value.version,
+                id,
+            ),
+        )
+    else:
+        column = {"username": "username", "service": "service", "url": "url"}[field]
+        cursor = connection.execute(
+            f"UPDATE accounts SET {column} = ? WHERE id = ?",
+            (None if new_value == "" else new_value, id),
+        )
+
+    return cursor.rowcount > 0
+
+
+def write_accounts(path: str, accounts: List[Account]) -> None:
+    """
+    Replaces every account in the SQLite vault given by path. The new vault is built in a temporary file,
+    which is atomically swapped in once it is complete
+    """
+    # A unique name, so concurrent writers don't build their vaults in the same file
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp",
+    )
+    os.close(fd)
+
+    try:
+        with span("write"):
+            insert_accounts(temp_path, accounts)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def vacuum(path: str) -> None:
+    """
+    Rebuilds the SQLite vault given by path to reclaim the space of deleted accounts
+    """
+    with closing(sqlite3.connect(path)) as connection:
+        connection.execute("VACUUM")
+
+
+def apply_records(path: str, records: List[Dict[str, Any]]) -> None:
+    """
+    Applies journal records (see `journal.create_record`) to the SQLite vault given by path, as one transaction
+    """
+    with span("write"), connect(path) as connection:
+        for record in records:
+            match record["op"]:
+                case "create":
+                    account = Account.from_dict(record["account"])
+                    connection.execute(
+                        f"INSERT OR REPLACE INTO accounts ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        _to_row(account),
+                    )
+                case "edit":
+                    value = record["value"]
+                    if record["field"] == "password":
+                        value = Password.from_json_serilizable(value)
+                    _update(connection, record["id"], record["field"], value)
+                case "delete":
+                    connection.execute(
+                        "DELETE FROM accounts WHERE id = ?", (record["id"],)
+                    )
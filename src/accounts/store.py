@@ -0,0 +1,274 @@
+from typing import Dict, Iterator, List, Optional
+
+from .account import Account, Password, field_strs
+from .backends import Backend, open_backend
+from .journal import apply_records, create_record, delete_record, edit_record
+
+
+def _normalize(value: Optional[str]) -> Optional[str]:
+    """
+    Normalizes a service or username so lookups ignore case and surrounding whitespace
+    """
+    return None if value is None else value.strip().casefold()
+
+
+class AccountStore:
+    """
+    Owns the accounts of a vault. Accounts are indexed by id, and by normalized service and username
+    Accounts are only loaded once they are needed. Backends that can read a single account (e.g. SQLite)
+    are used for `get`, `update` and `delete` without loading the whole vault, and lookups by service or username
+    stream the vault until something changes
+    Changes are kept in memory, and only written to the vault by `save`
+    """
+
+    def __init__(self, path: str, backend: Optional[Backend] = None):
+        self.path = path
+        self.backend = open_backend(path) if backend is None else backend
+
+        self._loaded = False
+        # Accounts read with a point lookup before the vault was loaded. None if the account doesn't exist
+        self._partial: Dict[str, Optional[Account]] = {}
+
+        self._by_id: Dict[str, Account] = {}
+        self._by_service: Dict[str, Dict[str, Account]] = {}
+        self._by_username: Dict[str, Dict[str, Account]] = {}
+
+        self._changes: List[Dict] = []
+        self._rewrite = False
+
+    @staticmethod
+    def load(path: str) -> "AccountStore":
+        """
+        :return: a store with every account of the vault given by path loaded
+        :rtype: AccountStore
+        """
+        store = AccountStore(path)
+        store._load()
+        return store
+
+    @property
+    def dirty(self) -> bool:
+        """
+        True iff the store has changes which haven't been saved
+        """
+        return self._rewrite or len(self._changes) > 0
+
+    def _index(self, account: Account) -> None:
+        self._by_id[account.id] = account
+
+        for index, value in (
+            (self._by_service, account.service),
+            (self._by_username, account.username),
+        ):
+            key = _normalize(value)
+            if key is not None:
+                index.setdefault(key, {})[account.id] = account
+
+    def _unindex(self, account: Account) -> None:
+        self._by_id.pop(account.id, None)
+
+        for index, value in (
+            (self._by_service, account.service),
+            (self._by_username, account.username),
+        ):
+            key = _normalize(value)
+            if key is not None and key in index:
+                index[key].pop(account.id, None)
+                if len(index[key]) == 0:
+                    del index[key]
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+
+        accounts = self.backend.load_all()
+        # Changes made before loading still have to be applied on top of the vault
+        accounts = apply_records(accounts, self._changes)
+
+        for account in accounts:
+            self._index(account)
+
+        self._partial.clear()
+        self._loaded = True
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Account]:
+        self._load()
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, id: str) -> bool:
+        return self.get(id) is not None
+
+    def accounts(self) -> List[Account]:
+        """
+        :return: every account, in the order they were added
+        :rtype: List[Account]
+        """
+        return list(self)
+
+    def get(self, id: str) -> Optional[Account]:
+        """
+        :return: the account with id `id`, or None if there isn't one
+        :rtype: Optional[Account]
+        """
+        if self._loaded:
+            return self._by_id.get(id)
+
+        if id in self._partial:
+            return self._partial[id]
+
+        if self.backend.supports_point_lookup:
+            account = self.backend.load_one(id)
+            self._partial[id] = account
+            return account
+
+        self._load()
+        return self._by_id.get(id)
+
+    def _scan(self, field: str, value: str) -> List[Account]:
+        """
+        Finds the accounts whose `field` is `value` by streaming the vault, without loading or indexing it.
+        Only used while nothing was changed, since changes are applied to the loaded vault
+        Accounts which were already read are returned as they are in the store
+        """
+        key = _normalize(value) or ""
+        found = []
+
+        for account in self.backend.iter_all():
+            if _normalize(account.get_value(field)) == key:
+                found.append(self._partial.setdefault(account.id, account))
+
+        return found
+
+    def find_by_service(self, service: str) -> List[Account]:
+        """
+        :return: every account with the service `service`, ignoring case and surrounding whitespace
+        :rtype: List[Account]
+        """
+        if not self._loaded and len(self._changes) == 0:
+            return self._scan("service", service)
+
+        self._load()
+        return list(self._by_service.get(_normalize(service) or "", {}).values())
+
+    def find_by_username(self, username: str) -> List[Account]:
+        """
+        :return: every account with the username `username`, ignoring case and surrounding whitespace
+        :rtype: List[Account]
+        """
+        if not self._loaded and len(self._changes) == 0:
+            return self._scan("username", username)
+
+        self._load()
+        return list(self._by_username.get(_normalize(username) or "", {}).values())
+
+    def add(self, account: Account) -> None:
+        """
+        Adds an account. An account with the same id is replaced
+        """
+        if self._loaded:
+            existing = self._by_id.get(account.id)
+            if existing is not None:
+                self._unindex(existing)
+            self._index(account)
+        else:
+            self._partial[account.id] = account
+
+        self._changes.append(create_record(account))
+
+    def update(self, id: str, field: str, new_value: str | Password) -> Account:
+        """
+        Sets a field of the account with id `id`
+
+        :return: the updated account
+        :rtype: Account
+        :raises KeyError: if there is no account with id `id`
+        :raises ValueError: if field is not a valid account field
+        :raises TypeError: if new_value is a Password and field is not "password", or the other way around
+        """
+        if field not in field_strs or field == "id":
+            raise ValueError
+        if (field == "password") != isinstance(new_value, Password):
+            raise TypeError
+
+        account = self.get(id)
+        if account is None:
+            raise KeyError(id)
+
+        if self._loaded:
+            self._unindex(account)
+            account.set_value(field, new_value)
+            self._index(account)
+        else:
+            account.set_value(field, new_value)
+
+        self._changes.append(edit_record(id, field, new_value))
+        return account
+
+    def delete(self, id: str) -> Account:
+        """
+        Deletes the account with id `id`
+
+        :return: the deleted account
+        :rtype: Account
+        :raises KeyError: if there is no account with id `id`
+        """
+        account = self.get(id)
+        if account is None:
+            raise KeyError(id)
+
+        if self._loaded:
+            self._unindex(account)
+        else:
+            self._partial[id] = None
+
+        self._changes.append(delete_record(id))
+        return account
+
+    def replace_all(self, accounts: List[Account]) -> None:
+        """
+        Replaces every account. Saving the store will rewrite the whole vault
+        """
+        self._by_id.clear()
+        self._by_service.clear()
+        self._by_username.clear()
+        self._partial.clear()
+
+        for account in accounts:
+            self._index(account)
+
+        self._loaded = True
+        self._changes.clear()
+        self._rewrite = True
+
+    def save(self) -> bool:
+        """
+        Writes the changes to the vault, if there are any
+
+        :return: True iff anything was written
+        :rtype: bool
+        """
+        if not self.dirty:
+            return False
+
+        if self._rewrite:
+            self.backend.write_all(list(self._by_id.values()))
+        else:
+            self.backend.apply(self._changes)
+
+        self._changes = []
+        self._rewrite = False
+        return True
+
+    def compact(self) -> int:
+        """
+        Saves the store, then compacts the vault (see the `compact` method of the backend)
+
+        :return: number of accounts in the vault
+        :rtype: int
+        """
+        self.save()
+        return self.backend.compact()
@@ -0,0 +1,131 @@
+import json
+import os
+import struct
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from ..accounts.password import Password
+from ..constants import paths as PATHS
+from ..constants.numbers import AGENT_CLIENT_TIMEOUT
+from ..constants.strings import AGENT_LOCKED_ERROR
+
+if TYPE_CHECKING:
+    import socket
+
+
+def _owned_by_user(connection: "socket.socket", socket_path: str) -> bool:
+    """
+    :return: True iff the process listening on the connected agent socket runs as the current user,
+        from the credentials of the connection where the platform gives them, or else the owner of the socket file
+    :rtype: bool
+    """
+    import socket
+
+    if hasattr(socket, "SO_PEERCRED"):
+        credentials = connection.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+        )
+        _, uid, _ = struct.unpack("3i", credentials)
+        return uid == os.getuid()
+
+    return os.stat(socket_path).st_uid == os.getuid()
+
+
+def agent_request(
+    request: Dict[str, Any], socket_path: str = PATHS.AGENT_SOCKET_PATH
+) -> Optional[Dict[str, Any]]:
+    """
+    Sends a request to the unlock agent. Requests hold passwords, so they're only sent to an agent
+    run by the current user
+
+    :param Dict request: request with an `op` and the arguments of the op
+    :param str socket_path: path of the agent's Unix socket
+    :return: the agent's response, or None if no agent of the current user is running
+    :rtype: Optional[Dict]
+    """
+    import socket  # Only imported once a command talks to the agent
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(AGENT_CLIENT_TIMEOUT)
+            connection.connect(socket_path)
+            if not _owned_by_user(connection, socket_path):
+                return None
+
+            with connection.makefile("rwb") as stream:
+                stream.write(json.dumps(request).encode("utf-8") + b"\n")
+                stream.flush()
+                line = stream.readline()
+    except OSError:
+        return None
+
+    if not line:
+        return None
+
+    response = json.loads(line)
+
+    # A locked agent behaves as if it wasn't running
+    if not response.get("ok") and response.get("error") == AGENT_LOCKED_ERROR:
+        return None
+
+    return response
+
+
+def _result(response: Optional[Dict[str, Any]], key: str) -> Optional[Any]:
+    """
+    :raises ValueError: if the agent could not handle the request
+    """
+    if response is None:
+        return None
+    if not response.get("ok"):
+        raise ValueError(response.get("error"))
+
+    return response[key]
+
+
+def is_agent_running() -> bool:
+    """
+    :return: True iff an unlocked agent is answering on the agent socket
+    :rtype: bool
+    """
+    return agent_request({"op": "ping"}) is not None
+
+
+def stop_agent() -> bool:
+    """
+    Asks the agent to lock and exit
+
+    :return: True iff an agent was running
+    :rtype: bool
+    """
+    return agent_request({"op": "stop"}) is not None
+
+
+def agent_encrypt(plaintext_password: str) -> Optional[Password]:
+    """
+    Encrypts a password with the agent's vault key
+
+    :param str plaintext_password: password to encrypt
+    :return: the encrypted password, or None if no agent is running
+    :rtype: Optional[Password]
+    :raises ValueError: if the agent could not encrypt the password
+    """
+    serialized = _result(
+        agent_request({"op": "encrypt", "plaintext": plaintext_password}), "password"
+    )
+
+    return None if serialized is None else Password.from_json_serilizable(serialized)
+
+
+def agent_get_password(id: str) -> Optional[str]:
+    """
+    Looks up and decrypts the password of an account through the agent
+
+    :param str id: id of the account
+    :return: the decrypted password, or None if no agent is running
+    :rtype: Optional[str]
+    :raises ValueError: if account with id `id` not found or has no password
+    """
+    return _result(agent_request({"op": "lookup", "id": id}), "password")
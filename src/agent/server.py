@@ -0,0 +1,152 @@
+import json
+import os
+import socket
+import time
+from typing import Any, Dict
+
+from ..accounts.file_manager import get_password_from_account
+from ..accounts.password import Password
+from ..config import vault_path
+from ..constants.numbers import AGENT_CLIENT_TIMEOUT
+from ..constants.strings import AGENT_LOCKED_ERROR
+from ..encryption.vault_key import VaultKey, unlock
+
+
+class Agent:
+    """
+    Keeps the unlocked vault key in memory and serves encrypt and lookup requests over a Unix socket
+    Requests and responses are json objects, one per line
+    """
+
+    def __init__(
+        self,
+        key: VaultKey,
+        socket_path: str,
+        idle_timeout: float,
+        client_timeout: float = AGENT_CLIENT_TIMEOUT,
+    ):
+        self.key = key
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        # Clients are served one at a time, so one which stops sending can't keep the others waiting
+        self.client_timeout = client_timeout
+        self.running = False
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handles a single request from a client
+
+        :param Dict request: request with an `op` and the arguments of the op
+        :return: response with `ok` set, and either the result or an `error`
+        :rtype: Dict
+        """
+        op = request.get("op")
+
+        if op == "ping":
+            return {"ok": True}
+        if op == "stop":
+            self.running = False
+            return {"ok": True}
+
+        # The master password changed since the agent was unlocked
+        if not self.key.is_current():
+            self.running = False
+            return {"ok": False, "error": AGENT_LOCKED_ERROR}
+
+        try:
+            match op:
+                case "encrypt":
+                    password = Password.from_plaintext(request["plaintext"], self.key)
+                    return {"ok": True, "password": password.to_json_serializable()}
+                case "lookup":
+                    return {"ok": True, "password": self._lookup(request["id"])}
+                case _:
+                    return {"ok": False, "error": f"Unknown op: {op}"}
+        except (KeyError, ValueError) as e:
+            return {"ok": False, "error": str(e)}
+
+    def _lookup(self, id: str) -> str:
+        """
+        Decrypts the password of the account with id `id`
+
+        :raises ValueError: if account with id `id` not found
+        :raises ValueError: if account has no associated password
+        """
+        return get_password_from_account(vault_path(), id, self.key)
+
+    def _handle_connection(self, connection: socket.socket) -> None:
+        with connection, connection.makefile("rwb") as stream:
+            for line in stream:
+                try:
+                    response = self.handle_request(json.loads(line))
+                except json.JSONDecodeError:
+                    response = {"ok": False, "error": "Invalid request"}
+
+                stream.write(json.dumps(response).encode("utf-8") + b"\n")
+                stream.flush()
+
+    def serve(self) -> None:
+        """
+        Serves requests until the agent is stopped or no request arrives for `idle_timeout` seconds
+        The socket is only accessible by the current user
+
+        :raises FileExistsError: if another agent is listening on the socket
+        """
+        if os.path.exists(self.socket_path):
+            # The socket of an agent which is still running isn't taken over, so it can still be stopped
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                if probe.connect_ex(self.socket_path) == 0:
+                    raise FileExistsError(
+                        f"An agent is already listening on {self.socket_path}"
+                    )
+            # Left behind by an agent which didn't exit cleanly
+            os.remove(self.socket_path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+
+        self.running = True
+        last_request = time.monotonic()
+
+        try:
+            server.listen()
+
+            while self.running:
+                remaining = self.idle_timeout - (time.monotonic() - last_request)
+                if remaining <= 0:
+                    break
+
+                server.settimeout(remaining)
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    break
+
+                connection.settimeout(self.client_timeout)
+                try:
+                    self._handle_connection(connection)
+                except OSError:
+                    pass  # The client timed out or disconnected
+                last_request = time.monotonic()
+        finally:
+            server.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def run_agent(master_password: str, socket_path: str, idle_timeout: float) -> None:
+    """
+    Unlocks the vault and serves requests until the agent is stopped or idles for too long
+
+    :param str master_password: master password used to encrypt all passwords
+    :param str socket_path: path of the Unix socket to listen on
+    :param float idle_timeout: seconds to wait for a request before locking
+    :raises ValueError: if master_password is incorrect
+    :raises FileNotFoundError: if `master.txt` is not found
+    :raises FileExistsError: if another agent is listening on socket_path
+    """
+    Agent(unlock(master_password), socket_path, idle_timeout).serve()
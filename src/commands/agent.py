@@ -0,0 +1,114 @@
+import click
+import os
+from typing import Optional
+
+from .consoles import console, err_console
+from ..agent.client import is_agent_running, stop_agent
+from ..agent.server import run_agent
+from ..constants import paths as PATHS
+from ..constants import strings as STRINGS
+from ..constants.numbers import AGENT_IDLE_TIMEOUT
+from ..encryption.vault_key import unlock
+
+
+def _detach() -> Optional[int]:
+    """
+    Forks twice, so the agent runs in a new session without a controlling terminal, and isn't a child of the caller
+    The agent's stdin, stdout and stderr are redirected to /dev/null, so a caller reading the output of the command
+    (e.g. `out=$(password-inator agent -d)`) doesn't wait until the agent exits
+
+    :return: the pid of the agent in the calling process, or None in the agent
+    :rtype: Optional[int]
+    """
+    read_fd, write_fd = os.pipe()
+
+    pid = os.fork()
+    if pid != 0:
+        os.close(write_fd)
+        with os.fdopen(read_fd, "r") as pipe:
+            agent_pid = int(pipe.read())
+        os.waitpid(pid, 0)
+        return agent_pid
+
+    os.close(read_fd)
+    os.setsid()
+
+    agent_pid = os.fork()
+    if agent_pid != 0:
+        os.write(write_fd, str(agent_pid).encode("utf-8"))
+        os._exit(0)
+
+    os.close(write_fd)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in range(3):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+
+    return None
+
+
+@click.command(name="agent")
+@click.option(
+    "-p",
+    "--master-password",
+    type=str,
+    help="Master password used to encrypt all passwords",
+)
+@click.option(
+    "--idle-timeout",
+    type=click.FloatRange(min=0),
+    default=AGENT_IDLE_TIMEOUT,
+    show_default=True,
+    help="Seconds without requests before the agent locks itself",
+)
+@click.option("-d", "--detach", help="Run the agent in the background", is_flag=True)
+@click.option("--stop", help="Stop the running agent", is_flag=True)
+def agent_command(
+    master_password: Optional[str], idle_timeout: float, detach: bool, stop: bool
+):
+    """
+    Keep the vault unlocked, so other commands don't need the master password
+    """
+    if stop:
+        if stop_agent():
+            console.print("[green]🔒 Agent stopped[/]")
+        else:
+            err_console.print("[red]No agent is running[/]")
+        return
+
+    if not hasattr(os, "fork") and detach:
+        err_console.print("[red]--detach is not supported on this platform[/]")
+        return
+
+    if is_agent_running():
+        err_console.print(f"{STRINGS.ERROR} {STRINGS.AGENT_RUNNING_ERROR}")
+        return
+
+    if master_password is None:
+        master_password = click.prompt("Master Password", type=str, hide_input=True)
+
+    try:
+        # Verify before detaching, so errors are still shown
+        unlock(master_password)
+    except ValueError:
+        err_console.print(STRINGS.MASTER_PASSWORD_ERROR)
+        return
+    except FileNotFoundError:
+        err_console.print(STRINGS.MASTER_PASSWORD_NOT_FOUND_ERROR)
+        return
+
+    if detach:
+        pid = _detach()
+        if pid is not None:
+            console.print(f"[green]🔓 Agent started[/] (pid {pid})")
+            return
+    else:
+        console.print("[green]🔓 Agent started[/] (Ctrl+C to stop)")
+
+    try:
+        run_agent(master_password, PATHS.AGENT_SOCKET_PATH, idle_timeout)
+    except KeyboardInterrupt:
+        pass
+    except FileExistsError:
+        # Another agent started since it was checked
+        err_console.print(f"{STRINGS.ERROR} {STRINGS.AGENT_RUNNING_ERROR}")
@@ -0,0 +1,14 @@
+import click
+
+from .consoles import console
+from ..accounts.file_manager import compact_accounts_file
+from ..config import vault_path
+
+
+@click.command(name="compact")
+def compact_command():
+    """
+    Apply the journal of account changes to the accounts file
+    """
+    count = compact_accounts_file(vault_path())
+    console.print(f"[green]🗜️ Compacted {count} account(s)[/]")
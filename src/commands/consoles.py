@@ -0,0 +1,17 @@
+from rich.console import Console
+
+from ..profiling import span
+
+
+class _Console(Console):
+    """
+    Console which records the time spent printing to it as rendering, when profiling
+    """
+
+    def print(self, *args, **kwargs):
+        with span("render"):
+            super().print(*args, **kwargs)
+
+
+console = _Console()
+err_console = _Console(stderr=True)
@@ -0,0 +1,118 @@
+import click
+from typing import Optional
+
+from .consoles import console, err_console
+from ..accounts.account import Account
+from ..accounts.file_manager import save_account_to_file
+from ..agent.client import agent_encrypt
+from ..config import vault_path
+from ..constants import strings as STRINGS
+from ..io.prompting import confirm
+from ..utils.password_utils import generate_password
+
+
+@click.command()
+@click.option(
+    # prompting is handled later
+    "--password",
+    help="Password for the account",
+    type=str,
+)
+@click.option(
+    # prompting is handled later
+    "--master-password",
+    help="Master password used to encrypt passwords",
+    type=str,
+)
+@click.option(
+    "--username",
+    prompt=True,
+    default=STRINGS.SKIP_STRING,
+    show_default=False,
+    help="Username for the account",
+    type=str,
+)
+@click.option(
+    "--service",
+    prompt=True,
+    default=STRINGS.SKIP_STRING,
+    show_default=False,
+    help="Service for the account",
+    type=str,
+)
+@click.option(
+    "--url",
+    prompt=True,
+    default=STRINGS.SKIP_STRING,
+    show_default=False,
+    help="URL for the account",
+    type=str,
+)
+@click.option("-c", "--clipboard", help="Copy password to clipboard", is_flag=True)
+@click.option("-s", "--save", help="Save account", is_flag=True)
+@click.option(
+    "-r",
+    "--random-password",
+    help="Generate a random password for the account",
+    is_flag=True,
+)
+def create_account(
+    clipboard: bool,
+    save: bool,
+    random_password: bool,
+    password: Optional[str] = None,
+    master_password: Optional[str] = None,
+    username: Optional[str] = None,
+    service: Optional[str] = None,
+    url: Optional[str] = None,
+):
+    """
+    Create an account with the given parameters
+    """
+    if random_password:
+        password = generate_password()
+    elif password is None:
+        password = input("Password [Press Enter for a Random Password]: ")
+
+        if password == "":
+            password = generate_password()
+        elif not confirm(password, console):
+            return
+
+    if username == STRINGS.SKIP_STRING:
+        username = None
+    if service == STRINGS.SKIP_STRING:
+        service = None
+    if url == STRINGS.SKIP_STRING:
+        url = None
+
+    try:
+        encrypted = agent_encrypt(password) if master_password is None else None
+
+        if encrypted is not None:
+            new_account = Account(encrypted, username, service, url)
+        else:
+            if master_password is None:
+                master_password = input("Master Password: ")
+
+            new_account = Account.from_unencrypted(
+                password, master_password, username, service, url
+            )
+    except ValueError:
+        err_console.print(STRINGS.MASTER_PASSWORD_ERROR)
+        return
+    except FileNotFoundError:
+        err_console.print(STRINGS.MASTER_PASSWORD_NOT_FOUND_ERROR)
+        return
+
+    console.print(new_account.get_table())
+
+    if clipboard:
+        import pyperclip  # Slow to import, and only needed for the clipboard
+
+        pyperclip.copy(password)
+        console.print(STRINGS.COPIED_TO_CLIPBOARD)
+
+    if save or click.confirm("Save account?"):
+        save_account_to_file(vault_path(), new_account)
+        console.print("[green]Account saved![/green]")
@@ -0,0 +1,78 @@
+import click
+import sys
+from typing import Optional
+
+from .consoles import err_console
+from ..accounts.importer import add_accounts, read_account_specs
+from ..accounts.parallel import default_workers, encrypt_passwords
+from ..agent.client import agent_encrypt, is_agent_running
+from ..config import vault_path
+from ..constants import strings as STRINGS
+from ..encryption.vault_key import unlock
+
+
+@click.command(name="create-accounts")
+@click.option(
+    "--from-stdin",
+    is_flag=True,
+    help='Read one json spec per line from stdin, e.g. {"service": "api", "username": "app", "generate": true}',
+)
+@click.option(
+    # Never prompted for, since stdin holds the specs
+    "-p",
+    "--master-password",
+    type=str,
+    help="Master password used to encrypt passwords. Not needed while the agent is running",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=default_workers,
+    show_default="number of cores",
+    help="Number of processes used to encrypt passwords",
+)
+def create_accounts_command(
+    from_stdin: bool, master_password: Optional[str], workers: int
+):
+    """
+    Create many accounts at once, printing the id of each created account
+    """
+    if not from_stdin:
+        raise click.UsageError("Accounts can only be created with --from-stdin")
+
+    try:
+        specs = read_account_specs(sys.stdin)
+    except ValueError as error:
+        err_console.print(f"{STRINGS.ERROR} {error}")
+        sys.exit(1)
+
+    plaintexts = [spec["password"] for spec in specs]
+
+    try:
+        if master_password is not None:
+            key = unlock(master_password)
+            passwords = list(encrypt_passwords(plaintexts, key, workers))
+        elif is_agent_running():
+            passwords = [agent_encrypt(plaintext) for plaintext in plaintexts]
+            # The agent stopped or locked part way through
+            if any(password is None for password in passwords):
+                err_console.print(f"{STRINGS.ERROR} {STRINGS.AGENT_LOCKED_ERROR}")
+                sys.exit(1)
+        else:
+            err_console.print(
+                f"{STRINGS.ERROR} Pass --master-password, or start the agent"
+            )
+            sys.exit(1)
+    except ValueError:
+        err_console.print(STRINGS.MASTER_PASSWORD_ERROR)
+        sys.exit(1)
+    except FileNotFoundError:
+        err_console.print(STRINGS.MASTER_PASSWORD_NOT_FOUND_ERROR)
+        sys.exit(1)
+
+    # Ids are only printed once every account was saved, so each printed id exists
+    for account in add_accounts(vault_path(), specs, passwords):
+        click.echo(account.id)
+
+    err_console.print(f"[green]Created {len(specs)} account(s)[/]")
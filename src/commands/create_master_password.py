@@ -0,0 +1,39 @@
+import click
+import os
+
+from .consoles import console, err_console
+from ..constants import paths as PATHS
+from ..encryption.master_password import save_master_password
+from ..io.prompting import confirm
+
+
+@click.command(name="create-master-password")
+@click.argument("master_password")
+@click.option(
+    "--force", help="Force override the current master password", is_flag=True
+)
+def create_master_password_command(master_password: str, force: bool):
+    """
+    Create and save the master password to encrypt all passwords
+    """
+    # Check if overriding existing master password
+    if os.path.isfile(PATHS.MASTER_PATH) and not force:
+        err_console.print("[red]Master Password already exists![/]")
+        err_console.print(
+            "[red]Running this command will override the existing master password. Previous passwords encrypted with the already existing master password will be unrecoverable[/]"
+        )
+        err_console.print(
+            "[red]If you would like to override the master password use the --force flag[/]"
+        )
+        err_console.print(
+            "[red]To change the master password and keep existing passwords use rotate-master-password[/]"
+        )
+        return
+
+    confirmation = confirm(master_password, console)
+
+    if not confirmation:
+        return
+
+    save_master_password(master_password)
+    console.print("[green]🔐 Master Password Saved![/]")
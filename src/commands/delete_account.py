@@ -0,0 +1,13 @@
+import click
+
+from .consoles import console
+from ..accounts.file_manager import delete_account
+
+
+@click.command(name="delete-account")
+@click.argument("id")
+def delete_account_command(id: str):
+    """
+    Delete an account with a specific id
+    """
+    delete_account(id, console)
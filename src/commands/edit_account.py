@@ -0,0 +1,23 @@
+import click
+from typing import Optional
+
+from .consoles import console, err_console
+from ..accounts.file_manager import edit_account_with_feedback
+
+
+@click.command(name="edit-account")
+@click.argument("id")
+@click.option(
+    "--field",
+    type=click.Choice(["password", "username", "service", "url"]),
+    prompt=True,
+)
+@click.option("--new-value", type=str, default=None, show_default=False)
+def edit_account_command(id: str, field: str, new_value: Optional[str]):
+    """
+    Edit an account with a specific id
+    """
+    if new_value is None:
+        new_value = input("new-value: ")
+
+    edit_account_with_feedback(id, field, new_value, console, err_console)
@@ -0,0 +1,58 @@
+import click
+
+from .consoles import err_console
+from ..accounts.export import EXPORT_FORMATS, export_accounts
+from ..accounts.file_manager import load_accounts_from_file
+from ..accounts.parallel import default_workers
+from ..config import vault_path
+from ..constants import strings as STRINGS
+from ..encryption.vault_key import unlock
+
+
+@click.command(name="export")
+@click.option(
+    "-p",
+    "--master-password",
+    type=str,
+    prompt=True,
+    help="Master password used to encrypt all passwords",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=click.Choice(EXPORT_FORMATS),
+    default="jsonl",
+    show_default=True,
+    help="Format of the exported accounts",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="File to export to. Defaults to stdout",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=default_workers,
+    show_default="number of cores",
+    help="Number of processes used to decrypt passwords",
+)
+def export_command(master_password: str, format: str, output, workers: int):
+    """
+    Export every account with its decrypted password
+    """
+    try:
+        key = unlock(master_password)
+    except ValueError:
+        err_console.print(STRINGS.MASTER_PASSWORD_ERROR)
+        return
+    except FileNotFoundError:
+        err_console.print(STRINGS.MASTER_PASSWORD_NOT_FOUND_ERROR)
+        return
+
+    accounts = load_accounts_from_file(vault_path())
+    exported = export_accounts(accounts, key, output, format, workers)
+    err_console.print(f"[green]📤 Exported {exported} account(s)[/]")
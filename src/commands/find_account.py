@@ -0,0 +1,103 @@
+import asyncio
+import click
+from rich.live import Live
+
+from .consoles import console, err_console
+from ..accounts.account import AccountFields
+from ..accounts.file_manager import (
+    delete_account,
+    edit_account_with_feedback,
+    get_password_from_account_with_feedback,
+    iter_accounts_from_file,
+)
+from ..config import vault_path
+from ..constants import strings as STRINGS
+from ..interactive_search import run_interactive_search
+from ..io.terminal import Terminal_Session
+from ..search import SearchSession
+from ..search_corpus import SEARCH_FIELDS, SearchCorpus
+from ..search_view import SearchView
+
+
+@click.command()
+@click.option(
+    "--search-by",
+    help="Account Field to Search By",
+    default="Username",
+    type=click.Choice(["Username", "Service", "URL", "All"], case_sensitive=False),
+)
+@click.option(
+    "--show-ids",
+    help="Display Account IDs in search table",
+    is_flag=True,
+    default=False,
+)
+def find_account(search_by: str, show_ids: bool):
+    """
+    Find an account
+    """
+    field_mapping = {
+        "Username": AccountFields.USERNAME,
+        "Service": AccountFields.SERVICE,
+        "URL": AccountFields.URL,
+        "All": SEARCH_FIELDS,
+    }
+    field = field_mapping.get(search_by)
+
+    if field is None:
+        err_console.print(f"{STRINGS.ERROR} INVALID FIELD")
+        return
+    else:
+        # Accounts are added to the search as they're read from the vault, so the screen shows up right away
+        search_session = SearchSession(field, SearchCorpus([]))
+        view = SearchView(search_session, console.size.height, show_ids)
+        view.loading = True
+        accounts = iter_accounts_from_file(vault_path())
+
+    # The screen is only redrawn when what it shows changes, so an idle search doesn't use any CPU
+    with (
+        Terminal_Session() as terminal,
+        Live(view.render(), console=console, auto_refresh=False) as live,
+    ):
+        selected_account = asyncio.run(
+            run_interactive_search(view, terminal, live, console, accounts)
+        )
+
+    if selected_account is not None:
+        select_account(selected_account.id)
+
+
+def select_account(id: str):
+    console.print("\nOptions:")
+    console.print("1. Edit")
+    console.print("2. Delete")
+    console.print("3. Get Password")
+    console.print("4. Quit")
+
+    choice = click.prompt(
+        "Enter your choice", type=click.IntRange(min=0, max=3, clamp=True)
+    )
+
+    match choice:
+        case 1:
+            editing = True
+            while editing:
+                field = click.prompt(
+                    "field",
+                    type=click.Choice(["password", "username", "service", "url"]),
+                )
+                new_value = input("new-value: ")
+
+                edit_account_with_feedback(id, field, new_value, console, err_console)
+                editing = click.confirm("Continue Editing?")
+        case 2:
+            delete_account(id, console)
+        case 3:
+            clip = click.confirm("Copy to clipboard?")
+
+            get_password_from_account_with_feedback(
+                id, None, console, err_console, clip
+            )
+        case 4:
+            console.print("Quitting")
+            return
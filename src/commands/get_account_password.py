@@ -0,0 +1,26 @@
+import click
+from typing import Optional
+
+from .consoles import console, err_console
+from ..accounts.file_manager import get_password_from_account_with_feedback
+
+
+@click.command(name="get-account-password")
+@click.argument("id")
+@click.option(
+    # prompting is handled later, unless the agent is running
+    "-p",
+    "--master-password",
+    type=str,
+    help="Master password used to encrypt all passwords",
+)
+@click.option("-c", "--clipboard", help="Copy password to clipboard", is_flag=True)
+def get_account_password_command(
+    id: str, master_password: Optional[str], clipboard: bool
+):
+    """
+    Get the password of an account with the specified id
+    """
+    get_password_from_account_with_feedback(
+        id, master_password, console, err_console, clipboard
+    )
@@ -0,0 +1,102 @@
+import click
+from rich.progress import Progress
+from typing import Optional, Tuple
+
+from .consoles import console, err_console
+from ..accounts.importer import (
+    IMPORT_FIELDS,
+    IMPORT_FORMATS,
+    detect_format,
+    import_accounts,
+    map_columns,
+    read_rows,
+)
+from ..accounts.parallel import default_workers
+from ..config import vault_path
+from ..constants import strings as STRINGS
+from ..encryption.vault_key import unlock
+
+
+@click.command(name="import")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "-p",
+    "--master-password",
+    type=str,
+    prompt=True,
+    help="Master password used to encrypt all passwords",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=click.Choice(IMPORT_FORMATS),
+    help="Format of the export. Defaults to the extension of SOURCE",
+)
+@click.option(
+    "-m",
+    "--map",
+    "columns",
+    multiple=True,
+    metavar="FIELD=COLUMN",
+    help=f"Column of an account field ({', '.join(IMPORT_FIELDS)}), if it isn't found by name. Can be repeated",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=default_workers,
+    show_default="number of cores",
+    help="Number of processes used to encrypt passwords",
+)
+def import_accounts_command(
+    source: str,
+    master_password: str,
+    format: Optional[str],
+    columns: Tuple[str, ...],
+    workers: int,
+):
+    """
+    Import accounts from a csv or json export of another password manager
+    """
+    overrides = {}
+    for column in columns:
+        field, separator, name = column.partition("=")
+        if separator == "":
+            raise click.BadParameter(
+                f"{column} should be FIELD=COLUMN", param_hint="--map"
+            )
+        overrides[field.strip()] = name
+
+    try:
+        key = unlock(master_password)
+    except ValueError:
+        err_console.print(STRINGS.MASTER_PASSWORD_ERROR)
+        return
+    except FileNotFoundError:
+        err_console.print(STRINGS.MASTER_PASSWORD_NOT_FOUND_ERROR)
+        return
+
+    try:
+        # Exports are often saved with a byte order mark, which utf-8-sig skips
+        with open(source, "r", encoding="utf-8-sig", newline="") as file:
+            rows = read_rows(file, format or detect_format(source))
+        mapping = map_columns(rows, overrides)
+    except ValueError as error:
+        err_console.print(f"{STRINGS.ERROR} {error}")
+        return
+
+    with Progress(console=err_console, transient=True) as progress:
+        task = progress.add_task("Encrypting passwords")
+
+        imported = import_accounts(
+            vault_path(),
+            rows,
+            mapping,
+            key,
+            workers,
+            lambda done, total: progress.update(task, completed=done, total=total),
+        )
+
+    console.print(f"[green]📥 Imported {imported} account(s)[/]")
+    if imported < len(rows):
+        console.print(f"Skipped {len(rows) - imported} empty entries")
@@ -0,0 +1,22 @@
+import click
+import os
+
+from .consoles import console, err_console
+from ..accounts.file_manager import import_vault
+from ..config import vault_path
+
+
+@click.command(name="import-vault")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+def import_vault_command(source: str):
+    """
+    Copy every account from another vault file (json, SQLite or binary) into the configured vault
+    """
+    destination = vault_path()
+
+    if os.path.abspath(source) == os.path.abspath(destination):
+        err_console.print(f"[red]{source} is already the configured vault[/]")
+        return
+
+    count = import_vault(source, destination)
+    console.print(f"[green]📥 Imported {count} account(s) into {destination}[/]")
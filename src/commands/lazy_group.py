@@ -0,0 +1,68 @@
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+
+class LazyGroup(click.Group):
+    """
+    Click group whose subcommands are only imported once they are run, so a command doesn't pay for importing
+    what every other command needs. Help lists the commands from their short help, without importing any of them
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_subcommands: Optional[Dict[str, Tuple[str, str]]] = None,
+        **kwargs,
+    ):
+        """
+        :param Optional[Dict[str, Tuple[str, str]]] lazy_subcommands: name of each subcommand ->
+            ("module:command", short help), with the module relative to `src.commands`
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = {} if lazy_subcommands is None else lazy_subcommands
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+
+        import_path, _ = self.lazy_subcommands[cmd_name]
+        module_name, command_name = import_path.split(":")
+        command = getattr(
+            importlib.import_module(module_name, __package__), command_name
+        )
+
+        if not isinstance(command, click.Command):
+            raise TypeError(f"{import_path} is not a click command")
+
+        return command
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter):
+        """
+        Same as `click.Group.format_commands`, with the short help of lazy subcommands taken from `lazy_subcommands`
+        """
+        commands = self.list_commands(ctx)
+        if len(commands) == 0:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name in commands)
+        rows = []
+
+        for name in commands:
+            if name in self.lazy_subcommands:
+                # Shortened the same way as the help of the command itself would be
+                placeholder = click.Command(name, help=self.lazy_subcommands[name][1])
+                rows.append((name, placeholder.get_short_help_str(limit)))
+                continue
+
+            command = super().get_command(ctx, name)
+            if command is not None and not command.hidden:
+                rows.append((name, command.get_short_help_str(limit)))
+
+        if len(rows) > 0:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
@@ -0,0 +1,30 @@
+import click
+
+from .consoles import console, err_console
+from ..accounts.file_manager import migrate_vault
+from ..config import vault_path
+from ..constants import strings as STRINGS
+
+
+@click.command(name="migrate-vault")
+@click.option(
+    "-p",
+    "--master-password",
+    type=str,
+    prompt=True,
+    help="Master password used to encrypt all passwords",
+)
+def migrate_vault_command(master_password: str):
+    """
+    Re-encrypt passwords saved in an older vault format with the current format
+    """
+    try:
+        migrated = migrate_vault(vault_path(), master_password)
+    except ValueError:
+        err_console.print(STRINGS.MASTER_PASSWORD_ERROR)
+        return
+    except FileNotFoundError:
+        err_console.print(STRINGS.MASTER_PASSWORD_NOT_FOUND_ERROR)
+        return
+
+    console.print(f"[green]🔑 Migrated {migrated} password(s)[/]")
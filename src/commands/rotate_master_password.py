@@ -0,0 +1,59 @@
+import click
+from rich.progress import Progress
+
+from .consoles import console, err_console
+from ..accounts.parallel import default_workers
+from ..accounts.rotation import rotate_master_password
+from ..config import vault_path
+from ..constants import strings as STRINGS
+
+
+@click.command(name="rotate-master-password")
+@click.option(
+    "--old-master-password",
+    type=str,
+    prompt=True,
+    help="Current master password",
+)
+@click.option(
+    "--new-master-password",
+    type=str,
+    prompt=True,
+    confirmation_prompt=True,
+    help="Master password to replace the current one with",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=default_workers,
+    show_default="number of cores",
+    help="Number of processes used to re-encrypt passwords",
+)
+def rotate_master_password_command(
+    old_master_password: str, new_master_password: str, workers: int
+):
+    """
+    Replace the master password and re-encrypt every password with it
+    """
+    try:
+        with Progress(console=err_console, transient=True) as progress:
+            task = progress.add_task("Re-encrypting passwords")
+
+            rotated = rotate_master_password(
+                vault_path(),
+                old_master_password,
+                new_master_password,
+                workers,
+                lambda done, total: progress.update(task, completed=done, total=total),
+            )
+    except ValueError:
+        err_console.print(STRINGS.MASTER_PASSWORD_ERROR)
+        return
+    except FileNotFoundError:
+        err_console.print(STRINGS.MASTER_PASSWORD_NOT_FOUND_ERROR)
+        return
+
+    console.print(
+        f"[green]🔐 Master Password Rotated![/] Re-encrypted {rotated} password(s)"
+    )
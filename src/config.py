@@ -0,0 +1,45 @@
+import json
+from typing import Any, Dict
+
+from .constants import paths as PATHS
+
+STORAGE_BACKENDS = {
+    "json": PATHS.ACCOUNT_PATH,
+    "sqlite": PATHS.SQLITE_PATH,
+    "binary": PATHS.BINARY_PATH,
+}
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "storage": "json",
+}
+
+
+def load_config(path: str = PATHS.CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Loads the configuration from the json file given by path. Missing settings use their defaults
+
+    :param str path: path of the configuration file
+    :return: the configuration
+    :rtype: Dict[str, Any]
+    :raises ValueError: if the configuration is invalid
+    """
+    config = DEFAULT_CONFIG.copy()
+
+    try:
+        with open(path, "r") as file:
+            config.update(json.load(file))
+    except FileNotFoundError:
+        pass
+
+    if config["storage"] not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {config['storage']}")
+
+    return config
+
+
+def vault_path() -> str:
+    """
+    :return: path of the vault of the configured storage backend
+    :rtype: str
+    """
+    return STORAGE_BACKENDS[load_config()["storage"]]
@@ -4,3 +4,13 @@ EXIT_BYTES = [b"\x03", b"\x04"]
 ENTER_BYTE = b"\r"
 UP_ARROW = b"H"
 DOWN_ARROW = b"P"
+PAGE_UP = b"I"
+PAGE_DOWN = b"Q"
+DELETE_BYTE = b"\x7f"  # Sent by the backspace key of most Unix terminals
+NEWLINE_BYTE = b"\n"
+ESCAPE_BYTE = b"\x1b"
+NULL_BYTE = b"\x00"  # Prefix of some Windows function keys, like FUNCTION_ARROW_BYTE
+ANSI_UP_ARROWS = [b"\x1b[A", b"\x1bOA"]
+ANSI_DOWN_ARROWS = [b"\x1b[B", b"\x1bOB"]
+ANSI_PAGE_UP = b"\x1b[5~"
+ANSI_PAGE_DOWN = b"\x1b[6~"
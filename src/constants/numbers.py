@@ -1 +1,34 @@
 KEY_SIZE = 32
+
+# Passwords encrypted with a scrypt key derived from the master password and their own salt
+LEGACY_PASSWORD_VERSION = 1
+# Passwords encrypted with an HKDF subkey of the vault's master key
+PASSWORD_VERSION = 2
+
+# Seconds the unlock agent waits for a request before locking itself
+AGENT_IDLE_TIMEOUT = 15 * 60
+# Seconds a client waits for the unlock agent to answer, and the agent waits for a client to send a request
+AGENT_CLIENT_TIMEOUT = 5
+
+# The account journal is compacted into the json file once it is larger than both of these
+JOURNAL_MIN_COMPACT_BYTES = 64 * 1024
+JOURNAL_COMPACT_RATIO = 0.5  # Fraction of the size of the json file
+# Bytes of the journal read at a time when looking for the end of its last complete record
+JOURNAL_READ_SIZE = 4096
+# Characters of the json file read at a time when streaming its accounts
+JSON_READ_SIZE = 64 * 1024
+
+# Number of previous queries a search session remembers the results of
+SEARCH_CACHE_SIZE = 64
+# Number of matches a search ranks and shows
+SEARCH_RESULT_LIMIT = 50
+# Rows a search goes through between checking whether it was cancelled
+SEARCH_CANCEL_CHECK_ROWS = 2048
+# Interactive searches through more accounts than this run in a background thread, so typing isn't blocked
+SEARCH_BACKGROUND_MIN_ACCOUNTS = 5000
+# Accounts loaded in the background are added to an interactive search in batches of this many
+SEARCH_LOAD_BATCH_SIZE = 2000
+# Lines of the search screen that aren't result rows: the prompt, the table's borders and header, and its footer
+SEARCH_VIEW_CHROME_LINES = 6
+# Most bytes read from the terminal at once
+TERMINAL_READ_SIZE = 4096
@@ -1,2 +1,10 @@
 ACCOUNT_PATH = "accounts.json"
 MASTER_PATH = "master.txt"
+AGENT_SOCKET_PATH = "agent.sock"
+SQLITE_PATH = "accounts.db"
+CONFIG_PATH = "config.json"
+BINARY_PATH = "accounts.vault"
+# Copy of master.txt kept while the master password is rotated, until the vault was rotated as well
+MASTER_BACKUP_PATH = "master.txt.bak"
+# Held while the master password is rotated, so its copies are only restored once no rotation is running
+ROTATION_LOCK_PATH = "master.txt.lock"
@@ -6,3 +6,5 @@ MASTER_PASSWORD_ERROR = "[red]Master Password is Incorrect[/]"
 MASTER_PASSWORD_NOT_FOUND_ERROR = "No master password found"
 RANDOM_PASSWORD_PROMPT = "Press Enter for a random Password"
 COPIED_TO_CLIPBOARD = "[green]:clipboard: Password copied to clipboard![/green]"
+AGENT_LOCKED_ERROR = "Agent is locked"
+AGENT_RUNNING_ERROR = "An agent is already running. Stop it with `agent --stop` first"
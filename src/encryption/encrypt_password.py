@@ -1,50 +1,58 @@
-from Cryptodome.Cipher import AES
 from typing import Tuple
-from ..constants.strings import MASTER_PASSWORD_ERROR
-from ..encryption.master_password import verify_master_password
-from ..utils.aes_utils import create_key
+from ..constants.numbers import LEGACY_PASSWORD_VERSION, PASSWORD_VERSION
+from ..encryption.vault_key import VaultKey, unlock
+from ..profiling import span
 
 
 def encrypt_password(
-    master_password: str, salt: str, plaintext_password: str
+    master_password: str | VaultKey, salt: str, plaintext_password: str
 ) -> Tuple[bytes, bytes]:
     """
-    Encrypts `plaintext_password` with `master_password`
+    Encrypts `plaintext_password` with `master_password`, using the current password version
 
-    :param str master_password: password to use to encrypt `plaintext_password`
+    :param str | VaultKey master_password: password or unlocked vault key to use to encrypt `plaintext_password`
     :param str salt: salt to use to encrypt password
     :param str plaintext_password: password to encrypt
     :return: Tuple with two entries
         First entry is the encrypted password
         Second entry is the nonce used
     :rtype: Tuple[bytes, bytes]
+    :raises ValueError: if master password is incorrect
     """
-    key = create_key(master_password, salt)
-    cipher = AES.new(key, AES.MODE_EAX)
-    ciphertext = cipher.encrypt(plaintext_password.encode("utf-8"))
+    from Cryptodome.Cipher import AES  # Slow to import, see aes_utils
+
+    key = unlock(master_password).entry_key(salt, PASSWORD_VERSION)
+    with span("aes"):
+        cipher = AES.new(key, AES.MODE_EAX)
+        ciphertext = cipher.encrypt(plaintext_password.encode("utf-8"))
 
     return (ciphertext, cipher.nonce)
 
 
 def decrypt_password(
-    master_password: str, salt: str, nonce: bytes, encrypted_password: bytes
+    master_password: str | VaultKey,
+    salt: str,
+    nonce: bytes,
+    encrypted_password: bytes,
+    version: int = LEGACY_PASSWORD_VERSION,
 ) -> str:
     """
     Decrypts `encrypted_password` encrypted with `master_password`
 
-    :param str master_password: master password used to encrypt the password
+    :param str | VaultKey master_password: master password or unlocked vault key used to encrypt the password
     :param str salt: salt used to encrypt the password
     :param bytes nonce: nonce generated by the original cipher
     :param bytes encrypted_password: the password to decrypt
+    :param int version: version of the format the password was encrypted with
     :return: the decrypted password
     :rtype: str
     :raises ValueError: if master password is incorrect
     """
-    if not verify_master_password(master_password):
-        raise ValueError(MASTER_PASSWORD_ERROR)
+    from Cryptodome.Cipher import AES  # Slow to import, see aes_utils
 
-    key = create_key(master_password, salt)
-    cipher = AES.new(key, AES.MODE_EAX, nonce)
-    decoded = cipher.decrypt(encrypted_password)
+    key = unlock(master_password).entry_key(salt, version)
+    with span("aes"):
+        cipher = AES.new(key, AES.MODE_EAX, nonce)
+        decoded = cipher.decrypt(encrypted_password)
 
     return decoded.decode("utf-8")
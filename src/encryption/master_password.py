@@ -1,42 +1,145 @@
+import hashlib
+import hmac
+from typing import List, Optional, TextIO
+
 from ..constants.paths import MASTER_PATH
 from ..constants.numbers import KEY_SIZE
-from ..utils.aes_utils import create_salt
+from ..constants.strings import MASTER_PASSWORD_ERROR
+from ..profiling import span
+from ..utils.aes_utils import create_salt, create_key
+from ..utils.file_utils import atomic_write
 from ..utils.password_utils import hash_password
 
+KEY_CHECK_CONTEXT = b"password-inator key check"
+
 
 def save_master_password(password: str):
     """
     Hashes and saves the master password + salt
     The master password is used to decrypt all passwords
+    A separate key salt is also saved, which is used to derive the vault's master key,
+    with a check value of the master key, which verifies the master password while deriving it
 
     :param str password: password to save
     """
     with open(MASTER_PATH, "w") as f:
-        salt = create_salt(KEY_SIZE)
-        hash = hash_password(password, salt)
+        write_master_password(f, password)
+
+
+def create_key_check(master_key: bytes) -> str:
+    """
+    :param bytes master_key: master key created with `create_key`
+    :return: hex representation of the check value of the master key, which doesn't reveal the master key
+    :rtype: str
+    """
+    return hmac.new(master_key, KEY_CHECK_CONTEXT, hashlib.sha256).hexdigest()
+
 
-        f.write("Salt: \n")
-        f.write(salt)
-        f.write("\n")
-        f.write("Hash: \n")
-        f.write(hash)
+def _write_lines(f: TextIO, salt: str, hash: str, key_salt: str, key_check: str):
+    f.write("Salt: \n")
+    f.write(salt)
+    f.write("\n")
+    f.write("Hash: \n")
+    f.write(hash)
+    f.write("\n")
+    f.write("Key Salt: \n")
+    f.write(key_salt)
+    f.write("\n")
+    f.write("Key Check: \n")
+    f.write(key_check)
+
+
+def write_master_password(f: TextIO, password: str) -> bytes:
+    """
+    Writes the contents of master.txt for `password` to `f`: the salt and hash of the password, a new key salt,
+    and the check value of the master key
+
+    :param TextIO f: file to write to
+    :param str password: password to save
+    :return: the new master key
+    :rtype: bytes
+    """
+    salt = create_salt(KEY_SIZE)
+    key_salt = create_salt(KEY_SIZE)
+    master_key = create_key(password, key_salt)
+
+    _write_lines(
+        f, salt, hash_password(password, salt), key_salt, create_key_check(master_key)
+    )
+
+    return master_key
+
+
+def _read_lines() -> List[str]:
+    with open(MASTER_PATH, "r") as f:
+        return [line.strip() for line in f.readlines()]
 
 
 def verify_master_password(password: str) -> bool:
     """
     Verifies that the hash of the password matches that of the master password
+    `unlock_master_key` is cheaper, when the master key is needed as well
 
     :param str password: password to verify
     :return: True iff password is the same as the master password
     :rtype: bool
     :raises FileNotFoundError: if master.txt file is not found
     """
-    with open(MASTER_PATH, "r") as f:
-        lines = f.readlines()
+    lines = _read_lines()
+
+    salt = lines[1]
+    hash = lines[3]
+
+    return hash == hash_password(password, salt)
+
+
+def load_key_salt() -> Optional[str]:
+    """
+    Reads the key salt from master.txt
+
+    :return: the key salt, or None if master.txt was created before key salts existed
+    :rtype: Optional[str]
+    :raises FileNotFoundError: if master.txt file is not found
+    """
+    lines = _read_lines()
+
+    if len(lines) < 6:
+        return None
+
+    return lines[5]
+
+
+def unlock_master_key(password: str) -> bytes:
+    """
+    Verifies the master password and derives the vault's master key from it using scrypt
+    This is the only scrypt derivation needed to encrypt/decrypt any number of passwords,
+    the key of each password is derived from the master key with `derive_subkey`
+    The password is verified by comparing the check value of the derived master key with the one in master.txt,
+    so verifying it doesn't need a scrypt derivation of its own. master.txt files without a key salt or check value
+    are verified with the hash of the password instead, and the missing values are added to them
+
+    :param str password: password to verify
+    :return: the master key
+    :rtype: bytes
+    :raises ValueError: if password is not the master password
+    :raises FileNotFoundError: if master.txt file is not found
+    """
+    with span("master verify"):
+        lines = _read_lines()
+
+        if len(lines) >= 8:
+            master_key = create_key(password, lines[5])
+            if not hmac.compare_digest(create_key_check(master_key), lines[7]):
+                raise ValueError(MASTER_PASSWORD_ERROR)
+            return master_key
+
+        if not verify_master_password(password):
+            raise ValueError(MASTER_PASSWORD_ERROR)
 
-        salt = lines[1].strip()
-        hash = lines[3].strip()
+        key_salt = lines[5] if len(lines) >= 6 else create_salt(KEY_SIZE)
+        master_key = create_key(password, key_salt)
 
-        new_hash = hash_password(password, salt)
+        with atomic_write(MASTER_PATH) as f:
+            _write_lines(f, lines[1], lines[3], key_salt, create_key_check(master_key))
 
-        return hash == new_hash
+        return master_key
@@ -0,0 +1,122 @@
+import hmac
+import os
+from typing import Optional, Tuple
+
+from ..constants.numbers import LEGACY_PASSWORD_VERSION
+from ..constants.paths import MASTER_BACKUP_PATH, MASTER_PATH
+from ..encryption.master_password import unlock_master_key
+from ..utils.aes_utils import create_key, derive_subkey
+
+
+def _master_fingerprint() -> Tuple[int, int]:
+    """
+    Identifies the current version of master.txt by its inode and modification time
+
+    :raises FileNotFoundError: if master.txt file is not found
+    """
+    stat = os.stat(MASTER_PATH)
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+class VaultKey:
+    """
+    Verified session of an unlocked vault. Created with `unlock`, after the master password has been verified
+    and the master key derived (with scrypt). Every entry key is derived from the master key
+    The session is only valid as long as master.txt is not replaced or modified
+    """
+
+    def __init__(self, master_password: str, master_key: bytes):
+        self._master_password = master_password
+        self.master_key = master_key
+        self._fingerprint = _master_fingerprint()
+
+    def credentials(self) -> Tuple[str, bytes]:
+        """
+        :return: the master password and master key, to create the same key in another process
+            with `VaultKey(*credentials)`, without verifying or deriving it again
+        :rtype: Tuple[str, bytes]
+        """
+        return self._master_password, self.master_key
+
+    def is_current(self) -> bool:
+        """
+        :return: True iff master.txt has not changed since the master password was verified
+        :rtype: bool
+        """
+        try:
+            return _master_fingerprint() == self._fingerprint
+        except FileNotFoundError:
+            return False
+
+    def matches(self, master_password: str) -> bool:
+        """
+        :return: True iff `master_password` is the password this session was unlocked with
+        :rtype: bool
+        """
+        return hmac.compare_digest(
+            self._master_password.encode("utf-8"), master_password.encode("utf-8")
+        )
+
+    def entry_key(self, salt: str, version: int) -> bytes:
+        """
+        Gets the AES key of a single password
+
+        :param str salt: salt of the password
+        :param int version: version of the password's format.
+        Legacy passwords need their own scrypt derivation, newer passwords only need an HKDF subkey
+        :return: The 32-bit AES key
+        :rtype: bytes
+        """
+        if version == LEGACY_PASSWORD_VERSION:
+            return create_key(self._master_password, salt)
+
+        return derive_subkey(self.master_key, salt)
+
+
+# Session of the last successful unlock in this process
+_session: Optional[VaultKey] = None
+
+
+def unlock(master_password: str | VaultKey) -> VaultKey:
+    """
+    Verifies the master password and returns the key of the vault, with a single scrypt derivation
+    Verification only runs once per process, later calls with the same master password reuse the session
+    until master.txt changes. If `master_password` is already a valid VaultKey, it is returned as is
+
+    :param str | VaultKey master_password: master password used to encrypt all passwords, or a session
+    :return: the unlocked vault key
+    :rtype: VaultKey
+    :raises ValueError: if master_password is incorrect
+    :raises FileNotFoundError: if `master.txt` is not found
+    """
+    global _session
+
+    if os.path.exists(MASTER_BACKUP_PATH):
+        # Only imported when a rotation left its copies behind
+        from ..accounts.rotation import recover_interrupted_rotation
+
+        recover_interrupted_rotation()
+
+    if isinstance(master_password, VaultKey):
+        if master_password.is_current():
+            return master_password
+        master_password = master_password._master_password
+
+    if (
+        _session is not None
+        and _session.is_current()
+        and _session.matches(master_password)
+    ):
+        return _session
+
+    # Created after the master key, since deriving it may add the key salt and check value to an old master.txt
+    _session = VaultKey(master_password, unlock_master_key(master_password))
+    return _session
+
+
+def lock() -> None:
+    """
+    Forgets the session of this process, the next `unlock` will verify the master password again
+    """
+    global _session
+    _session = None
@@ -0,0 +1,253 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, NamedTuple, Optional, Union
+from rich.console import Console
+from rich.live import Live
+
+from .accounts.account import Account
+from .constants.numbers import (
+    SEARCH_BACKGROUND_MIN_ACCOUNTS,
+    SEARCH_LOAD_BATCH_SIZE,
+)
+from .io.live_input import Key_Type, Live_Input
+from .io.terminal import Key_Event, Terminal_Session
+from .profiling import span
+from .search import SearchCancelled, SearchSession
+from .search_view import SearchView
+
+# Keys which move through the results, so they need the results of the latest query
+NAVIGATION_KEYS = [
+    Key_Type.UP,
+    Key_Type.DOWN,
+    Key_Type.PAGE_UP,
+    Key_Type.PAGE_DOWN,
+    Key_Type.ENTER,
+]
+
+
+def _read_keys(
+    terminal: Terminal_Session,
+    keys: "asyncio.Queue[_Event]",
+) -> Callable[[], None]:
+    """
+    Puts every batch of keys typed into the terminal on the keys queue, as they're typed
+
+    :return: A function which stops reading
+    :rtype: Callable[[], None]
+    """
+    loop = asyncio.get_running_loop()
+
+    def read():
+        events = terminal.read_keys(timeout=0)
+        if len(events) > 0:
+            keys.put_nowait(events)
+
+    try:
+        loop.add_reader(terminal.fileno(), read)
+        return lambda: loop.remove_reader(terminal.fileno())
+    except NotImplementedError:
+        pass
+
+    # Event loops on Windows can't wait on the terminal, so a thread waits instead
+    stopped = threading.Event()
+
+    def read_in_thread():
+        while not stopped.is_set():
+            events = terminal.read_keys(timeout=0.1)
+            if len(events) > 0:
+                loop.call_soon_threadsafe(keys.put_nowait, events)
+
+    threading.Thread(target=read_in_thread, daemon=True).start()
+    return stopped.set
+
+
+class _Loaded(NamedTuple):
+    """
+    Put on the keys queue when a batch of accounts was added to the search session
+    """
+
+    finished: bool
+
+
+def _load_in_background(
+    accounts: Iterable[Account],
+    session: SearchSession,
+    events: "asyncio.Queue[_Event]",
+) -> Callable[[], None]:
+    """
+    Adds accounts to session in batches on a background thread, as they're loaded.
+    After every batch, _Loaded is put on the events queue. Errors while loading are put on it as well
+
+    :return: A function which stops loading
+    :rtype: Callable[[], None]
+    """
+    loop = asyncio.get_running_loop()
+    stopped = threading.Event()
+
+    def put(event: "_Event"):
+        try:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+        except RuntimeError:
+            pass  # The search already finished
+
+    def load():
+        try:
+            batch: List[Account] = []
+            for account in accounts:
+                batch.append(account)
+
+                if len(batch) >= SEARCH_LOAD_BATCH_SIZE:
+                    if stopped.is_set():
+                        return
+                    session.extend(batch)
+                    batch = []
+                    put(_Loaded(False))
+
+            session.extend(batch)
+            put(_Loaded(True))
+        except Exception as error:
+            put(error)
+
+    threading.Thread(target=load, daemon=True).start()
+    return stopped.set
+
+
+# What the search waits for: keys typed by the user, accounts being loaded, or an error while loading them
+_Event = Union[List[Key_Event], _Loaded, Exception]
+
+
+async def run_interactive_search(
+    view: SearchView,
+    terminal: Terminal_Session,
+    live: Live,
+    console: Console,
+    accounts: Optional[Iterable[Account]] = None,
+) -> Optional[Account]:
+    """
+    Runs the interactive search until the user selects an account or exits.
+    Every query runs as a task, in a background thread for large vaults, which is cancelled as soon as
+    the user types something else. Typing is never blocked by a search, and the screen is redrawn
+    once the latest query finishes
+
+    :param SearchView view: Search screen
+    :param Terminal_Session terminal: Terminal to read keys from, which is in raw mode
+    :param Live live: Live display showing the search screen
+    :param Console console: Console the search screen is shown on
+    :param Optional[Iterable[Account]] accounts: Accounts to add to the search session on a background thread
+        while searching, e.g. as they are read from the vault. Results are updated as they are added
+    :return: The selected account, or None if the user exited
+    :rtype: Optional[Account]
+    :raises Exception: any error raised while loading accounts
+    """
+    keys: asyncio.Queue[_Event] = asyncio.Queue()
+    live_input = Live_Input()
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    # Increases with every query, so searches can tell they've been replaced
+    generation = 0
+    query_task: Optional[asyncio.Task] = None
+    task_query: Optional[str] = None
+
+    def redraw():
+        with span("render"):
+            screen = view.render_if_changed()
+            if screen is not None:
+                live.update(screen, refresh=True)
+
+    async def run_query(query: str, query_generation: int, keep_position: bool):
+        def cancelled() -> bool:
+            return generation != query_generation
+
+        try:
+            if len(view.session) >= SEARCH_BACKGROUND_MIN_ACCOUNTS:
+                loop = asyncio.get_running_loop()
+                total, matches = await loop.run_in_executor(
+                    executor, view.results, query, cancelled, keep_position
+                )
+            else:
+                total, matches = view.results(query, keep_position=keep_position)
+        except SearchCancelled:
+            return
+
+        if not cancelled():
+            view.show(query, total, matches, keep_position)
+            redraw()
+
+    def start_query(restart: bool = False):
+        """
+        Searches for the latest query. With restart, a search which is already running for it starts over,
+        e.g. because more accounts were loaded
+        """
+        nonlocal generation, query_task, task_query
+
+        if query_task is not None and not query_task.done():
+            if task_query == live_input.input and not restart:
+                return  # Already searching for it
+            query_task.cancel()
+
+        generation += 1
+        task_query = live_input.input
+        query_task = asyncio.create_task(
+            run_query(live_input.input, generation, live_input.input == view.query)
+        )
+
+    stop_reading = _read_keys(terminal, keys)
+    stop_loading = (
+        (lambda: None)
+        if accounts is None
+        else _load_in_background(accounts, view.session, keys)
+    )
+    view.loading = accounts is not None
+    loaded = False  # Whether accounts were added since the last search
+
+    try:
+        while True:
+            events = await keys.get()
+
+            if isinstance(events, Exception):
+                raise events
+
+            if isinstance(events, _Loaded):
+                view.loading = not events.finished
+                loaded = True
+                events = []
+
+            for input_type in live_input.process_keys(events):
+                if input_type == Key_Type.EXIT:
+                    return None
+
+                if input_type in NAVIGATION_KEYS and live_input.input != view.query:
+                    # Keys move through the latest results
+                    start_query()
+                    assert query_task is not None
+                    await query_task
+
+                if input_type == Key_Type.UP:
+                    view.move(-1)
+                elif input_type == Key_Type.DOWN:
+                    view.move(1)
+                elif input_type == Key_Type.PAGE_UP:
+                    view.page(-1)
+                elif input_type == Key_Type.PAGE_DOWN:
+                    view.page(1)
+                elif input_type == Key_Type.ENTER:
+                    return view.selected()
+
+            # Keys typed in a burst (e.g. pasted text) are all handled before searching and redrawing once
+            if not keys.empty():
+                continue
+
+            view.resize(console.size.height)
+            if live_input.input != view.query or loaded:
+                start_query(restart=loaded)
+                loaded = False
+            else:
+                redraw()
+    finally:
+        stop_reading()
+        stop_loading()
+        generation += 1
+        if query_task is not None:
+            query_task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
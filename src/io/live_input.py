@@ -1,6 +1,8 @@
 from enum import Enum
-from .getch import getch
-from ..constants import bytes as BYTES
+from typing import TYPE_CHECKING, Iterator, List
+
+if TYPE_CHECKING:
+    from .terminal import Key_Event
 
 
 class Key_Type(Enum):
@@ -13,44 +15,25 @@ class Key_Type(Enum):
     SPECIAL = 4  # Some other not before mentioned special character
     UNKNOWN = 5  # Some UnicodeDecodeError or otherwise some other character that can't be interpreted
     ENTER = 6  # Enter
+    PAGE_UP = 7  # Page up on the keyboard
+    PAGE_DOWN = 8  # Page down on the keyboard
+    BACKSPACE = 9  # Backspace. Reported as SPECIAL by Live_Input, after removing the last character of self.input
 
 
 class Live_Input:
     def __init__(self):
         self.input = ""
 
-    def process_next_input(self) -> Key_Type:
+    def process_keys(self, keys: List["Key_Event"]) -> Iterator[Key_Type]:
         """
-        Appends the next character the user types into the terminal onto self.input
-        Returns True iff the next user input should not be processed
+        Goes through keys read from a terminal
+        Each key is applied to self.input before it's yielded, so self.input is up to date with every yielded key
         """
-        next_byte = getch()
-
-        if next_byte in BYTES.EXIT_BYTES:
-            return Key_Type.EXIT
-
-        if next_byte == BYTES.ENTER_BYTE:
-            return Key_Type.ENTER
-
-        if next_byte == BYTES.BACKSPACE_BYTE:
-            self.input = self.input[:-1]
-            return Key_Type.SPECIAL
-
-        if next_byte == BYTES.FUNCTION_ARROW_BYTE:
-            # Function bytes take up two bytes, so we need to consume the next byte
-            next_byte = getch()
-
-            if next_byte == BYTES.UP_ARROW:
-                return Key_Type.UP
-            if next_byte == BYTES.DOWN_ARROW:
-                return Key_Type.DOWN
-            return Key_Type.SPECIAL
-
-        try:
-            if isinstance(next_byte, bytes):
-                self.input += next_byte.decode("UTF-8")
-                return Key_Type.STANDARD
-        except UnicodeDecodeError:
-            return Key_Type.SPECIAL
-
-        return Key_Type.UNKNOWN
+        for key_type, text in keys:
+            if key_type == Key_Type.STANDARD:
+                self.input += text
+            elif key_type == Key_Type.BACKSPACE:
+                self.input = self.input[:-1]
+                key_type = Key_Type.SPECIAL
+
+            yield key_type
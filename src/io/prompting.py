@@ -1,8 +1,11 @@
 import click
-from rich.console import Console
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from rich.console import Console
 
-def confirm(value: str, console: Console):
+
+def confirm(value: str, console: "Console"):
     """
     Asks the user to confirm value.
 
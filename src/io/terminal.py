@@ -0,0 +1,208 @@
+import codecs
+import os
+import re
+import select
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from .live_input import Key_Type
+from ..constants import bytes as BYTES
+from ..constants.numbers import TERMINAL_READ_SIZE
+
+# A key and the text it typed, which is only set for Key_Type.STANDARD
+Key_Event = Tuple[Key_Type, str]
+
+# ANSI escape sequences: CSI (ESC [ parameters final byte) and SS3 (ESC O final byte)
+_ESCAPE_SEQUENCE = re.compile(rb"\x1b(?:\[[0-?]*[ -/]*[@-~]|O[@-~])")
+# Start of an escape sequence which was cut off at the end of a read
+_PARTIAL_ESCAPE_SEQUENCE = re.compile(rb"\x1b(?:\[[0-?]*[ -/]*|O)\Z")
+
+_ESCAPE_KEYS = {
+    **{sequence: Key_Type.UP for sequence in BYTES.ANSI_UP_ARROWS},
+    **{sequence: Key_Type.DOWN for sequence in BYTES.ANSI_DOWN_ARROWS},
+    BYTES.ANSI_PAGE_UP: Key_Type.PAGE_UP,
+    BYTES.ANSI_PAGE_DOWN: Key_Type.PAGE_DOWN,
+}
+
+_FUNCTION_KEYS = {
+    BYTES.UP_ARROW: Key_Type.UP,
+    BYTES.DOWN_ARROW: Key_Type.DOWN,
+    BYTES.PAGE_UP: Key_Type.PAGE_UP,
+    BYTES.PAGE_DOWN: Key_Type.PAGE_DOWN,
+}
+
+_BACKSPACE_BYTES = [BYTES.BACKSPACE_BYTE, BYTES.DELETE_BYTE]
+_ENTER_BYTES = [BYTES.ENTER_BYTE, BYTES.NEWLINE_BYTE]
+_FUNCTION_PREFIXES = [BYTES.FUNCTION_ARROW_BYTE, BYTES.NULL_BYTE]
+
+
+class Key_Decoder:
+    """
+    Decodes the bytes read from a terminal into keys.
+    Escape sequences and UTF-8 characters cut off at the end of one read are finished by the next
+    """
+
+    def __init__(self):
+        self._pending = b""
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+
+    def _text(self, events: List[Key_Event], data: bytes):
+        text = self._text_decoder.decode(data)
+        if text == "":
+            return
+
+        # Consecutive text is typed as one event
+        if len(events) > 0 and events[-1][0] == Key_Type.STANDARD:
+            events[-1] = (Key_Type.STANDARD, events[-1][1] + text)
+        else:
+            events.append((Key_Type.STANDARD, text))
+
+    def feed(self, data: bytes) -> List[Key_Event]:
+        """
+        Decodes the next bytes read from the terminal
+
+        :param bytes data: bytes read from the terminal
+        :return: the keys typed, in order
+        :rtype: List[Key_Event]
+        """
+        data = self._pending + data
+        self._pending = b""
+        events: List[Key_Event] = []
+        i = 0
+
+        while i < len(data):
+            byte = data[i : i + 1]
+
+            if byte in BYTES.EXIT_BYTES:
+                events.append((Key_Type.EXIT, ""))
+            elif byte in _ENTER_BYTES:
+                events.append((Key_Type.ENTER, ""))
+            elif byte in _BACKSPACE_BYTES:
+                events.append((Key_Type.BACKSPACE, ""))
+            elif byte == BYTES.ESCAPE_BYTE:
+                sequence = _ESCAPE_SEQUENCE.match(data, i)
+
+                if sequence is not None:
+                    key = _ESCAPE_KEYS.get(sequence.group(), Key_Type.SPECIAL)
+                    events.append((key, ""))
+                    i = sequence.end()
+                    continue
+
+                if i + 1 < len(data) and _PARTIAL_ESCAPE_SEQUENCE.match(data, i):
+                    # The rest of the sequence comes with the next read
+                    self._pending = data[i:]
+                    break
+
+                # The escape key on its own
+                events.append((Key_Type.SPECIAL, ""))
+            elif byte in _FUNCTION_PREFIXES and data[i + 1 : i + 2] in _FUNCTION_KEYS:
+                # Windows function keys take up two bytes
+                events.append((_FUNCTION_KEYS[data[i + 1 : i + 2]], ""))
+                i += 2
+                continue
+            elif byte < b" ":
+                events.append((Key_Type.SPECIAL, ""))
+            else:
+                # Text goes up to the next control character
+                end = i + 1
+                while end < len(data) and data[end] >= 0x20 and data[end] != 0x7F:
+                    end += 1
+                self._text(events, data[i:end])
+                i = end
+                continue
+
+            i += 1
+
+        return events
+
+
+class Terminal_Session:
+    """
+    Keeps the terminal in raw mode while in use as a context manager, so every key is read as soon as it's typed,
+    without echoing it or waiting for enter. Output is left as is, so printing still works.
+    Keys are read in batches, with one read for everything typed since the last one
+    """
+
+    def __init__(self, fd: Optional[int] = None):
+        """
+        :param Optional[int] fd: File descriptor of the terminal. Defaults to standard input
+        """
+        self._windows = os.name == "nt"
+        self._fd = sys.stdin.fileno() if fd is None else fd
+        self._old_settings: Optional[list] = None
+        self._decoder = Key_Decoder()
+
+    def __enter__(self) -> "Terminal_Session":
+        if not self._windows:
+            import termios
+
+            self._old_settings = termios.tcgetattr(self._fd)
+            settings = termios.tcgetattr(self._fd)
+
+            settings[0] &= ~(
+                termios.BRKINT
+                | termios.ICRNL
+                | termios.INPCK
+                | termios.ISTRIP
+                | termios.IXON
+            )
+            settings[3] &= ~(
+                termios.ECHO | termios.ICANON | termios.IEXTEN | termios.ISIG
+            )
+            settings[6][termios.VMIN] = 1
+            settings[6][termios.VTIME] = 0
+
+            # Changed now, rather than after flushing, so keys typed before the session aren't lost
+            termios.tcsetattr(self._fd, termios.TCSANOW, settings)
+
+        return self
+
+    def __exit__(self, *args):
+        if self._old_settings is not None:
+            import termios
+
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._old_settings)
+            self._old_settings = None
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self, timeout: Optional[float] = None) -> bytes:
+        """
+        Reads everything typed so far, waiting for input if there isn't any
+
+        :param Optional[float] timeout: Most seconds to wait for input. Waits forever if None
+        :return: the bytes read, which are empty if the timeout ran out
+        :rtype: bytes
+        """
+        if self._windows:
+            import msvcrt
+
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not msvcrt.kbhit():
+                if deadline is not None and time.monotonic() >= deadline:
+                    return b""
+                time.sleep(0.01)
+
+            data = b""
+            while msvcrt.kbhit() and len(data) < TERMINAL_READ_SIZE:
+                data += msvcrt.getch()
+            return data
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if len(readable) == 0:
+            return b""
+
+        # The terminal closing is read as ^D
+        return os.read(self._fd, TERMINAL_READ_SIZE) or BYTES.EXIT_BYTES[-1]
+
+    def read_keys(self, timeout: Optional[float] = None) -> List[Key_Event]:
+        """
+        Reads and decodes every key typed so far, waiting for input if there isn't any
+
+        :param Optional[float] timeout: Most seconds to wait for input. Waits forever if None
+        :return: the keys typed, in order
+        :rtype: List[Key_Event]
+        """
+        return self._decoder.feed(self.read(timeout))
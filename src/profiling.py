@@ -0,0 +1,126 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Profile:
+    """
+    Where a command spent its time, recorded when the CLI is run with --profile
+    Spans are named phases (e.g. "read", "json parse", "scrypt") which can nest, so the time of "master verify"
+    includes that of the "scrypt" inside it. Counters count things like KDF calls and bytes read and written.
+    Work done in other processes (e.g. decrypting passwords with several workers) isn't recorded
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans: Dict[str, List[float]] = {}  # name -> [calls, seconds]
+        self.counters: Dict[str, int] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: the wall time, spans and counters, with times in milliseconds
+        :rtype: Dict[str, Any]
+        """
+        return {
+            "wall_ms": round((time.perf_counter() - self.start) * 1000, 3),
+            "spans": {
+                name: {"calls": int(calls), "total_ms": round(seconds * 1000, 3)}
+                for name, (calls, seconds) in self.spans.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+
+_profile: Optional[Profile] = None
+
+
+def enable() -> Profile:
+    """
+    Starts recording spans and counters, replacing what was recorded before
+    """
+    global _profile
+
+    _profile = Profile()
+    return _profile
+
+
+def disable() -> Optional[Profile]:
+    """
+    Stops recording
+
+    :return: what was recorded, or None if profiling wasn't enabled
+    :rtype: Optional[Profile]
+    """
+    global _profile
+
+    profile, _profile = _profile, None
+    return profile
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Records the time spent in the block as part of the span `name`
+    While profiling is off nothing is recorded, so a span only costs a function call
+    """
+    if _profile is None:
+        yield
+        return
+
+    profile = _profile
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        calls_and_seconds = profile.spans.setdefault(name, [0, 0.0])
+        calls_and_seconds[0] += 1
+        calls_and_seconds[1] += time.perf_counter() - start
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Adds amount to the counter `name`
+    """
+    if _profile is not None:
+        _profile.counters[name] = _profile.counters.get(name, 0) + amount
+
+
+def report(output: Optional[str] = None) -> None:
+    """
+    Stops recording, and prints a summary table of what was recorded to stderr, or writes it as json to output
+    """
+    profile = disable()
+    if profile is None:
+        return
+
+    summary = profile.to_dict()
+
+    if output is not None:
+        with open(output, "w") as file:
+            json.dump(summary, file, indent=4)
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+
+    wall_ms = summary["wall_ms"]
+    table = Table(title="Profile", caption=f"Total: {wall_ms:.1f} ms")
+    table.add_column("Span")
+    table.add_column("Calls", justify="right")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("% of Total", justify="right")
+
+    spans = sorted(summary["spans"].items(), key=lambda item: -item[1]["total_ms"])
+    for name, recorded in spans:
+        share = recorded["total_ms"] / wall_ms * 100 if wall_ms > 0 else 0
+        table.add_row(
+            name, str(recorded["calls"]), f"{recorded['total_ms']:.1f}", f"{share:.0f}%"
+        )
+
+    if len(summary["counters"]) > 0:
+        table.add_section()
+        for name, value in sorted(summary["counters"].items()):
+            table.add_row(name, f"{value:,}", "", "")
+
+    Console(stderr=True).print(table)
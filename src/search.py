@@ -1,32 +1,249 @@
-from fuzzyfinder import fuzzyfinder  # type: ignore
-from typing import List, Optional
+import threading
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from .accounts.account import Account, AccountFields
-from rich.table import Table
 
 from .constants import strings as STRINGS
+from .constants.numbers import (
+    SEARCH_CACHE_SIZE,
+    SEARCH_CANCEL_CHECK_ROWS,
+    SEARCH_RESULT_LIMIT,
+)
+from .search_corpus import (
+    SEARCH_FIELDS,
+    SearchCorpus,
+    accessor_mapping,
+    normalize,
+    original_positions,
+)
+from .search_index import FieldMatch, SearchIndex
+from .utils.fuzzy_utils import best_matches
+
+# rich is imported when a table is created, so searching doesn't need it
+if TYPE_CHECKING:
+    from rich.table import Table
+    from rich.text import Text
+
+
+class SearchMatch(NamedTuple):
+    account: Account
+    score: int
+    positions: List[int]  # Positions of the matched characters in the matched field
+    field: AccountFields
+
+
+def _search_fields(
+    field: AccountFields | Sequence[AccountFields],
+) -> List[AccountFields]:
+    """
+    Returns the searchable fields out of field, which is either one field or several
+    """
+    fields = [field] if isinstance(field, AccountFields) else list(field)
+    return [field for field in fields if field in accessor_mapping]
+
+
+def _corpus(accounts: List[Account] | SearchCorpus) -> SearchCorpus:
+    return accounts if isinstance(accounts, SearchCorpus) else SearchCorpus(accounts)
+
+
+def _to_search_matches(
+    corpus: SearchCorpus, matches: List[FieldMatch]
+) -> List[SearchMatch]:
+    return [
+        SearchMatch(corpus.accounts[row], -score, positions, field)
+        for score, _, row, positions, field in matches
+    ]
 
 
 def fuzzyfind_account_by_field(
-    field: AccountFields, accounts: List[Account], search: str
+    field: AccountFields | Sequence[AccountFields],
+    accounts: List[Account] | SearchCorpus,
+    search: str,
+    limit: Optional[int] = None,
 ) -> List[Account]:
     """
-    Fuzzyfind an account, searching through the list of accounts by field
+    Fuzzyfind an account, searching through the list of accounts by field, or by several fields
     search is the string which the fuzzy matching is done
+    Only the best `limit` accounts are returned, or every matching account if limit is None
+    Pass a SearchCorpus of the accounts to search them several times without normalizing them again
     """
-    accessor_mapping = {
-        AccountFields.USERNAME: lambda account: account.username,
-        AccountFields.SERVICE: lambda account: account.service,
-        AccountFields.URL: lambda account: account.url,
-    }
-
-    accessor = accessor_mapping.get(field)
-    if accessor is None:
+    fields = _search_fields(field)
+    if len(fields) == 0:
         return []  # Handle invalid field
 
-    filtered_accounts = [
-        account for account in accounts if accessor(account) is not None
+    corpus = _corpus(accounts)
+    matches = SearchIndex(corpus).match(fields, normalize(search), range(len(corpus)))
+
+    return [
+        match.account
+        for match in _to_search_matches(corpus, best_matches(matches, limit))
     ]
-    return list(fuzzyfinder(search, filtered_accounts, accessor=accessor))
+
+
+class SearchCancelled(Exception):
+    """
+    Raised by a search which was cancelled before it finished
+    """
+
+
+def _check_cancelled(
+    rows: Sequence[int], cancelled: Callable[[], bool]
+) -> Iterator[int]:
+    """
+    Goes through rows, raising SearchCancelled as soon as a chunk of rows starts after the search was cancelled
+    """
+    for start in range(0, len(rows), SEARCH_CANCEL_CHECK_ROWS):
+        if cancelled():
+            raise SearchCancelled
+        yield from rows[start : start + SEARCH_CANCEL_CHECK_ROWS]
+
+
+class SearchSession:
+    """
+    Incremental fuzzy search through a list of accounts by field, or by several fields
+    (e.g. SEARCH_FIELDS), for searching as the user types
+    The accounts' search corpus is indexed when the session is created, and accounts added with `extend` as they're
+    added, so a new query only matches the accounts containing every one of its characters
+    Accounts matching recent queries are kept, so extending a query only searches the matches of the shorter query,
+    and going back to a previous query (e.g. with backspace) only has to rank its matches again
+    Sessions can be searched from several threads, one search at a time
+    """
+
+    def __init__(
+        self,
+        field: AccountFields | Sequence[AccountFields],
+        accounts: List[Account] | SearchCorpus,
+        cache_size: int = SEARCH_CACHE_SIZE,
+    ):
+        self._fields = _search_fields(field)
+        self._corpus = _corpus(accounts)
+        self._index = SearchIndex(self._corpus, self._fields)
+        self._cache_size = cache_size
+        # Normalized query -> rows of every matching account, and the best matches found so far
+        self._cache: OrderedDict[str, Tuple[List[int], List[SearchMatch]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._corpus)
+
+    def extend(self, accounts: List[Account]):
+        """
+        Adds accounts to the session, e.g. as they are loaded. Results of previous queries are forgotten
+        """
+        with self._lock:
+            start = len(self._corpus)
+            self._corpus.extend(accounts)
+            self._index.extend(start)
+            self._cache.clear()
+
+    def _cached(self, query: str) -> Optional[Tuple[List[int], List[SearchMatch]]]:
+        results = self._cache.get(query)
+
+        if results is not None:
+            self._cache.move_to_end(query)
+
+        return results
+
+    def count(self, query: str, cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Counts the accounts matching `query`, without ranking them
+
+        :param str query: the string which the fuzzy matching is done with
+        :param Optional[Callable[[], bool]] cancelled: Checked while searching, which stops once it returns True
+        :return: the number of matching accounts
+        :rtype: int
+        :raises SearchCancelled: if the search was cancelled
+        """
+        with self._lock:
+            cached = self._cached(normalize(query))
+            if cached is None:
+                # Ranking nothing wouldn't go through the matches
+                self.search(query, 1, cancelled)
+                cached = self._cache[normalize(query)]
+
+            return len(cached[0])
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = SEARCH_RESULT_LIMIT,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> List[SearchMatch]:
+        """
+        Fuzzyfind accounts matching `query`. Returns the same accounts as `fuzzyfind_account_by_field`
+
+        :param str query: the string which the fuzzy matching is done with
+        :param Optional[int] limit: number of matches to return. Returns every match if None
+        :param Optional[Callable[[], bool]] cancelled: Checked while searching, which stops once it returns True.
+            Nothing is cached for a cancelled search
+        :return: the best matches, best match first
+        :rtype: List[SearchMatch]
+        :raises SearchCancelled: if the search was cancelled
+        """
+        with self._lock:
+            return self._search(query, limit, cancelled)
+
+    def _search(
+        self,
+        query: str,
+        limit: Optional[int],
+        cancelled: Optional[Callable[[], bool]],
+    ) -> List[SearchMatch]:
+        normalized = normalize(query)
+        cached = self._cached(normalized)
+        if cached is not None and limit is not None and len(cached[1]) >= limit:
+            return cached[1][:limit]
+        if cached is not None and len(cached[1]) == len(cached[0]):
+            return cached[1]  # Every match is already ranked
+
+        rows: Optional[List[int]] = None
+
+        if cached is not None:
+            rows = cached[0]
+        else:
+            # Every match of a query is also a match of its prefixes, so only the matches
+            # of the longest cached prefix need to be searched. Prefixes are taken of the normalized query,
+            # since normalizing a prefix of the query (e.g. "cafe" of "cafe\u0301") doesn't always give one
+            for end in range(len(normalized) - 1, -1, -1):
+                prefix_results = self._cached(normalized[:end])
+                if prefix_results is not None:
+                    rows = prefix_results[0]
+                    break
+
+        if rows is None:
+            rows = self._index.candidates(self._fields, normalized)
+
+        matched: List[int] = []
+
+        def record(matches: Iterator[FieldMatch]) -> Iterator[FieldMatch]:
+            # Only the rows of every match are kept. The matches themselves are dropped
+            # as soon as they can't make the top `limit`
+            for match in matches:
+                matched.append(match[2])
+                yield match
+
+        if cancelled is not None:
+            rows = _check_cancelled(rows, cancelled)  # type: ignore
+
+        matches = self._index.match(self._fields, normalized, rows)
+        best = _to_search_matches(self._corpus, best_matches(record(matches), limit))
+
+        self._cache[normalized] = (matched, best)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+        return best
 
 
 def _default_if_empty(s: Optional[str]) -> str:
@@ -40,27 +257,49 @@ def _highlight_text(s: str) -> str:
     return f"[green]{s}[/green]"
 
 
+def _highlight_matches(s: str, positions: List[int], highlighted: bool) -> "Text":
+    """
+    Returns s with the characters at positions of normalize(s) highlighted, as matched by a fuzzy search
+    """
+    from rich.text import Text
+
+    text = Text(s, style="green" if highlighted else "")
+    for position in original_positions(s, positions):
+        if position < len(s):
+            text.stylize("bold yellow", position, position + 1)
+
+    return text
+
+
 def create_search_table(
     accounts: List[Account],
     highlighted_row: Optional[int] = None,
     show_ids: bool = False,
-) -> Table:
+    matches: Optional[List[SearchMatch]] = None,
+    footer: Optional[str] = None,
+) -> "Table":
     """
     Creates a rich table to format the search results
 
     :param List[Account] accounts: List of accounts to format
     :param Optional[int] highlighted_row: Row of table to be highlighted
     :param bool show_ids: Indicates whether to display the IDs. Defaults to False
+    :param Optional[List[SearchMatch]] matches: Search matches of the accounts, in the same order.
+        The matched characters are highlighted
+    :param Optional[str] footer: Text shown under the table
     :return: The formatted table
     :rtype: Table
     """
-    panel_table = Table()
-    panel_table.add_column("Username")
-    panel_table.add_column("Service")
-    panel_table.add_column("URL")
+    from rich.table import Table
+
+    # Every account takes up exactly one line, so a number of rows always fits in the same height
+    panel_table = Table(caption=footer)
+    panel_table.add_column("Username", no_wrap=True)
+    panel_table.add_column("Service", no_wrap=True)
+    panel_table.add_column("URL", no_wrap=True)
 
     if show_ids:
-        panel_table.add_column("ID", style="bright_black")
+        panel_table.add_column("ID", style="bright_black", no_wrap=True)
 
     for idx, account in enumerate(accounts):
         username = _default_if_empty(account.username)
@@ -74,9 +313,20 @@ def create_search_table(
             url = _highlight_text(url)
             id = _highlight_text(account.id)
 
+        cells: List["str | Text"] = [username, service, url]
+
+        if matches is not None:
+            match = matches[idx]
+            value = accessor_mapping[match.field](account)
+
+            if value is not None:
+                cells[SEARCH_FIELDS.index(match.field)] = _highlight_matches(
+                    value, match.positions, idx == highlighted_row
+                )
+
         if show_ids:
-            panel_table.add_row(username, service, url, id)
-        else:
-            panel_table.add_row(username, service, url)
+            cells.append(id)
+
+        panel_table.add_row(*cells)
 
     return panel_table
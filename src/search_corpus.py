@@ -0,0 +1,88 @@
+import unicodedata
+from typing import Callable, Dict, List, Optional
+from .accounts.account import Account, AccountFields
+
+accessor_mapping: dict[AccountFields, Callable[[Account], Optional[str]]] = {
+    AccountFields.USERNAME: lambda account: account.username,
+    AccountFields.SERVICE: lambda account: account.service,
+    AccountFields.URL: lambda account: account.url,
+}
+
+# Fields searched when searching by every field
+SEARCH_FIELDS = list(accessor_mapping)
+
+
+def normalize(s: str) -> str:
+    """
+    Normalizes s for searching, so text matches regardless of case and of how its unicode characters are composed
+
+    :param str s: string to normalize
+    :return: the NFKC normalized, casefolded string
+    :rtype: str
+    """
+    if s.isascii():
+        return s.lower()  # Same as normalizing, but much faster
+
+    return unicodedata.normalize("NFKC", s).casefold()
+
+
+def original_positions(s: str, positions: List[int]) -> List[int]:
+    """
+    Maps positions in normalize(s) back to positions in s, for highlighting matched characters.
+    Normalizing can turn one character into several (e.g. "ß" into "ss"), and matching any of them matches the character
+
+    :param str s: string which was normalized
+    :param List[int] positions: positions in the normalized string
+    :return: the positions of the corresponding characters of s
+    :rtype: List[int]
+    """
+    if s.isascii():
+        return positions
+
+    # Position in the normalized string -> position in s. Normalizing prefixes of s,
+    # rather than each character, keeps combining characters with the character they combine into
+    origins: List[int] = []
+    for position in range(len(s)):
+        length = len(normalize(s[: position + 1]))
+        origins.extend([position] * (length - len(origins)))
+
+    return sorted(
+        {origins[position] for position in positions if position < len(origins)}
+    )
+
+
+class SearchCorpus:
+    """
+    Normalized searchable fields of a list of accounts, computed once when the vault is loaded.
+    Each field is a list parallel to `accounts`, so row i of every field belongs to accounts[i],
+    and None where the account has no value for the field
+    """
+
+    def __init__(self, accounts: List[Account]):
+        self.accounts: List[Account] = []
+        self.fields: Dict[AccountFields, List[Optional[str]]] = {
+            AccountFields.USERNAME: [],
+            AccountFields.SERVICE: [],
+            AccountFields.URL: [],
+        }
+
+        self.extend(accounts)
+
+    def extend(self, accounts: List[Account]):
+        """
+        Adds accounts to the end of the corpus, e.g. as they are loaded
+        """
+        usernames = self.fields[AccountFields.USERNAME]
+        services = self.fields[AccountFields.SERVICE]
+        urls = self.fields[AccountFields.URL]
+
+        for account in accounts:
+            username, service, url = account.username, account.service, account.url
+            usernames.append(normalize(username) if username is not None else None)
+            services.append(normalize(service) if service is not None else None)
+            urls.append(normalize(url) if url is not None else None)
+
+        self.accounts.extend(accounts)
+
+    def __len__(self) -> int:
+        return len(self.accounts)
@@ -0,0 +1,169 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .accounts.account import AccountFields
+from .search_corpus import SearchCorpus
+from .utils.fuzzy_utils import fuzzy_match
+
+ZERO, ONE = b"01"
+
+# Added to the score of a match depending on the field it was found in, when searching by several fields.
+# A service is what people usually look accounts up by, while URLs are long and match almost anything
+FIELD_BONUS: dict[AccountFields, int] = {
+    AccountFields.SERVICE: 16,
+    AccountFields.USERNAME: 8,
+    AccountFields.URL: 0,
+}
+
+# A match of an account: (-score, length of the matched field, row of the account, matched positions, matched field)
+# Sorting these puts the best match first, like fuzzy_utils.RankedMatch
+FieldMatch = Tuple[int, int, int, List[int], AccountFields]
+
+
+class SearchIndex:
+    """
+    Inverted index from every character to the rows of a search corpus containing it in each field.
+    A fuzzy match contains every character of the query, so only the rows containing all of them need to be matched.
+    The postings of `fields` are built right away, and kept up to date by `extend`, so the first query doesn't
+    build them. Other fields are indexed the first time they're searched
+    """
+
+    def __init__(self, corpus: SearchCorpus, fields: Iterable[AccountFields] = ()):
+        self.corpus = corpus
+        self.keys = corpus.fields
+        self._postings: Dict[AccountFields, Dict[str, int]] = {}
+
+        for field in fields:
+            self._field_postings(field)
+
+    def _build_postings(self, field: AccountFields, start: int) -> Dict[str, int]:
+        """
+        Builds the postings of the rows of field from `start` onwards
+        """
+        keys = self.keys[field]
+        bits: Dict[str, bytearray] = {}
+        for row in range(start, len(keys)):
+            key = keys[row]
+            if key is None:
+                continue
+            for char in set(key):
+                row_bits = bits.get(char)
+                if row_bits is None:
+                    bits[char] = row_bits = bytearray(b"0" * (len(keys) - start))
+                row_bits[row - start] = ONE
+
+        return {
+            char: int(row_bits[::-1], 2) << start for char, row_bits in bits.items()
+        }
+
+    def _field_postings(self, field: AccountFields) -> Dict[str, int]:
+        """
+        Returns the postings of field, building them the first time they're needed.
+        Postings are bitsets of rows, stored as ints, with the bit of row i set if its value contains the character.
+        Ints are compact and `&` / `|` on them intersect and merge rows in C
+        """
+        postings = self._postings.get(field)
+        if postings is None:
+            postings = self._postings[field] = self._build_postings(field, 0)
+
+        return postings
+
+    def extend(self, start: int):
+        """
+        Indexes the rows added to the corpus from `start` onwards
+        """
+        for field, postings in self._postings.items():
+            for char, rows in self._build_postings(field, start).items():
+                postings[char] = postings.get(char, 0) | rows
+
+    def _present(self, field: AccountFields) -> int:
+        """
+        Returns the bitset of the rows with a value for field
+        """
+        keys = self.keys[field]
+        return int(
+            bytes(ONE if key is not None else ZERO for key in reversed(keys)) or b"0", 2
+        )
+
+    def candidates(self, fields: List[AccountFields], query: str) -> List[int]:
+        """
+        Finds the rows which can fuzzy match query in any of fields, using the inverted index
+
+        :param List[AccountFields] fields: fields to search in
+        :param str query: normalized query
+        :return: the candidate rows, in order
+        :rtype: List[int]
+        """
+        rows = 0
+
+        for field in fields:
+            if query == "":
+                rows |= self._present(field)
+                continue
+
+            postings = self._field_postings(field)
+            field_rows = -1  # Every bit set
+            for char in set(query):
+                field_rows &= postings.get(char, 0)
+                if field_rows == 0:
+                    break
+
+            rows |= field_rows
+
+        return [bit.start() for bit in re.finditer("1", format(rows, "b")[::-1])]
+
+    def match(
+        self, fields: List[AccountFields], query: str, rows: Iterable[int]
+    ) -> Iterator[FieldMatch]:
+        """
+        Fuzzy matches query against the fields of each row. An account matches with its best field,
+        weighted by FIELD_BONUS when searching by several fields
+
+        :param List[AccountFields] fields: fields to search in
+        :param str query: normalized query
+        :param rows: rows to match
+        :return: the matching rows, in the order they were given
+        :rtype: Iterator[FieldMatch]
+        """
+        if len(fields) == 1:
+            field = fields[0]
+            keys = self.keys[field]
+
+            for row in rows:
+                key = keys[row]
+                if key is None:
+                    continue
+                match = fuzzy_match(query, key)
+                if match is not None:
+                    yield (-match[0], len(key), row, match[1], field)
+            return
+
+        field_keys = [(field, self.keys[field], FIELD_BONUS[field]) for field in fields]
+
+        if query == "":
+            # Everything matches an empty query, with nothing to score but the fields
+            field_keys.sort(key=lambda field_key: -field_key[2])
+            for row in rows:
+                for field, keys, bonus in field_keys:
+                    key = keys[row]
+                    if key is not None:
+                        yield (-bonus, len(key), row, [], field)
+                        break
+            return
+
+        for row in rows:
+            best: Optional[FieldMatch] = None
+
+            for field, keys, bonus in field_keys:
+                key = keys[row]
+                if key is None:
+                    continue
+                match = fuzzy_match(query, key)
+                if match is None:
+                    continue
+
+                field_match = (-match[0] - bonus, len(key), row, match[1], field)
+                if best is None or field_match[:2] < best[:2]:
+                    best = field_match
+
+            if best is not None:
+                yield best
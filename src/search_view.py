@@ -0,0 +1,198 @@
+from typing import Callable, List, Optional, Tuple
+from rich.console import Group
+
+from .accounts.account import Account
+from .constants.numbers import SEARCH_VIEW_CHROME_LINES
+from .search import SearchMatch, SearchSession, create_search_table
+
+SEARCH_PROMPT = (
+    ":magnifying_glass_tilted_right: [yellow]Search[/yellow] (Enter to Confirm): "
+)
+
+
+class SearchView:
+    """
+    State of the interactive search screen: the query, the highlighted result, and the window of results
+    which fit on the screen. Only the results in the window are ranked and rendered,
+    so a redraw costs the same however many accounts match
+    """
+
+    def __init__(self, session: SearchSession, height: int, show_ids: bool = False):
+        """
+        :param SearchSession session: Search through the accounts
+        :param int height: Height of the terminal, in lines
+        :param bool show_ids: Indicates whether to display the IDs. Defaults to False
+        """
+        self.session = session
+        self.show_ids = show_ids
+        self.query = ""
+        self.highlighted_row = 0  # Index of the highlighted result, out of every result
+        self.first_row = 0  # Index of the first result in the window
+        self.window_size = 1
+        self.total = 0
+        self.loading = False  # Whether accounts are still being added to the session
+        self._matches: List[SearchMatch] = []
+        self._rendered: Optional[Tuple] = (
+            None  # What was on screen after the last render
+        )
+
+        self.resize(height)
+        self.search("")
+
+    def _fill(self):
+        """
+        Ranks enough results to fill the window
+        """
+        end = self.first_row + self.window_size
+        if len(self._matches) < min(end, self.total):
+            self._matches = self.session.search(self.query, end)
+
+    def _scroll(self):
+        """
+        Clamps the highlighted row to the results, and scrolls the window so it's visible
+        """
+        self.highlighted_row = max(0, min(self.highlighted_row, self.total - 1))
+
+        if self.highlighted_row < self.first_row:
+            self.first_row = self.highlighted_row
+        elif self.highlighted_row >= self.first_row + self.window_size:
+            self.first_row = self.highlighted_row - self.window_size + 1
+
+        self._fill()
+
+    def resize(self, height: int):
+        """
+        Fits the window to a terminal `height` lines tall
+        """
+        self.window_size = max(1, height - SEARCH_VIEW_CHROME_LINES)
+        self._scroll()
+
+    def results(
+        self,
+        query: str,
+        cancelled: Optional[Callable[[], bool]] = None,
+        keep_position: bool = False,
+    ) -> Tuple[int, List[SearchMatch]]:
+        """
+        Searches for query without changing the view, so it can run in the background
+
+        :param str query: the string which the fuzzy matching is done with
+        :param Optional[Callable[[], bool]] cancelled: Checked while searching, which stops once it returns True
+        :param bool keep_position: Whether the results fill the current window, instead of the window from
+            the first result. Same as for show
+        :return: the number of results, and the results filling the window
+        :rtype: Tuple[int, List[SearchMatch]]
+        :raises SearchCancelled: if the search was cancelled
+        """
+        limit = self.window_size + (self.first_row if keep_position else 0)
+        matches = self.session.search(query, limit, cancelled)
+        # Counted from the rows the search kept, without matching them again
+        return (self.session.count(query, cancelled), matches)
+
+    def show(
+        self,
+        query: str,
+        total: int,
+        matches: List[SearchMatch],
+        keep_position: bool = False,
+    ):
+        """
+        Shows the results of query, as returned by results, from the first result
+        With keep_position, the same row stays highlighted instead, e.g. when more accounts were loaded
+        """
+        if not keep_position:
+            self.highlighted_row = 0
+            self.first_row = 0
+
+        self.query = query
+        self.total = total
+        self._matches = matches
+        self._scroll()
+
+    def search(self, query: str):
+        """
+        Shows the results of query, from the first result
+        """
+        self.show(query, *self.results(query))
+
+    def move(self, rows: int):
+        """
+        Moves the highlight down by `rows` (up if negative), scrolling to keep it visible
+        """
+        self.highlighted_row += rows
+        self._scroll()
+
+    def page(self, pages: int):
+        """
+        Moves the highlight and the window down by `pages` screens (up if negative)
+        """
+        self.highlighted_row += pages * self.window_size
+        last_page = max(0, self.total - self.window_size)
+        self.first_row = max(
+            0, min(self.first_row + pages * self.window_size, last_page)
+        )
+        self._scroll()
+
+    def selected(self) -> Optional[Account]:
+        """
+        Returns the highlighted account, or None if nothing matches
+        """
+        if self.highlighted_row >= len(self._matches):
+            return None
+
+        return self._matches[self.highlighted_row].account
+
+    def visible(self) -> List[SearchMatch]:
+        """
+        Returns the results in the window
+        """
+        return self._matches[self.first_row : self.first_row + self.window_size]
+
+    def _screen(self) -> Tuple:
+        """
+        Returns everything the search screen shows, to tell whether it has to be redrawn
+        """
+        return (
+            self.query,
+            self.show_ids,
+            self.highlighted_row,
+            self.first_row,
+            self.total,
+            self.visible(),
+            self.loading and len(self.session),
+        )
+
+    def render_if_changed(self) -> Optional[Group]:
+        """
+        Renders the search screen if it changed since it was last rendered
+
+        :return: The rendered screen, or None if what's on screen is still up to date
+        :rtype: Optional[Group]
+        """
+        if self._screen() == self._rendered:
+            return None
+
+        return self.render()
+
+    def render(self) -> Group:
+        """
+        Renders the prompt and the results in the window
+        """
+        self._rendered = self._screen()
+        matches = self.visible()
+        footer = (
+            f"{self.highlighted_row + 1} of {self.total} results"
+            if self.total > 0
+            else "No results"
+        )
+        if self.loading:
+            footer += f" (loading, {len(self.session)} accounts so far)"
+        table = create_search_table(
+            [match.account for match in matches],
+            self.highlighted_row - self.first_row,
+            self.show_ids,
+            matches,
+            footer,
+        )
+
+        return Group(f"{SEARCH_PROMPT}{self.query}_", table)
@@ -1,7 +1,8 @@
-from Cryptodome.Protocol.KDF import scrypt
-from Cryptodome.Random import get_random_bytes
-
+# Cryptodome is imported by the functions which use it, since importing it slows down every command
 from ..constants.numbers import KEY_SIZE
+from ..profiling import count, span
+
+ENTRY_KEY_CONTEXT = b"password-inator entry key"
 
 
 def create_salt(size: int) -> str:
@@ -12,6 +13,8 @@ def create_salt(size: int) -> str:
     :return: hex representation of salt
     :rtype: str
     """
+    from Cryptodome.Random import get_random_bytes
+
     return get_random_bytes(size).hex()
 
 
@@ -24,4 +27,27 @@ def create_key(password: str, salt: str) -> bytes:
     :return: The 32-bit AES key
     :rtype: bytes
     """
-    return scrypt(password, salt, KEY_SIZE, N=2**14, r=8, p=1)  # type: ignore
+    from Cryptodome.Protocol.KDF import scrypt
+
+    count("scrypt calls")
+    with span("scrypt"):
+        return scrypt(password, salt, KEY_SIZE, N=2**14, r=8, p=1)  # type: ignore
+
+
+def derive_subkey(master_key: bytes, salt: str) -> bytes:
+    """
+    Derives a per-entry AES key from the vault's master key using HKDF-SHA256.
+    Unlike `create_key` this is cheap, so it can be run once per entry
+
+    :param bytes master_key: master key created with `create_key`
+    :param str salt: salt of the entry
+    :return: The 32-bit AES key
+    :rtype: bytes
+    """
+    from Cryptodome.Hash import SHA256
+    from Cryptodome.Protocol.KDF import HKDF
+
+    count("hkdf calls")
+    return HKDF(  # type: ignore
+        master_key, KEY_SIZE, salt.encode("utf-8"), SHA256, context=ENTRY_KEY_CONTEXT
+    )
@@ -0,0 +1,93 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO
+
+from ..profiling import count, span
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w"):
+    """
+    Opens a temporary file next to `path` for writing. When the block exits without an error,
+    the temporary file is atomically swapped in place of `path`. Otherwise it is removed and `path` is left untouched
+
+    :param str path: path of the file to write
+    :param str mode: mode to open the temporary file with, "w" or "wb"
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+
+    try:
+        with span("write"), os.fdopen(fd, mode) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+            count("bytes written", os.fstat(file.fileno()).st_size)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _lock_file(file: BinaryIO, blocking: bool) -> None:
+    """
+    Locks the first byte of file, which is at its start
+
+    :raises OSError: if the lock isn't free and blocking is False
+    """
+    if os.name == "nt":
+        import msvcrt
+
+        msvcrt.locking(
+            file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1
+        )
+    else:
+        import fcntl
+
+        fcntl.flock(
+            file.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        )
+
+
+def _unlock_file(file: BinaryIO) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: str, blocking: bool = True):
+    """
+    Holds an exclusive lock on the file given by path, created if it doesn't exist, until the block exits.
+    The lock belongs to the process, so it is released if the process dies
+
+    :param str path: path of the lock file
+    :param bool blocking: wait until no other process holds the lock. Otherwise yield False right away if one does
+    :return: True iff the lock is held
+    """
+    with open(path, "a+b") as file:
+        file.seek(0)
+
+        try:
+            _lock_file(file, blocking)
+        except OSError:
+            if blocking:
+                raise
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            file.seek(0)
+            _unlock_file(file)
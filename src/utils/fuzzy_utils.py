@@ -0,0 +1,87 @@
+import heapq
+from typing import Iterable, List, Optional, Tuple, TypeVar
+
+# Scores of a fuzzy match. A match scores MATCH_SCORE for every character,
+# with bonuses for characters that are consecutive or start a word, and penalties for gaps between characters
+MATCH_SCORE = 16
+CONSECUTIVE_BONUS = 8
+WORD_START_BONUS = 8
+GAP_START_PENALTY = 3
+GAP_EXTENSION_PENALTY = 1
+MAX_LEADING_PENALTY = 8
+
+WORD_SEPARATORS = " _-./@:"
+
+# Score and matched positions of a fuzzy match
+Match = Tuple[int, List[int]]
+# A match of one of many candidates: (-score, length of the candidate, index of the candidate, matched positions)
+# Sorting these puts the best match first. Matches with the same score are ordered by length, then by index
+RankedMatch = Tuple[int, int, int, List[int]]
+# Any match which sorts best first, like RankedMatch
+Ranked = TypeVar("Ranked", bound=tuple)
+
+
+def fuzzy_match(query: str, text: str) -> Optional[Match]:
+    """
+    Matches query against text as a subsequence. Matching is case sensitive,
+    so both should already be normalized (e.g. lowercased) the same way
+
+    :param str query: characters to find in text, in order
+    :param str text: text to search in
+    :return: the score of the tightest match (higher is better) and the positions of the matched characters,
+        or None if text doesn't contain every character of query in order
+    :rtype: Optional[Match]
+    """
+    if query == "":
+        return (0, [])
+
+    # The leftmost occurrence of every character gives the earliest end of a match.
+    # This stops at the first character that can't be found
+    end = -1
+    for char in query:
+        end = text.find(char, end + 1)
+        if end < 0:
+            return None
+
+    # Going back from that end gives the latest start, which is the tightest match
+    positions = [0] * len(query)
+    position = end + 1
+    for i in range(len(query) - 1, -1, -1):
+        position = text.rfind(query[i], 0, position)
+        positions[i] = position
+
+    score = MATCH_SCORE * len(query) - min(positions[0], MAX_LEADING_PENALTY)
+    previous = -1
+
+    for position in positions:
+        if position == previous + 1 and previous >= 0:
+            score += CONSECUTIVE_BONUS
+        elif previous >= 0:
+            score -= GAP_START_PENALTY + GAP_EXTENSION_PENALTY * (
+                position - previous - 2
+            )
+
+        if position == 0 or text[position - 1] in WORD_SEPARATORS:
+            score += WORD_START_BONUS
+
+        previous = position
+
+    return (score, positions)
+
+
+def best_matches(
+    matches: Iterable[Ranked], limit: Optional[int] = None
+) -> List[Ranked]:
+    """
+    Ranks matches, best first. Only the best `limit` matches are kept, in a heap,
+    so ranking a few matches out of many doesn't sort all of them
+
+    :param matches: matches to rank, e.g. RankedMatch
+    :param Optional[int] limit: number of matches to return. Returns every match if None
+    :return: the best matches
+    :rtype: List[Ranked]
+    """
+    if limit is None:
+        return sorted(matches)
+
+    return heapq.nsmallest(limit, matches)
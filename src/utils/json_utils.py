@@ -0,0 +1,106 @@
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+from ..constants.numbers import JSON_READ_SIZE
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters which can follow an item of an array
+_ITEM_ENDS = [",", "]", " ", "\t", "\n", "\r"]
+
+
+class _Reader:
+    """
+    Buffers a text file, reading it in chunks as more of it is needed
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def read_more(self) -> bool:
+        """
+        Appends the next chunk of the file to the buffer, dropping what was already parsed.
+        Reads at least as much as is buffered, so a value spanning many chunks is parsed a bounded number of times
+
+        :return: False iff the end of the file was reached
+        :rtype: bool
+        """
+        if self.eof:
+            return False
+
+        chunk = self.file.read(max(self.chunk_size, len(self.buffer) - self.position))
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        self.eof = chunk == ""
+        return not self.eof
+
+    def skip_whitespace(self) -> str:
+        """
+        Skips whitespace, reading more of the file if needed
+
+        :return: the next character, or "" at the end of the file
+        :rtype: str
+        """
+        while True:
+            self.position = _WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or not self.read_more():
+                return self.buffer[self.position : self.position + 1]
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.position)
+
+
+def iter_json_array(file: TextIO, chunk_size: int = JSON_READ_SIZE) -> Iterator[Any]:
+    """
+    Yields the items of the json array in file one at a time, as they are parsed.
+    Only the item being parsed is held in memory, rather than the whole document
+
+    :param TextIO file: file containing a json array
+    :param int chunk_size: number of characters read at a time
+    :return: the items of the array, in order
+    :rtype: Iterator[Any]
+    :raises JSONDecodeError: if the file isn't a valid json array
+    """
+    decoder = json.JSONDecoder()
+    reader = _Reader(file, chunk_size)
+
+    if reader.skip_whitespace() != "[":
+        raise reader.error("Expecting '['")
+    reader.position += 1
+
+    if reader.skip_whitespace() == "]":
+        reader.position += 1
+    else:
+        while True:
+            try:
+                item, end = decoder.raw_decode(reader.buffer, reader.position)
+                # A number cut off by the end of the buffer (e.g. "1.5e" of "1.5e10") continues in the next chunk,
+                # so items are only complete once what follows them was read
+                complete = reader.eof or reader.buffer[end : end + 1] in _ITEM_ENDS
+            except json.JSONDecodeError:
+                complete = False
+                if reader.eof:
+                    raise
+
+            if not complete:
+                reader.read_more()
+                continue
+
+            reader.position = end
+            yield item
+
+            separator = reader.skip_whitespace()
+            reader.position += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                reader.position -= 1
+                raise reader.error("Expecting ',' delimiter")
+            reader.skip_whitespace()
+
+    if reader.skip_whitespace() != "":
+        raise reader.error("Extra data")
@@ -1,6 +1,7 @@
 import random
 import secrets
-from Cryptodome.Protocol.KDF import scrypt
+
+from ..profiling import count, span
 
 special_characters = "~`!@#$%^&*()_-+={[}]|:;<,>.?/"
 digits = "0123456789"
@@ -47,4 +48,8 @@ def hash_password(password: str, salt: str) -> str:
     :return: hex representation of the hash
     :rtype: str
     """
-    return scrypt(password, salt, 32, N=2**14, r=8, p=1).hex()  # type: ignore
+    from Cryptodome.Protocol.KDF import scrypt  # Slow to import, see aes_utils
+
+    count("scrypt calls")
+    with span("scrypt"):
+        return scrypt(password, salt, 32, N=2**14, r=8, p=1).hex()  # type: ignore
@@ -0,0 +1,187 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+from src.accounts.account import Account
+from src.accounts.file_manager import save_account_to_file
+from src.accounts.password import Password
+from src.agent import client
+from src.agent.client import (
+    agent_encrypt,
+    agent_get_password,
+    agent_request,
+    is_agent_running,
+    stop_agent,
+)
+from src.agent.server import Agent
+from src.constants import paths as PATHS
+from src.constants.strings import AGENT_LOCKED_ERROR
+from src.encryption.master_password import save_master_password
+from src.encryption.vault_key import lock, unlock
+from src.main import cli
+
+MASTER_PASSWORD = "correct horse battery staple"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "the agent needs Unix sockets")
+class TestAgent(unittest.TestCase):
+    def setUp(self):
+        # Cleanups run in reverse, so agents started by tests are stopped before leaving the directory
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        self.addCleanup(lock)
+        os.chdir(tmp_dir.name)
+        save_master_password(MASTER_PASSWORD)
+
+    def test_detach_returns_immediately(self):
+        # The output is read until the detached agent closes it, so it must not keep it open
+        result = subprocess.run(
+            [sys.executable, "-m", "src.main", "agent", "-d", "-p", MASTER_PASSWORD],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            env={**os.environ, "PYTHONPATH": ROOT},
+        )
+        self.addCleanup(stop_agent)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Agent started", result.stdout)
+        # The agent derives the master key before listening
+        deadline = time.monotonic() + 5
+        while not is_agent_running() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertTrue(is_agent_running())
+
+    def serve(self, **kwargs) -> Agent:
+        agent = Agent(unlock(MASTER_PASSWORD), PATHS.AGENT_SOCKET_PATH, **kwargs)
+        thread = threading.Thread(target=agent.serve, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(stop_agent)
+
+        deadline = time.monotonic() + 5
+        while not os.path.exists(PATHS.AGENT_SOCKET_PATH):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+        return agent
+
+    def test_handle_request(self):
+        account = Account(None, "user", "service")
+        save_account_to_file("accounts.json", account)
+        agent = Agent(unlock(MASTER_PASSWORD), PATHS.AGENT_SOCKET_PATH, 60)
+
+        self.assertEqual(agent.handle_request({"op": "ping"}), {"ok": True})
+
+        response = agent.handle_request({"op": "encrypt", "plaintext": "hunter2"})
+        self.assertTrue(response["ok"])
+        account.password = Password.from_json_serilizable(response["password"])
+        save_account_to_file("accounts.json", account)
+        self.assertEqual(
+            agent.handle_request({"op": "lookup", "id": account.id}),
+            {"ok": True, "password": "hunter2"},
+        )
+
+        self.assertFalse(agent.handle_request({"op": "lookup", "id": "missing"})["ok"])
+        self.assertFalse(agent.handle_request({"op": "unknown"})["ok"])
+        self.assertFalse(agent.handle_request({"op": "encrypt"})["ok"])
+
+    def test_locks_when_master_password_changes(self):
+        agent = Agent(unlock(MASTER_PASSWORD), PATHS.AGENT_SOCKET_PATH, 60)
+        agent.running = True
+        save_master_password("changed")
+
+        self.assertEqual(
+            agent.handle_request({"op": "encrypt", "plaintext": "hunter2"}),
+            {"ok": False, "error": AGENT_LOCKED_ERROR},
+        )
+        self.assertFalse(agent.running)
+
+    def test_client(self):
+        self.serve(idle_timeout=60)
+        account = Account(agent_encrypt("hunter2"), "user", "service")
+        save_account_to_file("accounts.json", account)
+
+        self.assertTrue(is_agent_running())
+        self.assertEqual(account.get_password(MASTER_PASSWORD), "hunter2")
+        self.assertEqual(agent_get_password(account.id), "hunter2")
+        with self.assertRaises(ValueError):
+            agent_get_password("missing")
+
+        self.assertTrue(stop_agent())
+        self.assertFalse(is_agent_running())
+
+    def test_client_without_agent(self):
+        self.assertIsNone(agent_request({"op": "ping"}))
+        self.assertIsNone(agent_encrypt("hunter2"))
+        self.assertIsNone(agent_get_password("id"))
+        self.assertFalse(stop_agent())
+
+    def test_second_agent_refused(self):
+        self.serve(idle_timeout=60)
+
+        with self.assertRaises(FileExistsError):
+            Agent(unlock(MASTER_PASSWORD), PATHS.AGENT_SOCKET_PATH, 60).serve()
+
+        result = CliRunner().invoke(cli, ["agent", "-p", MASTER_PASSWORD])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("already running", result.output)
+
+        # The first agent still owns the socket
+        self.assertTrue(is_agent_running())
+        self.assertTrue(stop_agent())
+
+    def test_stale_socket_replaced(self):
+        # Left behind by an agent which was killed
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(PATHS.AGENT_SOCKET_PATH)
+
+        agent = Agent(unlock(MASTER_PASSWORD), PATHS.AGENT_SOCKET_PATH, 60)
+        thread = threading.Thread(target=agent.serve, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(stop_agent)
+
+        deadline = time.monotonic() + 5
+        while not is_agent_running():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_agent_of_other_user_ignored(self):
+        self.serve(idle_timeout=60)
+
+        with mock.patch.object(client.os, "getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(agent_request({"op": "ping"}))
+            self.assertIsNone(agent_encrypt("hunter2"))
+
+        self.assertTrue(is_agent_running())
+
+    def test_silent_client_does_not_block_agent(self):
+        self.serve(idle_timeout=60, client_timeout=0.2)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent:
+            silent.connect(PATHS.AGENT_SOCKET_PATH)
+            self.assertTrue(is_agent_running())
+
+    def test_idle_timeout(self):
+        self.serve(idle_timeout=0.3, client_timeout=0.2)
+
+        # A client which connects and never sends anything doesn't keep the agent alive
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent:
+            silent.connect(PATHS.AGENT_SOCKET_PATH)
+            deadline = time.monotonic() + 5
+            while os.path.exists(PATHS.AGENT_SOCKET_PATH):
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.05)
+
+        self.assertFalse(is_agent_running())
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.accounts import binary_vault, file_manager
+from src.accounts.account import Account
+from src.accounts.password import Password
+from src.accounts.store import AccountStore
+
+
+class TestBinaryVault(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "accounts.vault")
+
+        self.accounts = [
+            Account(
+                Password(b"\x00secret", "ab" * 32, b"n" * 16, 2),
+                "user1",
+                "service",
+                "www.example.com",
+            ),
+            Account(None, "ùsér ♪", None, ""),
+            Account(Password(b"legacy", "not hex", b"nonce"), None, "other"),
+        ]
+        binary_vault.write_vault(self.path, self.accounts)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assertAccountsEqual(self, loaded, expected):
+        for a, b in zip(loaded, expected):
+            self.assertEqual(a.id, b.id)
+            self.assertEqual(a.to_json_serializable(), b.to_json_serializable())
+        self.assertEqual(len(loaded), len(expected))
+
+    def test_round_trip(self):
+        self.assertAccountsEqual(binary_vault.read_accounts(self.path), self.accounts)
+
+    def test_passwords_are_lazy(self):
+        with mock.patch.object(binary_vault, "_decode_password") as decode:
+            decode.return_value = None
+            loaded = binary_vault.read_accounts(self.path)
+            decode.assert_not_called()
+
+            loaded[0].password
+            loaded[0].password
+            decode.assert_called_once()
+
+    def test_read_account(self):
+        for account in self.accounts:
+            self.assertAccountsEqual(
+                [binary_vault.read_account(self.path, account.id)], [account]
+            )
+
+        self.assertIsNone(binary_vault.read_account(self.path, "0" * 32))
+        self.assertIsNone(binary_vault.read_account(self.path, "missing"))
+
+    def test_read_account_from_large_vault(self):
+        accounts = [Account(None, f"user{i}") for i in range(500)]
+        binary_vault.write_vault(self.path, accounts)
+
+        for account in accounts[::7]:
+            self.assertEqual(
+                binary_vault.read_account(self.path, account.id).username,
+                account.username,
+            )
+        self.assertIsNone(binary_vault.read_account(self.path, "f" * 32))
+
+    def test_not_a_binary_vault(self):
+        with open(self.path, "wb") as f:
+            f.write(b"[]\n\n\n\n\n\n\n\n")
+
+        with self.assertRaises(ValueError):
+            binary_vault.read_accounts(self.path)
+
+    def test_journal_is_applied_to_point_lookups(self):
+        store = AccountStore(self.path)
+        store.update(self.accounts[0].id, "username", "edited")
+        store.delete(self.accounts[1].id)
+        new_account = Account(None, "user4")
+        store.add(new_account)
+        store.save()
+
+        store = AccountStore(self.path)
+        self.assertEqual(store.get(self.accounts[0].id).username, "edited")
+        self.assertIsNone(store.get(self.accounts[1].id))
+        self.assertEqual(store.get(new_account.id).username, "user4")
+
+        file_manager.compact_accounts_file(self.path)
+        self.assertEqual(len(binary_vault.read_accounts(self.path)), 3)
+
+    def test_field_length_limit(self):
+        longest = Account(None, "u" * (binary_vault.NONE_LENGTH - 1))
+        binary_vault.write_vault(self.path, [longest])
+        self.assertAccountsEqual(binary_vault.read_accounts(self.path), [longest])
+
+        too_long = Account(None, None, None, "u" * binary_vault.NONE_LENGTH)
+        with self.assertRaises(ValueError):
+            binary_vault.write_vault(self.path, [too_long])
+        self.assertAccountsEqual(binary_vault.read_accounts(self.path), [longest])
+
+        # Rejected before it is written to the journal, rather than when compacting it
+        store = AccountStore(self.path)
+        store.add(too_long)
+        with self.assertRaises(ValueError):
+            store.save()
+        self.assertAccountsEqual(AccountStore.load(self.path).accounts(), [longest])
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+import unittest
+
+import click
+from click.testing import CliRunner
+
+from src.main import COMMANDS, cli
+
+
+class TestLazyCli(unittest.TestCase):
+    def test_commands(self):
+        ctx = click.Context(cli)
+
+        for name, (_, short_help) in COMMANDS.items():
+            command = cli.get_command(ctx, name)
+            self.assertEqual(command.name, name)
+            # --help shows the short help given in COMMANDS
+            self.assertEqual(command.get_short_help_str(limit=1000), short_help)
+
+    def test_help_does_not_import_commands(self):
+        # Run in a new interpreter, since other tests import the commands
+        code = (
+            "import sys\n"
+            "from click.testing import CliRunner\n"
+            "from src.main import cli\n"
+            "result = CliRunner().invoke(cli, ['--help'])\n"
+            "assert 'find-account' in result.output, result.output\n"
+            "print([name for name in sys.modules if name.startswith('src.commands.')])\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+
+        self.assertEqual(output.strip(), "['src.commands.lazy_group']")
+
+    def test_unknown_command(self):
+        result = CliRunner().invoke(cli, ["missing-command"])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("No such command", result.output)
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.accounts.account import Account
+from src.accounts.export import export_accounts
+from src.accounts.parallel import CHUNK_SIZE, decrypt_passwords, encrypt_passwords
+from src.accounts.password import Password
+from src.encryption.master_password import save_master_password
+from src.encryption.vault_key import lock, unlock
+
+MASTER_PASSWORD = "correct horse battery staple"
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+        save_master_password(MASTER_PASSWORD)
+
+        self.key = unlock(MASTER_PASSWORD)
+        self.accounts = [
+            Account(Password.from_plaintext("one", self.key), "user1", "service1"),
+            Account(None, "user2", None, "https://example.com"),
+            Account(Password.from_plaintext("three", self.key), None, "service3"),
+        ]
+
+    def tearDown(self):
+        lock()
+        os.chdir(self.old_cwd)
+        self.tmp_dir.cleanup()
+
+    def expected_rows(self):
+        return [
+            {
+                "id": account.id,
+                "username": account.username,
+                "service": account.service,
+                "url": account.url,
+                "password": password,
+            }
+            for account, password in zip(self.accounts, ["one", None, "three"])
+        ]
+
+    def test_export_jsonl(self):
+        stream = io.StringIO()
+        exported = export_accounts(self.accounts, self.key, stream, "jsonl")
+
+        self.assertEqual(exported, 3)
+        self.assertEqual(
+            [json.loads(line) for line in stream.getvalue().splitlines()],
+            self.expected_rows(),
+        )
+
+    def test_export_csv(self):
+        stream = io.StringIO()
+        export_accounts(self.accounts, self.key, stream, "csv")
+
+        stream.seek(0)
+        # csv has no None, so missing values are read back as empty strings
+        expected = [
+            {name: "" if value is None else value for name, value in row.items()}
+            for row in self.expected_rows()
+        ]
+        self.assertEqual(list(csv.DictReader(stream)), expected)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_accounts(self.accounts, self.key, io.StringIO(), "xml")
+
+    def test_passwords_across_processes(self):
+        # More passwords than are sent to a worker at once, so they're spread across processes
+        plaintexts = [
+            None if i % 10 == 0 else f"password{i}" for i in range(CHUNK_SIZE * 3)
+        ]
+
+        passwords = list(encrypt_passwords(plaintexts, self.key, workers=2))
+        self.assertEqual(
+            [password is None for password in passwords],
+            [plaintext is None for plaintext in plaintexts],
+        )
+
+        self.assertEqual(
+            list(decrypt_passwords(passwords, self.key, workers=2)), plaintexts
+        )
@@ -0,0 +1,180 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+from src.accounts.backends import JsonBackend
+from src.accounts.password import Password
+from src.accounts.importer import (
+    import_accounts,
+    map_columns,
+    read_account_specs,
+    read_rows,
+)
+from src.accounts.store import AccountStore
+from src.encryption.master_password import save_master_password
+from src.encryption.vault_key import lock, unlock
+from src.main import cli
+
+MASTER_PASSWORD = "correct horse battery staple"
+
+BITWARDEN_CSV = (
+    "folder,favorite,type,name,notes,fields,reprompt,login_uri,login_username,login_password,login_totp\n"
+    ",,login,GitHub,,,0,https://github.com,alice,hunter2,\n"
+    ",,login,Mail,,,0,,bob@example.com,swordfish,\n"
+    ",,,,,,,,,,\n"
+)
+
+
+class TestImporter(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+        save_master_password(MASTER_PASSWORD)
+
+    def tearDown(self):
+        lock()
+        os.chdir(self.old_cwd)
+        self.tmp_dir.cleanup()
+
+    def test_map_bitwarden_csv(self):
+        rows = read_rows(io.StringIO(BITWARDEN_CSV), "csv")
+
+        self.assertEqual(
+            map_columns(rows),
+            {
+                "username": "login_username",
+                "service": "name",
+                "url": "login_uri",
+                "password": "login_password",
+            },
+        )
+
+    def test_map_nested_json(self):
+        export = {
+            "items": [
+                {
+                    "Title": "GitHub",
+                    "login": {
+                        "username": "alice",
+                        "password": "hunter2",
+                        "uris": [{"uri": "https://github.com"}],
+                    },
+                }
+            ]
+        }
+        rows = read_rows(io.StringIO(json.dumps(export)), "json")
+
+        self.assertEqual(
+            map_columns(rows, {"url": "LOGIN.URIS.URI"}),
+            {
+                "url": "login.uris.uri",
+                "username": "login.username",
+                "service": "Title",
+                "password": "login.password",
+            },
+        )
+        self.assertEqual(rows[0]["login.uris.uri"], "https://github.com")
+
+    def test_invalid_mapping(self):
+        rows = read_rows(io.StringIO(BITWARDEN_CSV), "csv")
+
+        with self.assertRaises(ValueError):
+            map_columns(rows, {"notes": "notes"})
+        with self.assertRaises(ValueError):
+            map_columns(rows, {"password": "missing"})
+
+    def test_invalid_json(self):
+        with self.assertRaises(ValueError):
+            read_rows(io.StringIO('{"name": "GitHub"}'), "json")
+        with self.assertRaises(ValueError):
+            read_rows(io.StringIO('{"name": "GitHub"}\n{'), "jsonl")
+
+    def test_import_writes_once(self):
+        rows = read_rows(io.StringIO(BITWARDEN_CSV), "csv")
+        key = unlock(MASTER_PASSWORD)
+
+        with mock.patch.object(
+            JsonBackend, "apply", autospec=True, side_effect=JsonBackend.apply
+        ) as apply:
+            imported = import_accounts("accounts.json", rows, map_columns(rows), key)
+
+        self.assertEqual(imported, 2)
+        self.assertEqual(apply.call_count, 1)
+
+        accounts = AccountStore.load("accounts.json").accounts()
+        self.assertEqual(
+            [(account.service, account.username, account.url) for account in accounts],
+            [
+                ("GitHub", "alice", "https://github.com"),
+                ("Mail", "bob@example.com", None),
+            ],
+        )
+        self.assertEqual(
+            [account.get_password(key) for account in accounts],
+            ["hunter2", "swordfish"],
+        )
+
+    def test_read_account_specs(self):
+        specs = read_account_specs(
+            io.StringIO(
+                '{"service": "db", "username": "app", "password": "hunter2"}\n'
+                "\n"
+                '{"service": "api", "generate": 24}\n'
+                '{"service": "web", "generate": true}\n'
+            )
+        )
+
+        self.assertEqual(
+            specs[0], {"service": "db", "username": "app", "password": "hunter2"}
+        )
+        self.assertEqual(len(specs[1]["password"]), 24)
+        self.assertEqual(len(specs[2]["password"]), 16)
+
+    def test_invalid_account_specs(self):
+        for spec in [
+            '{"service": "db"}',
+            '{"service": "db", "password": "hunter2", "generate": true}',
+            '{"service": "db", "pasword": "hunter2"}',
+            '{"service": 1, "password": "hunter2"}',
+            '{"service": "db", "generate": 0}',
+            '["db"]',
+        ]:
+            with self.subTest(spec=spec):
+                with self.assertRaisesRegex(ValueError, "^Line 2"):
+                    read_account_specs(io.StringIO(f'{{"generate": true}}\n{spec}\n'))
+
+    def test_create_accounts_from_stdin(self):
+        result = CliRunner().invoke(
+            cli,
+            ["create-accounts", "--from-stdin", "-p", MASTER_PASSWORD, "-w", "1"],
+            input='{"service": "db", "password": "hunter2"}\n{"service": "api", "generate": true}\n',
+        )
+        self.assertEqual(result.exit_code, 0, result.stderr)
+
+        ids = result.stdout.split()
+        accounts = AccountStore.load("accounts.json").accounts()
+        self.assertEqual([account.id for account in accounts], ids)
+        self.assertEqual(accounts[0].get_password(MASTER_PASSWORD), "hunter2")
+
+    def test_create_accounts_with_stopped_agent(self):
+        with mock.patch(
+            "src.commands.create_accounts.is_agent_running", return_value=True
+        ), mock.patch(
+            "src.commands.create_accounts.agent_encrypt",
+            side_effect=[Password.from_plaintext("hunter2", MASTER_PASSWORD), None],
+        ):
+            result = CliRunner().invoke(
+                cli,
+                ["create-accounts", "--from-stdin"],
+                input='{"service": "db", "password": "hunter2"}\n{"service": "api", "generate": true}\n',
+            )
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.stdout, "")
+        self.assertFalse(os.path.exists("accounts.json.journal"))
@@ -0,0 +1,77 @@
+import asyncio
+import io
+import os
+import unittest
+from unittest import mock
+
+from rich.console import Console
+from rich.live import Live
+
+from src import interactive_search
+from src.accounts.account import Account, AccountFields
+from src.interactive_search import run_interactive_search
+from src.io.terminal import Terminal_Session
+from src.search import SearchSession
+from src.search_view import SearchView
+
+test_accounts = [Account(None, f"user_{i:03}", None, None) for i in range(100)]
+
+
+class TestInteractiveSearch(unittest.TestCase):
+    def run_search(self, *keys: bytes, load: bool = False):
+        controller, terminal_fd = os.openpty()
+        console = Console(file=io.StringIO(), height=20)
+        view = SearchView(
+            SearchSession(AccountFields.USERNAME, [] if load else test_accounts),
+            console.size.height,
+        )
+
+        async def type_keys():
+            for key in keys:
+                os.write(controller, key)
+                await asyncio.sleep(0.05)
+
+        async def search():
+            asyncio.get_running_loop().create_task(type_keys())
+            return await run_interactive_search(
+                view, terminal, live, console, iter(test_accounts) if load else None
+            )
+
+        try:
+            with Terminal_Session(terminal_fd) as terminal, Live(
+                view.render(), console=console, auto_refresh=False
+            ) as live:
+                return asyncio.run(asyncio.wait_for(search(), 5))
+        finally:
+            os.close(controller)
+            os.close(terminal_fd)
+
+    def test_select(self):
+        self.assertEqual(
+            self.run_search(b"user_05", b"\x1b[B\x1b[B", b"\r"),
+            test_accounts[52],
+        )
+
+    def test_exit(self):
+        self.assertIsNone(self.run_search(b"user", b"\x03"))
+
+    def test_background_search(self):
+        # Navigation keys typed right after the query wait for its results
+        with mock.patch.object(interactive_search, "SEARCH_BACKGROUND_MIN_ACCOUNTS", 0):
+            self.assertEqual(
+                self.run_search(b"user_05\x1b[B\r"),
+                test_accounts[51],
+            )
+
+    def test_loading_in_background(self):
+        # Accounts are searched as they're loaded
+        with mock.patch.object(interactive_search, "SEARCH_LOAD_BATCH_SIZE", 7):
+            self.assertEqual(
+                self.run_search(b"user_05", b"\x1b[B\x1b[B", b"\r", load=True),
+                test_accounts[52],
+            )
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()
@@ -0,0 +1,137 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.accounts import backends, file_manager, journal
+from src.accounts.account import Account
+from src.constants import paths as PATHS
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+
+        self.accounts = [
+            Account(None, "user1", "service1"),
+            Account(None, "user2", "service2"),
+        ]
+        file_manager.write_accounts_to_file(PATHS.ACCOUNT_PATH, self.accounts)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        self.tmp_dir.cleanup()
+
+    def test_save_appends_to_journal(self):
+        with open(PATHS.ACCOUNT_PATH) as f:
+            before = f.read()
+
+        new_account = Account(None, "user3")
+        file_manager.save_account_to_file(PATHS.ACCOUNT_PATH, new_account)
+
+        with open(PATHS.ACCOUNT_PATH) as f:
+            self.assertEqual(f.read(), before)
+        self.assertTrue(os.path.exists(journal.journal_path(PATHS.ACCOUNT_PATH)))
+
+        loaded = file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)
+        self.assertEqual(loaded, self.accounts + [new_account])
+
+    def test_edit_and_delete_are_replayed(self):
+        file_manager.edit_account(self.accounts[0].id, "username", "edited")
+        with mock.patch("click.confirm", return_value=True):
+            file_manager.delete_account(self.accounts[1].id, mock.Mock())
+
+        loaded = file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded[0].username, "edited")
+
+    def test_iter_accounts_replays_journal(self):
+        new_account = Account(None, "user3")
+        file_manager.save_account_to_file(PATHS.ACCOUNT_PATH, new_account)
+        file_manager.edit_account(self.accounts[0].id, "username", "edited")
+
+        streamed = list(file_manager.iter_accounts_from_file(PATHS.ACCOUNT_PATH))
+        loaded = file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)
+        self.assertEqual(streamed, loaded)
+
+    def test_compact(self):
+        file_manager.save_account_to_file(PATHS.ACCOUNT_PATH, Account(None, "user3"))
+        file_manager.edit_account(self.accounts[0].id, "service", "edited")
+
+        self.assertEqual(file_manager.compact_accounts_file(PATHS.ACCOUNT_PATH), 3)
+        self.assertFalse(os.path.exists(journal.journal_path(PATHS.ACCOUNT_PATH)))
+
+        loaded = file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded[0].service, "edited")
+
+    def test_replay_is_idempotent(self):
+        new_account = Account(None, "user3")
+        file_manager.save_account_to_file(PATHS.ACCOUNT_PATH, new_account)
+        file_manager.edit_account(new_account.id, "username", "edited")
+
+        # Simulate a crash after the file was compacted, but before the journal was removed
+        loaded = file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)
+        with mock.patch.object(backends, "clear_journal"):
+            file_manager.write_accounts_to_file(PATHS.ACCOUNT_PATH, loaded)
+
+        reloaded = file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)
+        self.assertEqual(reloaded, loaded)
+        self.assertEqual(reloaded[-1].username, "edited")
+
+    def test_incomplete_record_is_ignored(self):
+        file_manager.edit_account(self.accounts[0].id, "username", "edited")
+
+        with open(journal.journal_path(PATHS.ACCOUNT_PATH), "a") as f:
+            f.write('{"op": "delete", "id": ')
+
+        loaded = file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual(loaded[0].username, "edited")
+
+    def test_records_after_incomplete_record_are_kept(self):
+        with open(journal.journal_path(PATHS.ACCOUNT_PATH), "a") as f:
+            f.write('{"op": "delete", "id": ')
+
+        added = [Account(None, "user3", "service3"), Account(None, "user4", "service4")]
+        for account in added:
+            file_manager.save_account_to_file(PATHS.ACCOUNT_PATH, account)
+
+        loaded = file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)
+        self.assertEqual(loaded, self.accounts + added)
+
+        file_manager.compact_accounts_file(PATHS.ACCOUNT_PATH)
+        loaded = file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)
+        self.assertEqual(loaded, self.accounts + added)
+
+    def test_record_appended_to_incomplete_record_is_kept(self):
+        # Journals written before incomplete records were truncated
+        account = Account(None, "user3", "service3")
+        with open(journal.journal_path(PATHS.ACCOUNT_PATH), "a") as f:
+            f.write('{"op": "delete", "id": ')
+            f.write(json.dumps(journal.create_record(account)) + "\n")
+            f.write("not a record\n")
+        file_manager.edit_account(account.id, "username", "edited")
+
+        loaded = file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded[2].username, "edited")
+
+    def test_auto_compaction(self):
+        with mock.patch.object(journal, "JOURNAL_MIN_COMPACT_BYTES", 0):
+            file_manager.save_account_to_file(
+                PATHS.ACCOUNT_PATH, Account(None, "x" * 1024)
+            )
+
+        self.assertFalse(os.path.exists(journal.journal_path(PATHS.ACCOUNT_PATH)))
+        self.assertEqual(
+            len(file_manager.load_accounts_from_file(PATHS.ACCOUNT_PATH)), 3
+        )
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()
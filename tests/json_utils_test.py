@@ -0,0 +1,42 @@
+import io
+import json
+import unittest
+
+from src.utils.json_utils import iter_json_array
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def test_same_as_json_load(self):
+        data = [
+            {"id": "a", "username": "user", "tags": ["x", "y"]},
+            12345,
+            -1.5e10,
+            "text with ] and , in it",
+            None,
+            [],
+            {},
+        ]
+
+        for indent in (None, 4):
+            text = json.dumps(data, indent=indent)
+            for chunk_size in (1, 2, 7, 1024):
+                self.assertEqual(
+                    list(iter_json_array(io.StringIO(text), chunk_size)), data
+                )
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] \n"), 1)), [])
+
+    def test_stops_early(self):
+        items = iter_json_array(io.StringIO('[{"id": 1}, {"id": 2} invalid'), 4)
+        self.assertEqual(next(items), {"id": 1})
+
+    def test_invalid(self):
+        for text in ("", "{}", "[1, 2", "[1 2]", "[1,]", "[1] 2"):
+            with self.assertRaises(json.JSONDecodeError):
+                list(iter_json_array(io.StringIO(text), 2))
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from src import profiling
+from src.accounts.account import Account
+from src.accounts.file_manager import save_account_to_file
+from src.config import vault_path
+from src.main import cli
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+
+    def tearDown(self):
+        profiling.disable()
+        os.chdir(self.old_cwd)
+        self.tmp_dir.cleanup()
+
+    def test_nothing_recorded_when_disabled(self):
+        with profiling.span("read"):
+            profiling.count("bytes read", 10)
+
+        self.assertIsNone(profiling.disable())
+
+    def test_spans_and_counters(self):
+        profile = profiling.enable()
+        for _ in range(3):
+            with profiling.span("read"):
+                profiling.count("bytes read", 10)
+
+        with self.assertRaises(ValueError):
+            with profiling.span("write"):
+                raise ValueError()
+
+        summary = profile.to_dict()
+        self.assertEqual(summary["spans"]["read"]["calls"], 3)
+        self.assertEqual(summary["spans"]["write"]["calls"], 1)
+        self.assertEqual(summary["counters"], {"bytes read": 30})
+
+    def test_report_to_file(self):
+        profiling.enable()
+        with profiling.span("scrypt"):
+            profiling.count("scrypt calls")
+
+        profiling.report("profile.json")
+        with open("profile.json") as file:
+            summary = json.load(file)
+
+        self.assertEqual(summary["spans"]["scrypt"]["calls"], 1)
+        self.assertEqual(summary["counters"], {"scrypt calls": 1})
+        # Reporting stops recording
+        self.assertIsNone(profiling.disable())
+
+    def test_profile_output_option(self):
+        save_account_to_file(vault_path(), Account(None, "user", "Service"))
+
+        result = CliRunner().invoke(
+            cli, ["--profile-output", "profile.json", "compact"]
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+
+        with open("profile.json") as file:
+            summary = json.load(file)
+        self.assertIn("write", summary["spans"])
+        self.assertGreater(summary["counters"]["bytes written"], 0)
@@ -0,0 +1,224 @@
+import random
+import unittest
+from unittest import mock
+
+from src import search_index
+from src.accounts.account import Account, AccountFields
+from src.search import SearchCancelled, SearchSession, fuzzyfind_account_by_field
+from src.search_corpus import (
+    SEARCH_FIELDS,
+    SearchCorpus,
+    normalize,
+    original_positions,
+)
+from src.search_index import SearchIndex
+from src.utils.fuzzy_utils import fuzzy_match
+
+random.seed(0)
+
+words = ["github", "gitlab", "google", "mail", "bank", "amazon", "steam", "Git"]
+test_accounts = [
+    Account(
+        None,
+        f"{random.choice(words)}_{i}",
+        random.choice(words + [None]),
+        f"www.{random.choice(words)}.com",
+    )
+    for i in range(200)
+]
+
+
+class TestSearchSession(unittest.TestCase):
+    def test_same_results_as_fuzzyfind(self):
+        for field in (AccountFields.USERNAME, AccountFields.SERVICE, AccountFields.URL):
+            session = SearchSession(field, test_accounts)
+
+            for query in ["", "g", "gi", "git", "gi", "gim", "", "a", "am", "amz"]:
+                self.assertEqual(
+                    [match.account for match in session.search(query, None)],
+                    fuzzyfind_account_by_field(field, test_accounts, query),
+                )
+                self.assertEqual(
+                    [match.account for match in session.search(query, 5)],
+                    fuzzyfind_account_by_field(field, test_accounts, query, 5),
+                )
+
+    def test_extended_query_searches_previous_results(self):
+        session = SearchSession(AccountFields.USERNAME, test_accounts)
+        git_results = session.search("git", None)
+
+        with mock.patch.object(
+            search_index, "fuzzy_match", wraps=search_index.fuzzy_match
+        ) as matcher:
+            session.search("gith")
+            self.assertEqual(matcher.call_count, len(git_results))
+
+            # Previous queries are cached
+            session.search("git")
+            session.search("gith")
+            self.assertEqual(matcher.call_count, len(git_results))
+
+    def test_search_all_fields(self):
+        session = SearchSession(SEARCH_FIELDS, test_accounts)
+
+        for query in ["", "gi", "www", "bnk", "amazon_1"]:
+            matches = session.search(query, None)
+            self.assertEqual(
+                [match.account for match in matches],
+                fuzzyfind_account_by_field(SEARCH_FIELDS, test_accounts, query),
+            )
+
+            # Every account matching in any field is found
+            expected = {
+                account.id
+                for field in SEARCH_FIELDS
+                for account in fuzzyfind_account_by_field(field, test_accounts, query)
+            }
+            self.assertEqual({match.account.id for match in matches}, expected)
+
+    def test_field_weights(self):
+        accounts = [
+            Account(None, "someone", "other", "www.steam.com"),
+            Account(None, "someone", "steam", "www.other.com"),
+        ]
+        matches = SearchSession(SEARCH_FIELDS, accounts).search("steam")
+
+        self.assertEqual(
+            [match.field for match in matches],
+            [AccountFields.SERVICE, AccountFields.URL],
+        )
+
+    def test_index_candidates(self):
+        index = SearchIndex(SearchCorpus(test_accounts))
+
+        for query in ["", "g", "gtb", "zzz", "m_1"]:
+            candidates = index.candidates([AccountFields.USERNAME], query)
+            matching = [
+                row
+                for row, account in enumerate(test_accounts)
+                if all(char in account.username.lower() for char in query)
+            ]
+            self.assertEqual(candidates, matching)
+
+    def test_normalized_search(self):
+        accounts = [
+            Account(None, "Straße", "ＧｉｔＨｕｂ", None),
+            Account(None, "Cafe\u0301", None, None),
+        ]
+        corpus = SearchCorpus(accounts)
+
+        self.assertEqual(corpus.fields[AccountFields.SERVICE], ["github", None])
+        self.assertEqual(
+            fuzzyfind_account_by_field(AccountFields.SERVICE, corpus, "GITHUB"),
+            accounts[:1],
+        )
+        self.assertEqual(
+            fuzzyfind_account_by_field(AccountFields.USERNAME, corpus, "STRASS"),
+            accounts[:1],
+        )
+        self.assertEqual(
+            fuzzyfind_account_by_field(AccountFields.USERNAME, corpus, "café"),
+            accounts[1:],
+        )
+        self.assertEqual(normalize("ﬁle"), "file")
+
+        # Matched positions map back to the characters they were normalized from
+        self.assertEqual(original_positions("Cafe\u0301s", [3, 4]), [3, 5])
+        self.assertEqual(original_positions("Straße", [4, 5]), [4])
+
+    def test_typing_decomposed_query(self):
+        accounts = [Account(None, "café", None, None), Account(None, "cafe", None, None)]
+        session = SearchSession(AccountFields.USERNAME, accounts)
+        query = "cafe\u0301"
+
+        # "cafe" matches both accounts, but "cafe\u0301" normalizes to "café", which "cafe" doesn't contain
+        for end in range(1, len(query) + 1):
+            matches = session.search(query[:end])
+
+        self.assertEqual(
+            [match.account for match in matches],
+            fuzzyfind_account_by_field(AccountFields.USERNAME, accounts, query),
+        )
+        self.assertEqual([match.account for match in matches], accounts[:1])
+
+    def test_cancelled_search(self):
+        session = SearchSession(AccountFields.USERNAME, test_accounts)
+
+        with self.assertRaises(SearchCancelled):
+            session.search("git", cancelled=lambda: True)
+        self.assertEqual(list(session._cache), [])
+
+        self.assertEqual(
+            session.search("git", cancelled=lambda: False), session.search("git")
+        )
+
+    def test_extend(self):
+        session = SearchSession(AccountFields.USERNAME, test_accounts[:100])
+        session.search("git")  # Caches results
+        session.extend(test_accounts[100:])
+
+        fresh_session = SearchSession(AccountFields.USERNAME, test_accounts)
+        self.assertEqual(len(session), len(test_accounts))
+        self.assertEqual(session.search("git"), fresh_session.search("git"))
+        self.assertEqual(session.count("gi"), fresh_session.count("gi"))
+
+    def test_index_built_while_loading(self):
+        session = SearchSession(SEARCH_FIELDS, SearchCorpus([]))
+        for start in range(0, len(test_accounts), 50):
+            session.extend(test_accounts[start : start + 50])
+
+        fresh_index = SearchIndex(SearchCorpus(test_accounts), SEARCH_FIELDS)
+        self.assertEqual(session._index._postings, fresh_index._postings)
+
+        # Searching uses the postings built as accounts were added, rather than building them
+        expected = SearchSession(SEARCH_FIELDS, test_accounts).search("git")
+        with mock.patch.object(
+            SearchIndex, "_build_postings", side_effect=AssertionError
+        ):
+            self.assertEqual(session.search("git"), expected)
+
+    def test_every_match_after_limited_search(self):
+        session = SearchSession(AccountFields.USERNAME, test_accounts)
+
+        self.assertEqual(len(session.search("_", 50)), 50)
+        self.assertEqual(len(session.search("_", None)), len(test_accounts))
+
+    def test_cache_size(self):
+        session = SearchSession(AccountFields.USERNAME, test_accounts, cache_size=2)
+
+        session.search("a")
+        session.search("b")
+        session.search("c")
+
+        self.assertEqual(list(session._cache), ["b", "c"])
+
+
+class TestFuzzyMatch(unittest.TestCase):
+    def test_subsequence(self):
+        self.assertEqual(fuzzy_match("gth", "github")[1], [0, 2, 3])
+        self.assertIsNone(fuzzy_match("hg", "github"))
+        self.assertEqual(fuzzy_match("", "github"), (0, []))
+
+    def test_tightest_match(self):
+        self.assertEqual(fuzzy_match("ab", "a_xab")[1], [3, 4])
+
+    def test_ranking(self):
+        consecutive = fuzzy_match("git", "github")[0]
+        gaps = fuzzy_match("git", "gxixt")[0]
+        word_start = fuzzy_match("hub", "git_hub")[0]
+        inside_word = fuzzy_match("hub", "githubs")[0]
+
+        self.assertGreater(consecutive, gaps)
+        self.assertGreater(word_start, inside_word)
+
+    def test_highlight_positions(self):
+        matches = SearchSession(AccountFields.URL, test_accounts).search("gle")
+
+        for match in matches:
+            url = match.account.url.lower()
+            self.assertEqual("".join(url[p] for p in match.positions), "gle")
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()
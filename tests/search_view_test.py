@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+
+from src import search_index
+from src.accounts.account import Account, AccountFields
+from src.constants.numbers import SEARCH_VIEW_CHROME_LINES
+from src.search import SearchSession
+from src.search_view import SearchView
+
+test_accounts = [Account(None, f"user_{i:03}", None, None) for i in range(100)]
+
+
+def create_view(window_size: int) -> SearchView:
+    session = SearchSession(AccountFields.USERNAME, test_accounts)
+    return SearchView(session, window_size + SEARCH_VIEW_CHROME_LINES)
+
+
+class TestSearchView(unittest.TestCase):
+    def test_window(self):
+        view = create_view(10)
+
+        self.assertEqual(view.total, 100)
+        self.assertEqual(len(view.visible()), 10)
+        self.assertEqual(view.render().renderables[1].row_count, 10)
+
+        view.move(12)
+        self.assertEqual(view.highlighted_row, 12)
+        self.assertEqual(view.first_row, 3)
+        self.assertEqual(view.selected(), view.visible()[-1].account)
+
+        view.move(-5)
+        self.assertEqual(view.first_row, 3)
+        view.move(-100)
+        self.assertEqual((view.highlighted_row, view.first_row), (0, 0))
+
+    def test_paging(self):
+        view = create_view(10)
+
+        view.page(1)
+        self.assertEqual((view.highlighted_row, view.first_row), (10, 10))
+
+        view.page(20)
+        self.assertEqual((view.highlighted_row, view.first_row), (99, 90))
+        self.assertEqual(view.selected().username, view.visible()[-1].account.username)
+
+        view.page(-1)
+        self.assertEqual((view.highlighted_row, view.first_row), (89, 80))
+
+    def test_search(self):
+        view = create_view(10)
+        view.page(1)
+
+        view.search("user_05")  # user_050 to user_059, and user_005 to user_095
+        self.assertEqual((view.highlighted_row, view.total), (0, 19))
+        self.assertEqual(view.selected().username, "user_050")
+        self.assertEqual(view.render().renderables[1].caption, "1 of 19 results")
+
+        view.search("nothing")
+        self.assertIsNone(view.selected())
+        self.assertEqual(view.render().renderables[1].caption, "No results")
+
+    def test_results_match_once(self):
+        view = create_view(10)
+
+        with mock.patch.object(
+            search_index, "fuzzy_match", wraps=search_index.fuzzy_match
+        ) as fuzzy_match:
+            total, matches = view.results("u")
+
+        self.assertEqual((total, len(matches)), (100, 10))
+        self.assertEqual(fuzzy_match.call_count, len(test_accounts))
+
+    def test_render_on_change(self):
+        view = create_view(10)
+
+        self.assertIsNotNone(view.render_if_changed())
+        self.assertIsNone(view.render_if_changed())
+
+        # Nothing to move to
+        view.move(-1)
+        self.assertIsNone(view.render_if_changed())
+
+        view.move(1)
+        self.assertIsNotNone(view.render_if_changed())
+
+        # Same results for a different query still redraws the prompt
+        view.search("u")
+        self.assertIsNotNone(view.render_if_changed())
+        view.search("u")
+        self.assertIsNone(view.render_if_changed())
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()
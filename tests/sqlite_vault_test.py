@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from src.accounts import file_manager, journal, sqlite_vault
+from src.accounts.account import Account
+from src.accounts.password import Password
+
+
+class TestSqliteVault(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "accounts.db")
+
+        self.accounts = [
+            Account(Password(b"secret", "salt", b"nonce", 2), "user1", "Service"),
+            Account(None, "user2", "other", "www.example.com"),
+        ]
+        file_manager.write_accounts_to_file(self.path, self.accounts)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load_accounts(self):
+        loaded = file_manager.load_accounts_from_file(self.path)
+
+        self.assertEqual(loaded, self.accounts)
+        self.assertEqual(loaded[0].password.encrypted_password, b"secret")
+        self.assertEqual(loaded[0].password.version, 2)
+        self.assertIsNone(loaded[1].password)
+        self.assertEqual(loaded[1].url, "www.example.com")
+
+    def test_get_account(self):
+        self.assertEqual(
+            sqlite_vault.get_account(self.path, self.accounts[1].id), self.accounts[1]
+        )
+        self.assertIsNone(sqlite_vault.get_account(self.path, "missing"))
+
+    def test_apply_records(self):
+        id = self.accounts[0].id
+        new_account = Account(None, "user3")
+
+        sqlite_vault.apply_records(
+            self.path,
+            [
+                journal.edit_record(id, "username", "new"),
+                journal.create_record(new_account),
+            ],
+        )
+        self.assertEqual(sqlite_vault.get_account(self.path, id).username, "new")
+
+        sqlite_vault.apply_records(self.path, [journal.delete_record(id)])
+        self.assertIsNone(sqlite_vault.get_account(self.path, id))
+        self.assertEqual(
+            file_manager.load_accounts_from_file(self.path),
+            [self.accounts[1], new_account],
+        )
+
+    def test_write_leaves_no_temporary_file(self):
+        sqlite_vault.write_accounts(self.path, self.accounts[1:])
+
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["accounts.db"])
+        self.assertEqual(
+            file_manager.load_accounts_from_file(self.path), self.accounts[1:]
+        )
+
+    def test_import_from_json(self):
+        json_path = os.path.join(self.tmp_dir.name, "accounts.json")
+        new_account = Account(None, "user3")
+        file_manager.write_accounts_to_file(json_path, [new_account, self.accounts[0]])
+
+        self.assertEqual(file_manager.import_vault(json_path, self.path), 2)
+        self.assertEqual(len(file_manager.load_accounts_from_file(self.path)), 3)
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.accounts import file_manager
+from src.accounts.account import Account
+from src.accounts.password import Password
+from src.accounts.store import AccountStore
+
+
+class TestAccountStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp_dir.name, "accounts.json")
+        self.sqlite_path = os.path.join(self.tmp_dir.name, "accounts.db")
+
+        self.accounts = [
+            Account(None, "User1", "Service"),
+            Account(None, "user2", "service "),
+            Account(None, "user3", "other"),
+        ]
+        for path in (self.json_path, self.sqlite_path):
+            file_manager.write_accounts_to_file(path, self.accounts)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_indexes(self):
+        store = AccountStore.load(self.json_path)
+
+        self.assertEqual(store.get(self.accounts[2].id), self.accounts[2])
+        self.assertIsNone(store.get("missing"))
+        self.assertEqual(store.find_by_service("SERVICE"), self.accounts[:2])
+        self.assertEqual(store.find_by_username("user1"), [self.accounts[0]])
+
+        store.update(self.accounts[0].id, "service", "other")
+        self.assertEqual(store.find_by_service("service"), [self.accounts[1]])
+        self.assertEqual(len(store.find_by_service("other")), 2)
+
+        store.delete(self.accounts[2].id)
+        self.assertEqual(store.find_by_service("other"), [self.accounts[0]])
+        self.assertEqual(len(store), 2)
+
+    def test_dirty(self):
+        for path in (self.json_path, self.sqlite_path):
+            store = AccountStore.load(path)
+            self.assertFalse(store.dirty)
+
+            with mock.patch.object(store.backend, "apply") as apply:
+                self.assertFalse(store.save())
+                apply.assert_not_called()
+
+            store.update(self.accounts[0].id, "username", "edited")
+            self.assertTrue(store.dirty)
+            self.assertTrue(store.save())
+            self.assertFalse(store.dirty)
+
+            reloaded = AccountStore.load(path)
+            self.assertEqual(reloaded.get(self.accounts[0].id).username, "edited")
+
+    def test_point_lookups_do_not_load_sqlite_vault(self):
+        store = AccountStore(self.sqlite_path)
+
+        with mock.patch.object(store.backend, "load_all") as load_all:
+            store.update(self.accounts[1].id, "password", Password(b"p", "s", b"n"))
+            store.delete(self.accounts[2].id)
+            store.add(Account(None, "user4"))
+            store.save()
+
+            self.assertIsNone(store.get(self.accounts[2].id))
+            load_all.assert_not_called()
+
+        loaded = AccountStore.load(self.sqlite_path).accounts()
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded[1].password.encrypted_password, b"p")
+        self.assertEqual(loaded[2].username, "user4")
+
+    def test_lookups_stream_json_vault(self):
+        store = AccountStore(self.json_path)
+        store.update(self.accounts[0].id, "username", "edited")
+        store.save()
+
+        store = AccountStore(self.json_path)
+        with mock.patch.object(store.backend, "load_all") as load_all:
+            self.assertEqual(store.get(self.accounts[0].id).username, "edited")
+            self.assertIsNone(store.get("missing"))
+
+            found = store.find_by_service("SERVICE")
+            self.assertEqual(found, self.accounts[:2])
+            self.assertIs(found[0], store.get(self.accounts[0].id))
+            load_all.assert_not_called()
+
+    def test_unsaved_changes_survive_loading(self):
+        store = AccountStore(self.json_path)
+        new_account = Account(None, "user4", "Service")
+        store.add(new_account)
+
+        self.assertEqual(len(store), 4)
+        self.assertEqual(len(store.find_by_service("service")), 3)
+
+    def test_invalid_updates(self):
+        store = AccountStore.load(self.json_path)
+
+        with self.assertRaises(KeyError):
+            store.update("missing", "username", "edited")
+        with self.assertRaises(KeyError):
+            store.delete("missing")
+        with self.assertRaises(TypeError):
+            store.update(self.accounts[0].id, "password", "plaintext")
+        with self.assertRaises(ValueError):
+            store.update(self.accounts[0].id, "id", "edited")
+        self.assertFalse(store.dirty)
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()
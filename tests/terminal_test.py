@@ -0,0 +1,76 @@
+import os
+import unittest
+
+from src.io.live_input import Key_Type, Live_Input
+from src.io.terminal import Key_Decoder, Terminal_Session
+
+
+class TestKeyDecoder(unittest.TestCase):
+    def test_keys(self):
+        decoder = Key_Decoder()
+
+        self.assertEqual(
+            decoder.feed(b"ab\x1b[Ac\x1b[B\x1bOA\x1b[5~\x1b[6~\x7f\x08\r\x03"),
+            [
+                (Key_Type.STANDARD, "ab"),
+                (Key_Type.UP, ""),
+                (Key_Type.STANDARD, "c"),
+                (Key_Type.DOWN, ""),
+                (Key_Type.UP, ""),
+                (Key_Type.PAGE_UP, ""),
+                (Key_Type.PAGE_DOWN, ""),
+                (Key_Type.BACKSPACE, ""),
+                (Key_Type.BACKSPACE, ""),
+                (Key_Type.ENTER, ""),
+                (Key_Type.EXIT, ""),
+            ],
+        )
+
+    def test_other_keys(self):
+        decoder = Key_Decoder()
+
+        # Windows function keys, an unknown sequence (F5), escape on its own and a control character
+        self.assertEqual(
+            decoder.feed(b"\xe0H\x00P\x1b[15~\x01\x1b"),
+            [
+                (Key_Type.UP, ""),
+                (Key_Type.DOWN, ""),
+                (Key_Type.SPECIAL, ""),
+                (Key_Type.SPECIAL, ""),
+                (Key_Type.SPECIAL, ""),
+            ],
+        )
+
+    def test_split_reads(self):
+        decoder = Key_Decoder()
+        euro = "€".encode()
+
+        self.assertEqual(decoder.feed(b"a\x1b["), [(Key_Type.STANDARD, "a")])
+        self.assertEqual(decoder.feed(b"A" + euro[:1]), [(Key_Type.UP, "")])
+        self.assertEqual(decoder.feed(euro[1:]), [(Key_Type.STANDARD, "€")])
+
+
+class TestTerminalSession(unittest.TestCase):
+    def test_batch_read(self):
+        controller, terminal_fd = os.openpty()
+
+        try:
+            with Terminal_Session(terminal_fd) as terminal:
+                live_input = Live_Input()
+                os.write(controller, b"github\x7f\x1b[B")
+
+                keys = list(live_input.process_keys(terminal.read_keys()))
+
+                self.assertEqual(
+                    keys, [Key_Type.STANDARD, Key_Type.SPECIAL, Key_Type.DOWN]
+                )
+                self.assertEqual(live_input.input, "githu")
+                self.assertEqual(terminal.read_keys(timeout=0), [])
+        finally:
+            os.close(controller)
+            os.close(terminal_fd)
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()
@@ -0,0 +1,282 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+from src.accounts.account import Account
+from src.accounts.password import Password
+from src.accounts import file_manager
+from src import profiling
+from src.accounts import rotation
+from src.accounts.parallel import CHUNK_SIZE
+from src.accounts.rotation import rotate_master_password
+from src.constants.numbers import LEGACY_PASSWORD_VERSION, PASSWORD_VERSION
+from src.encryption.master_password import save_master_password, load_key_salt
+from src.encryption.vault_key import unlock, lock
+from src.utils.aes_utils import create_key, create_salt
+from src.main import cli
+from Cryptodome.Cipher import AES
+
+MASTER_PASSWORD = "correct horse battery staple"
+
+
+def create_legacy_password(plaintext: str) -> Password:
+    salt = create_salt(32)
+    cipher = AES.new(create_key(MASTER_PASSWORD, salt), AES.MODE_EAX)
+    encrypted = cipher.encrypt(plaintext.encode("utf-8"))
+
+    return Password(encrypted, salt, cipher.nonce)
+
+
+class TestVaultKey(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+        save_master_password(MASTER_PASSWORD)
+
+    def tearDown(self):
+        lock()
+        os.chdir(self.old_cwd)
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        key = unlock(MASTER_PASSWORD)
+        password = Password.from_plaintext("hunter2", key)
+
+        self.assertEqual(password.version, PASSWORD_VERSION)
+        self.assertEqual(password.decrypt(key), "hunter2")
+        self.assertEqual(password.decrypt(MASTER_PASSWORD), "hunter2")
+
+        serialized = Password.from_json_serilizable(password.to_json_serializable())
+        self.assertEqual(serialized.decrypt(key), "hunter2")
+
+    def test_session_reused(self):
+        key = unlock(MASTER_PASSWORD)
+
+        self.assertIs(unlock(MASTER_PASSWORD), key)
+        self.assertIs(unlock(key), key)
+
+        with self.assertRaises(ValueError):
+            unlock("wrong")
+
+    def test_session_invalidated_when_master_changes(self):
+        key = unlock(MASTER_PASSWORD)
+        save_master_password("new master password")
+
+        self.assertFalse(key.is_current())
+        self.assertIsNot(unlock("new master password"), key)
+        with self.assertRaises(ValueError):
+            unlock(key)
+
+    def test_unlock_derives_one_key(self):
+        profile = profiling.enable()
+        try:
+            unlock(MASTER_PASSWORD)
+        finally:
+            profiling.disable()
+
+        self.assertEqual(profile.counters["scrypt calls"], 1)
+
+    def test_key_check_added_to_old_master_file(self):
+        with open("master.txt", "r") as f:
+            lines = f.readlines()
+        # Written before master keys had a check value
+        with open("master.txt", "w") as f:
+            f.write("".join(lines[:6]).strip())
+
+        key = unlock(MASTER_PASSWORD)
+        password = Password.from_plaintext("hunter2", key)
+        lock()
+
+        with self.assertRaises(ValueError):
+            unlock("wrong")
+
+        profile = profiling.enable()
+        try:
+            self.assertEqual(password.decrypt(unlock(MASTER_PASSWORD)), "hunter2")
+        finally:
+            profiling.disable()
+        self.assertEqual(profile.counters["scrypt calls"], 1)
+
+    def test_wrong_master_password(self):
+        with self.assertRaises(ValueError):
+            unlock("wrong")
+
+    def test_legacy_password(self):
+        legacy = create_legacy_password("legacy")
+        d = legacy.to_json_serializable()
+        del d["version"]
+
+        loaded = Password.from_json_serilizable(d)
+        self.assertEqual(loaded.version, LEGACY_PASSWORD_VERSION)
+        self.assertEqual(loaded.decrypt(MASTER_PASSWORD), "legacy")
+
+        upgraded = loaded.upgrade(MASTER_PASSWORD)
+        self.assertFalse(upgraded.is_legacy())
+        self.assertEqual(upgraded.decrypt(MASTER_PASSWORD), "legacy")
+
+    def test_key_salt_added_to_legacy_master_file(self):
+        with open("master.txt", "r") as f:
+            lines = f.readlines()
+        with open("master.txt", "w") as f:
+            f.write("".join(lines[:4]).strip())
+
+        self.assertIsNone(load_key_salt())
+
+        password = Password.from_plaintext("hunter2", MASTER_PASSWORD)
+
+        self.assertIsNotNone(load_key_salt())
+        self.assertEqual(password.decrypt(MASTER_PASSWORD), "hunter2")
+
+    def test_migrate_vault(self):
+        accounts = [
+            Account(create_legacy_password("one"), "user1"),
+            Account(None, "user2"),
+            Account(Password.from_plaintext("three", MASTER_PASSWORD), "user3"),
+        ]
+        file_manager.write_accounts_to_file("accounts.json", accounts)
+
+        migrated = file_manager.migrate_vault("accounts.json", MASTER_PASSWORD)
+        self.assertEqual(migrated, 1)
+
+        loaded = file_manager.load_accounts_from_file("accounts.json")
+        self.assertFalse(loaded[0].password.is_legacy())
+        self.assertEqual(loaded[0].get_password(MASTER_PASSWORD), "one")
+        self.assertIsNone(loaded[1].password)
+        self.assertEqual(loaded[2].get_password(MASTER_PASSWORD), "three")
+
+    def test_rotate_master_password(self):
+        accounts = [
+            Account(create_legacy_password("one"), "user1"),
+            Account(Password.from_plaintext("two", MASTER_PASSWORD), "user2"),
+            Account(None, "user3"),
+        ]
+        file_manager.write_accounts_to_file("accounts.json", accounts)
+
+        rotated = rotate_master_password("accounts.json", MASTER_PASSWORD, "rotated")
+        self.assertEqual(rotated, 2)
+
+        with self.assertRaises(ValueError):
+            unlock(MASTER_PASSWORD)
+
+        loaded = file_manager.load_accounts_from_file("accounts.json")
+        self.assertEqual(loaded[0].get_password("rotated"), "one")
+        self.assertEqual(loaded[1].get_password("rotated"), "two")
+        self.assertIsNone(loaded[2].password)
+
+    def test_rotate_with_workers(self):
+        # More passwords than are sent to a worker at once, so they're re-encrypted across processes
+        key = unlock(MASTER_PASSWORD)
+        accounts = [
+            Account(Password.from_plaintext(f"password{i}", key), f"user{i}")
+            for i in range(CHUNK_SIZE * 2 + 1)
+        ]
+        file_manager.write_accounts_to_file("accounts.json", accounts)
+
+        rotated = rotate_master_password(
+            "accounts.json", MASTER_PASSWORD, "rotated", workers=2
+        )
+        self.assertEqual(rotated, len(accounts))
+
+        loaded = file_manager.load_accounts_from_file("accounts.json")
+        self.assertEqual(
+            [account.get_password("rotated") for account in loaded],
+            [f"password{i}" for i in range(len(accounts))],
+        )
+
+    def test_interrupted_rotation_is_undone(self):
+        file_manager.write_accounts_to_file(
+            "accounts.json",
+            [Account(Password.from_plaintext("one", MASTER_PASSWORD), "user1")],
+        )
+        file_manager.save_account_to_file(
+            "accounts.json",
+            Account(Password.from_plaintext("two", MASTER_PASSWORD), "user2"),
+        )
+
+        def interrupted_write(path, accounts):
+            file_manager.write_accounts_to_file(path, accounts)
+            raise KeyboardInterrupt()
+
+        with mock.patch.object(
+            rotation, "write_accounts_to_file", side_effect=interrupted_write
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                rotate_master_password("accounts.json", MASTER_PASSWORD, "rotated")
+
+        self.assertEqual(
+            sorted(os.listdir()),
+            ["accounts.json", "accounts.json.journal", "master.txt", "master.txt.lock"],
+        )
+        loaded = file_manager.load_accounts_from_file("accounts.json")
+        self.assertEqual(
+            [account.get_password(MASTER_PASSWORD) for account in loaded],
+            ["one", "two"],
+        )
+
+    def test_crashed_rotation_is_restored_before_use(self):
+        file_manager.write_accounts_to_file(
+            "accounts.json",
+            [Account(Password.from_plaintext("one", MASTER_PASSWORD), "user1")],
+        )
+
+        # A crash after master.txt and the vault were replaced, before the copies of them were removed
+        with mock.patch.object(rotation, "_remove_backup"):
+            rotate_master_password("accounts.json", MASTER_PASSWORD, "rotated")
+        lock()
+
+        # Help doesn't read the vault, so nothing is restored
+        result = CliRunner().invoke(cli, ["compact", "--help"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertTrue(os.path.exists("master.txt.bak"))
+
+        result = CliRunner().invoke(cli, ["compact"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Restored", result.output)
+
+        self.assertEqual(
+            sorted(os.listdir()), ["accounts.json", "master.txt", "master.txt.lock"]
+        )
+        loaded = file_manager.load_accounts_from_file("accounts.json")
+        self.assertEqual(loaded[0].get_password(MASTER_PASSWORD), "one")
+
+    def test_running_rotation_is_not_restored(self):
+        file_manager.write_accounts_to_file(
+            "accounts.json",
+            [Account(Password.from_plaintext("one", MASTER_PASSWORD), "user1")],
+        )
+
+        def write_after_other_command(path, accounts):
+            # Another command starts after master.txt was replaced, before the vault was
+            self.assertFalse(rotation.recover_interrupted_rotation())
+            file_manager.load_accounts_from_file(path)
+            self.assertTrue(os.path.exists("master.txt.bak"))
+            file_manager.write_accounts_to_file(path, accounts)
+
+        with mock.patch.object(
+            rotation, "write_accounts_to_file", side_effect=write_after_other_command
+        ):
+            rotate_master_password("accounts.json", MASTER_PASSWORD, "rotated")
+
+        loaded = file_manager.load_accounts_from_file("accounts.json")
+        self.assertEqual(loaded[0].get_password("rotated"), "one")
+
+    def test_rotate_with_wrong_master_password(self):
+        file_manager.write_accounts_to_file("accounts.json", [Account(None, "user")])
+
+        with open("master.txt") as f:
+            master = f.read()
+
+        with self.assertRaises(ValueError):
+            rotate_master_password("accounts.json", "wrong", "rotated")
+
+        with open("master.txt") as f:
+            self.assertEqual(f.read(), master)
+
+
+if __name__ == "__main__":
+    print("Running tests...")
+    unittest.main()